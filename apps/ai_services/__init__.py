@@ -1,8 +1,42 @@
 # apps/ai_services/__init__.py
-from config.caching import CachedSummarizer
-from .summarizer import OptimizedSummarizer  # Changed from AdvancedSummarizer
-from .bias_detector import BiasDetector
-from .personalizer import NewsPersonalizer
+"""
+AI services. Names are resolved lazily (PEP 562) so importing this package,
+e.g. from apps.news.models, does not load torch or any model. Models are
+built on first use, or ahead of time with warm_up().
+"""
+import importlib
 
-__all__ = ['OptimizedSummarizer', 'BiasDetector',
-           'NewsPersonalizer']  # Updated
+_LAZY_ATTRS = {
+    'CachedSummarizer': 'config.caching',
+    'OptimizedSummarizer': 'apps.ai_services.summarizer',  # Changed from AdvancedSummarizer
+    'ExtractiveSummarizer': 'apps.ai_services.extractive',
+    'BiasDetector': 'apps.ai_services.bias_detector',
+    'NewsPersonalizer': 'apps.ai_services.personalizer',
+}
+
+__all__ = ['CachedSummarizer', 'OptimizedSummarizer', 'ExtractiveSummarizer',
+           'BiasDetector', 'NewsPersonalizer', 'warm_up']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def warm_up(embeddings=False):
+    """
+    Load the models now instead of on the first request that needs them,
+    e.g. in a worker before it starts consuming tasks.
+    """
+    from .summarizer import get_summarizer_pipeline
+    get_summarizer_pipeline()
+    if embeddings:
+        from .embeddings import get_embedding_model
+        get_embedding_model()
@@ -0,0 +1,304 @@
+# apps/ai_services/ann_index.py
+"""
+Approximate nearest-neighbour search over article embeddings: an IVF-flat
+index in NumPy. k-means centroids split the vectors into lists and a query
+scans only the n_probe lists whose centroids are closest to it, a few
+thousand rows instead of the whole table.
+
+build_article_index() rebuilds the index from the embedding store after
+each compaction and saves it as .npy files sorted by list, which every
+process maps read-only. Changes since the build are held in memory: new
+articles in a small delta (embed_articles adds them in its own process,
+other processes pick them up in refresh()) and deleted ones as tombstones.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .embedding_store import get_embedding_store
+from .embeddings import EMBEDDING_DIM, EMBEDDING_MODEL_NAME, stack_vectors
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'current.json'
+# Rows scored per matrix product when assigning vectors to lists
+ASSIGN_CHUNK = 16384
+
+
+def timestamps(dates):
+    """Epoch seconds (int64) of datetimes; None becomes 0."""
+    return np.array([int(date.timestamp()) if date else 0 for date in dates], dtype=np.int64)
+
+
+def assign_lists(vectors, centroids):
+    """Index of the closest centroid for each row."""
+    if not len(vectors):
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate([
+        np.argmax(vectors[start:start + ASSIGN_CHUNK] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), ASSIGN_CHUNK)]).astype(np.int64)
+
+
+def train_centroids(vectors, n_lists, iterations=10, sample_size=None, seed=0):
+    """
+    Spherical k-means on a sample of `vectors`: unit-length centroids
+    maximizing the dot product with their members. Lists left empty are
+    reseeded with random sample rows.
+    """
+    rng = np.random.default_rng(seed)
+    n_lists = max(1, min(n_lists, len(vectors)))
+    sample_size = min(len(vectors), sample_size or 64 * n_lists)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))],
+                        dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        lists = assign_lists(sample, centroids)
+        order = np.argsort(lists, kind='stable')
+        counts = np.bincount(lists, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        sums[filled] = np.add.reduceat(sample[order], starts, axis=0)
+        empty = counts == 0
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+class IVFFlatIndex:
+    def __init__(self, centroids, offsets, ids, vectors, published, built_at=0.0, trained_on=0):
+        # List j holds rows offsets[j]:offsets[j + 1] of ids/vectors/published
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.ids, self.vectors, self.published = ids, vectors, published
+        self.built_at = built_at
+        self.trained_on = trained_on
+        # Retention floor applied to every query (see refresh())
+        self.min_published = 0
+        self._delta_ids = np.zeros(0, dtype=np.int64)
+        self._delta_vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._delta_published = np.zeros(0, dtype=np.int64)
+        self._removed = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def empty(cls, dim=EMBEDDING_DIM):
+        return cls(np.zeros((0, dim), dtype=np.float32), np.zeros(1, dtype=np.int64),
+                   np.zeros(0, dtype=np.int64), np.zeros((0, dim), dtype=np.float32),
+                   np.zeros(0, dtype=np.int64))
+
+    @classmethod
+    def build(cls, ids, vectors, published, centroids, trained_on=None):
+        """Index `vectors` (rows of unit-length embeddings) under `centroids`."""
+        lists = assign_lists(vectors, centroids)
+        order = np.argsort(lists, kind='stable')
+        offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(lists, minlength=len(centroids)))]).astype(np.int64)
+        return cls(centroids, offsets, np.asarray(ids, dtype=np.int64)[order],
+                   np.asarray(vectors, dtype=np.float32)[order],
+                   np.asarray(published, dtype=np.int64)[order],
+                   built_at=time.time(), trained_on=trained_on or len(ids))
+
+    def contains(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        return np.isin(ids, self.ids) | np.isin(ids, self._delta_ids)
+
+    def add(self, ids, vectors, published):
+        """Add (or replace) articles without rebuilding."""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            keep = ~np.isin(self._delta_ids, ids)
+            self._delta_ids = np.concatenate([self._delta_ids[keep], ids])
+            self._delta_vectors = np.concatenate(
+                [self._delta_vectors[keep], np.asarray(vectors, dtype=np.float32)])
+            self._delta_published = np.concatenate(
+                [self._delta_published[keep], np.asarray(published, dtype=np.int64)])
+            self._removed.difference_update(ids.tolist())
+
+    def remove(self, ids):
+        with self._lock:
+            ids = np.asarray(ids, dtype=np.int64)
+            keep = ~np.isin(self._delta_ids, ids)
+            self._delta_ids = self._delta_ids[keep]
+            self._delta_vectors = self._delta_vectors[keep]
+            self._delta_published = self._delta_published[keep]
+            self._removed.update(ids.tolist())
+
+    def _score(self, ids, vectors, published, query, floor, excluded):
+        scores = vectors @ query
+        mask = published >= floor
+        if len(excluded):
+            mask &= ~np.isin(ids, excluded)
+        return ids[mask], scores[mask]
+
+    def search(self, query, k=10, n_probe=None, published_after=None, exclude=()):
+        """
+        IDs and scores of the (approximately) `k` rows with the highest
+        dot product with `query`, best first. `published_after` (epoch
+        seconds) drops older articles; when the filter leaves fewer than
+        `k` hits in the probed lists, n_probe doubles until it doesn't.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        n_probe = n_probe or getattr(settings, 'ANN_N_PROBE', 16)
+        floor = max(int(published_after or 0), self.min_published)
+        with self._lock:
+            excluded = np.fromiter(self._removed.union(exclude), dtype=np.int64)
+            found = [self._score(self._delta_ids, self._delta_vectors,
+                                 self._delta_published, query, floor, excluded)]
+        hits = len(found[0][0])
+        n_lists = len(self.centroids)
+        order = np.argsort(-(self.centroids @ query)) if n_lists else []
+        probed = 0
+        while probed < n_lists:
+            for j in order[probed:n_probe]:
+                start, end = self.offsets[j], self.offsets[j + 1]
+                if start == end:
+                    continue
+                found.append(self._score(self.ids[start:end], self.vectors[start:end],
+                                         self.published[start:end], query, floor, excluded))
+                hits += len(found[-1][0])
+            probed = min(n_probe, n_lists)
+            if hits >= k:
+                break
+            n_probe *= 2
+
+        ids = np.concatenate([ids for ids, _ in found])
+        scores = np.concatenate([scores for _, scores in found])
+        if len(ids) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+        best = np.argsort(-scores, kind='stable')
+        return ids[best], scores[best]
+
+    def save(self, directory):
+        """Write the index as a new version and publish it via the manifest."""
+        os.makedirs(directory, exist_ok=True)
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        files = {}
+        for name in ('centroids', 'offsets', 'ids', 'vectors', 'published'):
+            files[name] = f'{name}-{version}.npy'
+            np.save(os.path.join(directory, files[name]), getattr(self, name))
+        manifest = {'model': EMBEDDING_MODEL_NAME, 'built_at': self.built_at,
+                    'trained_on': self.trained_on, 'files': files}
+        manifest_path = os.path.join(directory, MANIFEST_NAME)
+        tmp_path = f'{manifest_path}.{version}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
+        # Processes mapping the previous version keep it until they reload
+        for name in os.listdir(directory):
+            if name.endswith('.npy') and name not in files.values():
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError as e:
+                    logger.warning(f"Could not remove old index file {name}: {e}")
+
+    @classmethod
+    def load(cls, directory):
+        """The published index, memory-mapped; None if there is none for this model."""
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except OSError:
+            return None
+        if manifest['model'] != EMBEDDING_MODEL_NAME:
+            logger.warning(f"Ignoring ANN index built with {manifest['model']}")
+            return None
+        arrays = {name: np.load(os.path.join(directory, file_name),
+                                mmap_mode=None if name in ('centroids', 'offsets') else 'r')
+                  for name, file_name in manifest['files'].items()}
+        return cls(built_at=manifest['built_at'], trained_on=manifest['trained_on'], **arrays)
+
+
+def index_directory():
+    return str(getattr(settings, 'ANN_INDEX_DIR', settings.BASE_DIR / 'models' / 'ann_index'))
+
+
+def build_article_index(store=None):
+    """
+    Rebuild the index from the embedding store's latest snapshot and
+    publish it. Centroids are reused until the collection has doubled
+    since they were trained. Returns the index.
+    """
+    from apps.news.models import Article
+
+    ids, vectors = (store or get_embedding_store()).snapshot()
+    published_by_id = dict(Article.objects.filter(id__in=ids.tolist()).values_list(
+        'id', 'published_date')) if len(ids) else {}
+    published = timestamps([published_by_id.get(article_id) for article_id in ids.tolist()])
+
+    directory = index_directory()
+    previous = IVFFlatIndex.load(directory)
+    n_lists = getattr(settings, 'ANN_N_LISTS', None) or max(1, int(math.sqrt(len(ids))))
+    if (previous is not None and len(previous.centroids) == min(n_lists, len(ids))
+            and previous.trained_on * 2 >= len(ids)):
+        centroids, trained_on = previous.centroids, previous.trained_on
+    elif len(ids):
+        centroids, trained_on = train_centroids(vectors, n_lists), len(ids)
+    else:
+        centroids, trained_on = np.zeros((0, EMBEDDING_DIM), dtype=np.float32), 0
+    index = IVFFlatIndex.build(ids, vectors, published, centroids, trained_on)
+    index.save(directory)
+    logger.info(f"Built ANN index: {len(ids)} articles in {len(centroids)} lists")
+    return index
+
+
+_index = None
+_index_mtime = None
+_synced_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_article_index():
+    """
+    Return the process-wide index: the published build, reloaded when a
+    newer one appears, plus articles embedded since (checked at most every
+    ANN_SYNC_SECONDS).
+    """
+    global _index, _index_mtime, _synced_at
+    try:
+        mtime = os.stat(os.path.join(index_directory(), MANIFEST_NAME)).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _index_lock:
+        if _index is None or mtime != _index_mtime:
+            _index = IVFFlatIndex.load(index_directory()) or IVFFlatIndex.empty()
+            _index_mtime, _synced_at = mtime, 0.0
+        if time.time() - _synced_at >= getattr(settings, 'ANN_SYNC_SECONDS', 30):
+            refresh(_index)
+            _synced_at = time.time()
+    return _index
+
+
+def refresh(index):
+    """
+    Add articles embedded after `index` was built and apply the retention
+    window of cleanup_old_articles.
+    """
+    from apps.news.models import Article
+
+    index.min_published = int((timezone.now() - timedelta(
+        days=getattr(settings, 'ARTICLE_RETENTION_DAYS', 30))).timestamp())
+    # Articles created shortly before the build may have been embedded after it
+    since = datetime.fromtimestamp(index.built_at, tz=dt_timezone.utc) - timedelta(
+        hours=getattr(settings, 'ANN_SYNC_WINDOW_HOURS', 1))
+    recent_ids = np.array(Article.objects.filter(
+        embedding__isnull=False, created_at__gte=since).values_list('id', flat=True),
+        dtype=np.int64)
+    new_ids = recent_ids[~index.contains(recent_ids)] if len(recent_ids) else recent_ids
+    if not len(new_ids):
+        return 0
+    rows = list(Article.objects.filter(id__in=new_ids.tolist()).values_list(
+        'id', 'embedding', 'published_date'))
+    index.add([row[0] for row in rows], stack_vectors([bytes(row[1]) for row in rows]),
+              timestamps([row[2] for row in rows]))
+    return len(rows)
@@ -1,34 +1,143 @@
-from transformers import pipeline
+# apps/ai_services/bias_detector.py
+import json
 import logging
+import os
+import string
+from collections import namedtuple
+
+import numpy as np
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), 'data', 'bias_lexicon.json')
+
+# Punctuation is turned into spaces so texts split into words with
+# str.split, several times faster than a \w+ regex on long articles
+PUNCTUATION = str.maketrans({char: ' ' for char in string.punctuation + '‘’“”–—…«»'})
+
+BiasScore = namedtuple('BiasScore', ['label', 'left', 'right'])
+
+
+def tokenize(text):
+    return text.lower().translate(PUNCTUATION).split()
+
+
+def term_variants(term):
+    """
+    Token tuples a lexicon term matches: as written, and with its last
+    word in the singular or plural, so 'conservatives' and 'tax cut'
+    match 'conservative' and 'tax cuts'.
+    """
+    words = tuple(tokenize(term))
+    if not words:
+        return []
+    last = words[-1]
+    if last.endswith('s') and not last.endswith('ss') and len(last) > 3:
+        other = last[:-1]
+    else:
+        other = last + 's'
+    return [words, words[:-1] + (other,)]
+
+
+def load_lexicon(path=None):
+    """Read a {'left': {term: weight}, 'right': {term: weight}} JSON file."""
+    path = path or getattr(settings, 'BIAS_LEXICON_PATH', DEFAULT_LEXICON_PATH)
+    with open(path, encoding='utf-8') as f:
+        lexicon = json.load(f)
+    return lexicon.get('left', {}), lexicon.get('right', {})
+
+
 class BiasDetector:
-    def __init__(self):
-        self.left_keywords = {
-            "progressive": 2, "liberal": 1, "leftist": 2, 
-            "climate change": 3, "social justice": 3, "renewable energy": 2,
-            "racial justice": 2, "gun control": 3, "workers rights": 2
-        }
+    """
+    Weighted-lexicon bias scorer compiled once per process.
+
+    Terms are indexed as word n-grams, so each text is lowercased and
+    tokenized once and matched with one set intersection per distinct term
+    length, however large the lexicon grows. Every term counts once per text;
+    its left and right weights are summed for a whole batch with NumPy.
+    """
+
+    def __init__(self, left_keywords=None, right_keywords=None, threshold=3):
+        if left_keywords is None and right_keywords is None:
+            left_keywords, right_keywords = load_lexicon()
+        self.left_keywords = left_keywords or {}
+        self.right_keywords = right_keywords or {}
+        self.threshold = threshold  # weighted score a side needs to lean
+
+        # A term may carry weight on both sides; its variants share its ID
+        self.term_ids = {}
+        for keywords in (self.left_keywords, self.right_keywords):
+            for term in keywords:
+                self.term_ids.setdefault(term.lower(), len(self.term_ids))
+        self.left_weights = np.zeros(len(self.term_ids), dtype=np.float32)
+        self.right_weights = np.zeros(len(self.term_ids), dtype=np.float32)
+        for keywords, weights in ((self.left_keywords, self.left_weights),
+                                  (self.right_keywords, self.right_weights)):
+            for term, weight in keywords.items():
+                weights[self.term_ids[term.lower()]] += weight
+
+        # Single words by word; phrases by length, with the words they
+        # start with so texts without any of them skip building n-grams
+        self.words = {}
+        self.phrases = {}
+        for term, term_id in self.term_ids.items():
+            for key in term_variants(term):
+                if len(key) == 1:
+                    self.words.setdefault(key[0], term_id)
+                else:
+                    self.phrases.setdefault(len(key), {}).setdefault(key, term_id)
+        self.phrase_starts = {length: {key[0] for key in phrases}
+                              for length, phrases in self.phrases.items()}
 
-        self.right_keywords = {
-            "conservative": 2, "right-wing": 2, "free market": 3, 
-            "gun rights": 3, "traditional values": 2, "tax cuts": 2,
-            "border security": 3, "patriotism": 2, "small government": 2
-        }
+    def match(self, text):
+        """IDs of the lexicon terms found in `text`."""
+        tokens = tokenize(text)
+        token_set = set(tokens)
+        found = {self.words[word] for word in self.words.keys() & token_set}
+        for length, phrases in self.phrases.items():
+            starts = self.phrase_starts[length]
+            if token_set.isdisjoint(starts):
+                continue
+            for i, token in enumerate(tokens):
+                if token in starts:
+                    term_id = phrases.get(tuple(tokens[i:i + length]))
+                    if term_id is not None:
+                        found.add(term_id)
+        return found
 
-        self.threshold = 3  # needs weighted score >= 3
+    def detect_bias_many(self, texts):
+        """Score a batch of texts; returns one BiasScore per text."""
+        matches = [self.match(text or '') for text in texts]
+        text_index = np.repeat(np.arange(len(matches)), [len(ids) for ids in matches])
+        term_ids = np.fromiter((i for ids in matches for i in ids), dtype=np.intp,
+                               count=len(text_index))
+        left = np.bincount(text_index, weights=self.left_weights[term_ids],
+                           minlength=len(matches))
+        right = np.bincount(text_index, weights=self.right_weights[term_ids],
+                            minlength=len(matches))
+
+        labels = np.select(
+            [(left == 0) & (right == 0),
+             (left >= self.threshold) & (right >= self.threshold),
+             left - right >= self.threshold,
+             right - left >= self.threshold],
+            ["UNKNOWN", "MIXED", "LEFT-LEANING", "RIGHT-LEANING"],
+            default="NEUTRAL")
+        return [BiasScore(str(label), float(l), float(r))
+                for label, l, r in zip(labels, left, right)]
 
     def detect_bias(self, text):
-        left_score = sum(w for k, w in self.left_keywords.items() if k in text.lower())
-        right_score = sum(w for k, w in self.right_keywords.items() if k in text.lower())
-        if left_score == 0 and right_score == 0:
-            return "UNKNOWN"
-        elif left_score >= threshold and right_score >= threshold:
-            return "MIXED"
-        elif left_score - right_score >= self.threshold:
-            return "LEFT-LEANING"
-        elif right_score - left_score >= self.threshold:
-            return "RIGHT-LEANING"
-        else:
-            return "NEUTRAL"
+        return self.detect_bias_many([text])[0]
+
+
+_detector = None
+
+
+def get_bias_detector():
+    """Return the process-wide BiasDetector, building it on first use."""
+    global _detector
+    if _detector is None:
+        _detector = BiasDetector()
+        logger.info(f"Loaded bias lexicon with {len(_detector.term_ids)} terms")
+    return _detector
@@ -0,0 +1,197 @@
+# apps/ai_services/categorizer.py
+import logging
+import re
+from collections import Counter
+from itertools import chain
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.text import slugify
+
+from apps.news.models import Category
+
+logger = logging.getLogger(__name__)
+
+# Category mapping (keywords are case-insensitive)
+CATEGORY_KEYWORDS = {
+    'Technology': ['tech', 'software', 'computer', 'internet', 'digital', 'ai', 'artificial intelligence', 'gadget', 'startup', 'cybersecurity', 'innovation', 'platform', 'app', 'device', 'data', 'cloud'],
+    'Politics': ['election', 'government', 'congress', 'senate', 'political', 'policy', 'president', 'vote', 'parliament', 'legislation', 'diplomacy', 'white house', 'candidate'],
+    'Business': ['business', 'economy', 'market', 'finance', 'stock', 'company', 'invest', 'trade', 'economic', 'corporate', 'industry', 'merger', 'acquisition', 'earnings', 'inflation', 'gdp'],
+    'Sports': ['sport', 'football', 'basketball', 'soccer', 'game', 'player', 'team', 'match', 'olympics', 'league', 'championship', 'nfl', 'nba', 'mlb', 'tournament'],
+    'Health': ['health', 'medical', 'hospital', 'doctor', 'medicine', 'disease', 'wellness', 'covid', 'pandemic', 'virus', 'vaccine', 'healthcare', 'mental health', 'nutrition'],
+    'Science': ['science', 'research', 'study', 'discovery', 'scientist', 'space', 'biology', 'physics', 'chemistry', 'astronomy', 'environment', 'climate', 'nasa'],
+    'Entertainment': ['entertainment', 'movie', 'film', 'celebrity', 'music', 'tv', 'hollywood', 'art', 'culture', 'theatre', 'award', 'series', 'actor', 'actress', 'album'],
+    'World News': ['world', 'international', 'global', 'country', 'geopolitics', 'conflict', 'diplomacy', 'united nations', 'foreign affairs', 'war', 'peace'],
+    'Local News': ['local', 'city', 'community', 'town', 'neighborhood', 'regional', 'state'],
+    'Opinion': ['opinion', 'editorial', 'commentary', 'viewpoint'],
+    'Lifestyle': ['lifestyle', 'travel', 'food', 'fashion', 'home', 'garden', 'well-being'],
+    'Education': ['education', 'school', 'university', 'college', 'student', 'teacher', 'learning'],
+}
+
+DEFAULT_CATEGORY = 'General News'
+MAX_CATEGORIES = 3
+# Bumped when a category is deleted or renamed, so every process drops its
+# cached IDs (see category_version)
+CATEGORY_VERSION_KEY = 'categorizer:category_version'
+
+
+WORD_RE = re.compile(r'\w+')
+
+
+class KeywordCategorizer:
+    """
+    Keyword categorizer compiled once per process.
+
+    Keywords are indexed as word n-grams (unigrams and two-word phrases
+    such as 'white house'), so an article is tokenized once and matched
+    with set intersections instead of one substring scan per keyword.
+    Category IDs are cached in-process after the first lookup and dropped
+    when another process deletes or renames a category.
+    """
+
+    def __init__(self, category_keywords=None):
+        self.category_keywords = category_keywords or CATEGORY_KEYWORDS
+
+        # A keyword may belong to several categories (e.g. 'diplomacy')
+        self.keyword_categories = {}
+        for cat_name, keywords in self.category_keywords.items():
+            for keyword in keywords:
+                key = tuple(WORD_RE.findall(keyword.lower()))
+                self.keyword_categories.setdefault(key, []).append(cat_name)
+
+        self.unigrams = {key[0] for key in self.keyword_categories if len(key) == 1}
+        self.bigrams = {key for key in self.keyword_categories if len(key) == 2}
+        if any(len(key) > 2 for key in self.keyword_categories):
+            raise ValueError('Keywords longer than two words are not supported')
+
+        # Sections are short labels ('Technology', 'US news'), matched as
+        # substrings; keywords of 3 chars or less would match too much
+        # ('ai' in 'train')
+        self.section_pattern = re.compile('|'.join(
+            re.escape(' '.join(key)) for key in
+            sorted(self.keyword_categories, key=lambda k: len(' '.join(k)), reverse=True)
+            if len(' '.join(key)) > 3))
+        self.category_names = {
+            cat_name.lower(): cat_name for cat_name in self.category_keywords}
+        self.category_order = {
+            cat_name: i for i, cat_name in enumerate(self.category_keywords)}
+
+        self._category_ids = {}
+        self._version = None
+
+    def match(self, title, description='', section=None):
+        """
+        Return up to MAX_CATEGORIES category names for an article, the ones
+        with most matching keywords first, falling back to DEFAULT_CATEGORY.
+        """
+        matched = []
+
+        # 1. Check section first (often more reliable if available, e.g., from Guardian)
+        if section:
+            section_lower = section.lower()
+            if section_lower in self.category_names:
+                matched.append([self.category_names[section_lower]])
+            for keyword in set(self.section_pattern.findall(section_lower)):
+                matched.append(self.keyword_categories[tuple(keyword.split(' '))])
+
+        # 2. Check title and description for keywords
+        tokens = WORD_RE.findall(f'{title} {description}'.lower())
+        for word in self.unigrams.intersection(tokens):
+            matched.append(self.keyword_categories[(word,)])
+        for pair in self.bigrams.intersection(zip(tokens, tokens[1:])):
+            matched.append(self.keyword_categories[pair])
+
+        hits = Counter(chain.from_iterable(matched))
+        # Ties keep the order of category_keywords, so results don't depend
+        # on set iteration order
+        ranked = sorted(hits, key=lambda name: (-hits[name], self.category_order[name]))
+        return ranked[:MAX_CATEGORIES] or [DEFAULT_CATEGORY]
+
+    def category_ids(self, names):
+        """
+        Map category names to IDs from the in-process cache, creating any
+        missing categories with a single bulk insert.
+        """
+        version = category_version()
+        if version is None or version != self._version:
+            self._category_ids = {}
+            self._version = version
+        missing = set(names) - set(self._category_ids)
+        if missing:
+            self._category_ids.update(Category.objects.filter(
+                name__in=missing).values_list('name', 'id'))
+            missing -= set(self._category_ids)
+        if missing:
+            # bulk_create skips Category.save(), so set the slug here
+            Category.objects.bulk_create(
+                [Category(name=name, slug=slugify(name)) for name in missing],
+                ignore_conflicts=True,
+            )
+            logger.info(f"Created new categories: {sorted(missing)}")
+            self._category_ids.update(Category.objects.filter(
+                name__in=missing).values_list('name', 'id'))
+        return {name: self._category_ids[name] for name in names
+                if name in self._category_ids}
+
+    def categorize_many(self, articles):
+        """
+        Categorize a batch of articles (model instances or dicts with
+        title, description and optional section) and return one list of
+        category IDs per article, ready for a bulk M2M insert.
+        """
+        matches = []
+        for article in articles:
+            if isinstance(article, dict):
+                matches.append(self.match(
+                    article.get('title', ''), article.get('description', ''),
+                    article.get('section')))
+            else:
+                matches.append(self.match(
+                    article.title, article.description,
+                    getattr(article, 'section', None)))
+
+        category_ids = self.category_ids(
+            {name for names in matches for name in names})
+        return [[category_ids[name] for name in names if name in category_ids]
+                for names in matches]
+
+    def clear_cache(self):
+        self._category_ids = {}
+
+
+_categorizer = None
+
+
+def category_version():
+    """Shared version of the categories table; None if the cache is down."""
+    try:
+        return cache.get_or_set(CATEGORY_VERSION_KEY, 0, None)
+    except Exception as e:
+        logger.warning(f"Category version unavailable: {e}")
+        return None
+
+
+def get_categorizer():
+    """Return the process-wide KeywordCategorizer, building it on first use."""
+    global _categorizer
+    if _categorizer is None:
+        _categorizer = KeywordCategorizer()
+    return _categorizer
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def clear_category_cache(sender, created=False, **kwargs):
+    # New categories are picked up as cache misses; deletes and renames
+    # invalidate the IDs cached by every process
+    if created:
+        return
+    try:
+        cache.incr(CATEGORY_VERSION_KEY)
+    except ValueError:
+        cache.set(CATEGORY_VERSION_KEY, 1, None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached category IDs: {e}")
+    if _categorizer is not None:
+        _categorizer.clear_cache()
@@ -0,0 +1,337 @@
+# apps/ai_services/content_extractor.py
+import codecs
+import logging
+import re
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from itertools import chain, zip_longest
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+from .http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+# Elements that never hold article text
+SKIPPED_TAGS = {
+    'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'form',
+    'button', 'select', 'nav', 'aside', 'footer', 'header', 'figcaption',
+    # The headline is stored separately as Article.title
+    'h1',
+}
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'source', 'track', 'wbr'}
+# Elements whose text is collected as one paragraph
+PARAGRAPH_TAGS = {'p', 'pre', 'blockquote', 'li', 'td', 'dd',
+                  'h2', 'h3', 'h4', 'h5', 'h6'}
+# Containers that may hold loose text and can be picked as the article body
+CONTAINER_TAGS = {'div', 'section', 'article', 'main', 'body', 'td'}
+
+# class/id hints, as in Mozilla's Readability
+UNLIKELY_RE = re.compile(
+    r'banner|breadcrumb|comment|community|cookie|disqus|footer|header|menu|'
+    r'modal|nav|newsletter|outbrain|pager|popup|promo|related|remark|'
+    r'rss|share|shoutbox|sidebar|social|sponsor|subscribe|taboola|tools|'
+    r'advert|\bads?\b', re.IGNORECASE)
+POSITIVE_RE = re.compile(
+    r'article|body|content|entry|hentry|main|page|post|story|text|blog',
+    re.IGNORECASE)
+NEVER_UNLIKELY_TAGS = {'html', 'body', 'main', 'article'}
+TAG_WEIGHTS = {'article': 10, 'main': 5, 'div': 5, 'section': 3, 'td': 3}
+
+MIN_PARAGRAPH_CHARS = 25
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+# Bytes searched for a meta charset, as browsers do
+CHARSET_SNIFF_BYTES = 4096
+
+
+class _Node:
+    __slots__ = ('tag', 'parent', 'weight', 'chunks', 'link_chars',
+                 'score', 'text_chars', 'text_link_chars')
+
+    def __init__(self, tag, parent, weight):
+        self.tag = tag
+        self.parent = parent
+        self.weight = weight
+        self.chunks = []
+        self.link_chars = 0
+        self.score = 0.0
+        # Text and link text of all paragraphs below this node
+        self.text_chars = 0
+        self.text_link_chars = 0
+
+    def ancestors(self):
+        node = self
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+class _ReadabilityParser(HTMLParser):
+    """
+    Streaming parser that splits a page into paragraphs and scores the
+    containers holding them: long, comma-rich paragraphs with few links
+    count for their parent and, at half weight, their grandparent.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('#root', None, 0)
+        self.stack = [self.root]
+        self.skip_tag = None
+        self.skip_depth = 0
+        self.link_depth = 0
+        self.paragraphs = []
+        self.candidates = set()
+
+    def class_weight(self, attrs):
+        hints = ' '.join(value or '' for name, value in attrs
+                         if name in ('class', 'id'))
+        if not hints:
+            return 0, False
+        positive = bool(POSITIVE_RE.search(hints))
+        unlikely = bool(UNLIKELY_RE.search(hints))
+        return 25 * positive - 25 * unlikely, unlikely and not positive
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br' and not self.skip_depth:
+                self.stack[-1].chunks.append(' ')
+            return
+        if self.skip_depth:
+            # Only the skipped tag is counted, as end tags of other
+            # elements may be missing
+            self.skip_depth += tag == self.skip_tag
+            return
+        weight, unlikely = self.class_weight(attrs)
+        if tag in SKIPPED_TAGS or (unlikely and tag not in NEVER_UNLIKELY_TAGS):
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+        if tag == 'a':
+            self.link_depth += 1
+            return
+        if tag not in PARAGRAPH_TAGS and tag not in CONTAINER_TAGS:
+            # Inline markup: its text belongs to the enclosing block
+            return
+        if self.stack[-1].tag == 'p':
+            # <p> is implicitly closed by the next block element
+            self.emit(self.stack.pop())
+        else:
+            # Keep loose text before this child in document order
+            self.emit(self.stack[-1])
+        self.stack.append(_Node(tag, self.stack[-1], weight + TAG_WEIGHTS.get(tag, 0)))
+
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= tag == self.skip_tag
+            return
+        if tag == 'a':
+            self.link_depth = max(0, self.link_depth - 1)
+            return
+        if not any(node.tag == tag for node in self.stack[1:]):
+            return
+        while self.stack[-1].tag != tag:
+            self.emit(self.stack.pop())
+        self.emit(self.stack.pop())
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        node = self.stack[-1]
+        node.chunks.append(data)
+        if self.link_depth:
+            node.link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        while len(self.stack) > 1:
+            self.emit(self.stack.pop())
+
+    def emit(self, node):
+        """Record the text collected in `node` so far as a paragraph."""
+        text = ' '.join(''.join(node.chunks).split())
+        link_chars = node.link_chars
+        node.chunks = []
+        node.link_chars = 0
+        if not text or node is self.root:
+            return
+        # Loose text directly inside a container counts as a paragraph of it
+        paragraph = node if node.tag in PARAGRAPH_TAGS else _Node('p', node, 0)
+        self.paragraphs.append((paragraph, text, link_chars))
+        for ancestor in paragraph.parent.ancestors():
+            ancestor.text_chars += len(text)
+            ancestor.text_link_chars += link_chars
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            return
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = paragraph.parent
+        for container, share in ((parent, 1), (parent.parent, 0.5)):
+            if container is None or container is self.root:
+                break
+            if container not in self.candidates:
+                self.candidates.add(container)
+                container.score = container.weight
+            container.score += score * share
+
+
+def extract_main_text(html, max_chars=None):
+    """
+    Return the main article text of an HTML page, with boilerplate such as
+    navigation, related links, comments and footers removed. Paragraphs
+    are separated by blank lines; '' if no article body is found.
+    """
+    if not html:
+        return ''
+    parser = _ReadabilityParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.candidates:
+        return ''
+
+    def final_score(node):
+        link_density = node.text_link_chars / node.text_chars if node.text_chars else 0
+        return node.score * (1 - link_density)
+
+    top = max(parser.candidates, key=final_score)
+    threshold = max(10, final_score(top) * 0.2)
+    # Siblings of the best container that score well are part of the story
+    chosen = {top} | {node for node in parser.candidates
+                      if node.parent is top.parent and final_score(node) >= threshold}
+
+    paragraphs = []
+    length = 0
+    for node, text, link_chars in parser.paragraphs:
+        if not any(ancestor in chosen for ancestor in node.ancestors()):
+            continue
+        if link_chars > len(text) / 2:
+            continue
+        if max_chars and length + len(text) > max_chars:
+            break
+        paragraphs.append(text)
+        length += len(text) + 2
+    return '\n\n'.join(paragraphs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def html_encoding(content_type, body):
+    """
+    Encoding of an HTML page: the Content-Type charset, else a meta charset
+    near the top of the page, else UTF-8. (requests assumes ISO-8859-1
+    for text/html without a charset, which garbles most pages.)
+    """
+    header = re.search(r'charset\s*=\s*["\']?([\w.:-]+)', content_type or '', re.IGNORECASE)
+    match = header or META_CHARSET_RE.search(body[:CHARSET_SNIFF_BYTES])
+    if match:
+        charset = match.group(1)
+        charset = charset.decode('ascii') if isinstance(charset, bytes) else charset
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def get_extraction_client():
+    """HttpClient with the (politer) per-host limits used for article pages."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(
+                    name='extraction',
+                    per_host_concurrency=getattr(
+                        settings, 'CONTENT_EXTRACTION_PER_HOST_CONCURRENCY', 2),
+                    per_host_rate=getattr(
+                        settings, 'CONTENT_EXTRACTION_PER_HOST_RATE', 1.0),
+                    host_limits={},
+                    max_retries=1,
+                )
+    return _client
+
+
+class ContentExtractor:
+    """
+    Fetch article pages in a bounded thread pool and extract their main
+    text. Requests to the same host are spread out over the run and
+    throttled by the extraction HttpClient; responses larger than
+    `max_bytes` are not downloaded past the cap.
+    """
+
+    def __init__(self):
+        self.max_workers = getattr(settings, 'CONTENT_EXTRACTION_MAX_WORKERS', 8)
+        self.timeout = getattr(settings, 'CONTENT_EXTRACTION_TIMEOUT', 15)
+        self.max_bytes = getattr(settings, 'CONTENT_EXTRACTION_MAX_BYTES', 2 * 1024 * 1024)
+        self.max_chars = getattr(settings, 'CONTENT_EXTRACTION_MAX_CHARS', 20000)
+        self.http = get_extraction_client()
+
+    def extract_many(self, articles):
+        """
+        Extract text for objects with `id` and `url` attributes.
+        Returns {article_id: text} for the pages that yielded any text.
+        """
+        # Interleave hosts so a pool slot isn't spent waiting on one host's
+        # rate limit while others are idle
+        by_host = defaultdict(deque)
+        for article in articles:
+            by_host[urlsplit(article.url).netloc].append(article)
+        ordered = [article for article in chain.from_iterable(
+            zip_longest(*by_host.values())) if article is not None]
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='content-extract') as executor:
+            for article, text in zip(ordered, executor.map(self.extract, ordered)):
+                if text:
+                    results[article.id] = text
+        logger.info(f"Extracted content for {len(results)}/{len(ordered)} articles")
+        return results
+
+    def extract(self, article):
+        """Download one article page and return its main text ('' on failure)."""
+        html = self.download(article.url)
+        if not html:
+            return ''
+        try:
+            return extract_main_text(html, self.max_chars)
+        except Exception as e:
+            logger.error(f"Error extracting content from {article.url}: {e}")
+            return ''
+
+    def download(self, url):
+        """Fetch an HTML page, reading at most max_bytes of it."""
+        try:
+            response = self.http.get(url, timeout=self.timeout, stream=True)
+        except requests.exceptions.RequestException as req_err:
+            logger.warning(f"Could not fetch {url}: {req_err}")
+            return ''
+        with response:
+            if response.status_code != 200:
+                logger.warning(f"Could not fetch {url}: HTTP {response.status_code}")
+                return ''
+            if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                return ''
+            if int(response.headers.get('Content-Length') or 0) > self.max_bytes:
+                logger.info(f"Skipping {url}: larger than {self.max_bytes} bytes")
+                return ''
+            body = bytearray()
+            try:
+                for chunk in response.iter_content(64 * 1024):
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        break
+            except requests.exceptions.RequestException as req_err:
+                logger.warning(f"Could not read {url}: {req_err}")
+                return ''
+            self.http.record_bytes(url, len(body))
+        body = bytes(body[:self.max_bytes])
+        return body.decode(html_encoding(response.headers.get('Content-Type'), body),
+                           errors='replace')
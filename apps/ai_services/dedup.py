@@ -0,0 +1,123 @@
+# apps/ai_services/dedup.py
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+WORD_RE = re.compile(r'\w+')
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ocid', 'cmpid', 'cmp', 'ito', 'ref', 'ref_src', 'src', 'taid',
+    'smid', 'sr_share', 'at_medium', 'at_campaign', 'feedtype',
+}
+TRACKING_PREFIXES = ('utm_', 'ns_', 'at_', 'ga_', 'mbid')
+
+# Words that carry no signal about which story a text is
+STOPWORDS = set(
+    'a an the of on in at to for and or but by with as is are was were be '
+    'been has have had said says from that this it its his her their they '
+    'will would could can after over into about than more new'.split())
+
+SIMHASH_BITS = 64
+# Eight 8-bit bands: two fingerprints within 7 bits of each other are
+# guaranteed to agree exactly on at least one band (pigeonhole)
+SIMHASH_BANDS = 8
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+SIMHASH_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
+
+def canonicalize_url(url):
+    """
+    Normalize an article URL so syndicated copies and tracking variants of
+    the same link compare equal: https scheme, lowercase host without
+    'www.' or default port, no fragment, tracking parameters removed,
+    remaining parameters sorted and no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def simhash(text):
+    """
+    64-bit SimHash of a text over its non-stopword words, returned as a
+    signed integer so it fits a BigIntegerField. Returns None for empty
+    text.
+    """
+    features = [word for word in WORD_RE.findall(text.lower())
+                if word not in STOPWORDS]
+    if not features:
+        return None
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'little')
+         for f in features], dtype=np.uint64)
+    # (features, 64) bit matrix; each bit votes +1/-1 across all features
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    fingerprint = int(np.packbits(votes > 0, bitorder='little').view('<u8')[0])
+    return to_signed(fingerprint)
+
+
+def to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming_distance(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count('1')
+
+
+class SimHashIndex:
+    """
+    In-memory banded index of SimHash fingerprints.
+
+    Each fingerprint is filed under its eight 8-bit bands, so a lookup only
+    compares against the few fingerprints sharing a band instead of the
+    whole window.
+    """
+
+    def __init__(self, max_distance=6):
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(
+                f'max_distance must be below {SIMHASH_BANDS} for exact banded lookup')
+        self.max_distance = max_distance
+        self.buckets = {}
+        self.ids = set()
+
+    def _keys(self, fingerprint):
+        unsigned = fingerprint & ((1 << 64) - 1)
+        return [(band, (unsigned >> (band * SIMHASH_BAND_BITS)) & SIMHASH_BAND_MASK)
+                for band in range(SIMHASH_BANDS)]
+
+    def add(self, article_id, fingerprint):
+        if article_id in self.ids:
+            return
+        self.ids.add(article_id)
+        for key in self._keys(fingerprint):
+            self.buckets.setdefault(key, []).append((article_id, fingerprint))
+
+    def find(self, fingerprint):
+        """Return the ID of the closest fingerprint within max_distance, or None."""
+        best_id, best_distance = None, self.max_distance + 1
+        for key in self._keys(fingerprint):
+            for article_id, candidate in self.buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance < best_distance:
+                    best_id, best_distance = article_id, distance
+        return best_id
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values()) // SIMHASH_BANDS
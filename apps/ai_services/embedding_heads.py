@@ -0,0 +1,147 @@
+# apps/ai_services/embedding_heads.py
+"""
+Cheap classifiers over the stored article embeddings: a nearest-centroid
+category classifier that complements the keyword categorizer, and a
+left/right lean that complements the lexicon BiasDetector. Both are a
+matrix product per batch. Heads are trained offline from labelled rows
+(manage.py train_embedding_heads) and saved as one .npz file.
+"""
+import logging
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from .embeddings import EMBEDDING_MODEL_NAME
+
+logger = logging.getLogger(__name__)
+
+LEFT_LABEL = 'LEFT-LEANING'
+RIGHT_LABEL = 'RIGHT-LEANING'
+
+
+def centroids(vectors, labels, min_examples):
+    """
+    Unit-length mean vector per label with at least `min_examples` rows.
+    `labels` holds one set of labels per row (rows may have several).
+    """
+    names = sorted({label for row_labels in labels for label in row_labels})
+    kept, rows = [], []
+    for name in names:
+        members = [i for i, row_labels in enumerate(labels) if name in row_labels]
+        if len(members) >= min_examples:
+            mean = vectors[members].mean(axis=0)
+            kept.append(name)
+            rows.append(mean / max(np.linalg.norm(mean), 1e-12))
+    if not rows:
+        return [], np.zeros((0, vectors.shape[1]), dtype=np.float32)
+    return kept, np.stack(rows).astype(np.float32)
+
+
+class EmbeddingHeads:
+    def __init__(self, category_names, category_centroids, bias_centroids=None,
+                 model_name=EMBEDDING_MODEL_NAME):
+        self.category_names = list(category_names)
+        self.category_centroids = np.asarray(category_centroids, dtype=np.float32)
+        # Rows: left, right; None when the training data lacked either side
+        self.bias_centroids = (None if bias_centroids is None
+                               else np.asarray(bias_centroids, dtype=np.float32))
+        self.model_name = model_name
+
+    @classmethod
+    def train(cls, vectors, category_labels, bias_labels, min_examples=5):
+        """
+        Fit both heads: `category_labels` has one set of category names
+        per row of `vectors`, `bias_labels` one bias label (or None).
+        """
+        category_names, category_centroids = centroids(
+            vectors, category_labels, min_examples)
+        bias_names, bias_centroids = centroids(
+            vectors, [{label} if label in (LEFT_LABEL, RIGHT_LABEL) else set()
+                      for label in bias_labels], min_examples)
+        if bias_names != [LEFT_LABEL, RIGHT_LABEL]:
+            bias_centroids = None
+        return cls(category_names, category_centroids, bias_centroids)
+
+    def predict_categories(self, vectors, min_similarity=None, limit=None):
+        """
+        Category names per row: the closest centroids with a cosine
+        similarity of at least `min_similarity`, best first.
+        """
+        min_similarity = (min_similarity if min_similarity is not None else
+                          getattr(settings, 'EMBEDDING_CATEGORY_MIN_SIMILARITY', 0.4))
+        limit = limit or getattr(settings, 'EMBEDDING_CATEGORY_LIMIT', 2)
+        if not self.category_names or not len(vectors):
+            return [[] for _ in range(len(vectors))]
+        similarity = vectors @ self.category_centroids.T
+        order = np.argsort(-similarity, axis=1)[:, :limit]
+        best = np.take_along_axis(similarity, order, axis=1)
+        return [[self.category_names[j] for j, score in zip(row, scores) if score >= min_similarity]
+                for row, scores in zip(order, best)]
+
+    def bias_lean(self, vectors):
+        """
+        Position of each row on the axis from the left centroid (-1) to the
+        right centroid (+1), clipped to [-1, 1]; None without a bias head.
+        """
+        if self.bias_centroids is None:
+            return None
+        left, right = self.bias_centroids
+        axis = right - left
+        midpoint = (left + right) / 2
+        lean = 2 * ((vectors - midpoint) @ axis) / max(float(axis @ axis), 1e-12)
+        return np.clip(lean, -1, 1)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {
+            'model_name': np.array(self.model_name),
+            'category_names': np.array(self.category_names, dtype=str),
+            'category_centroids': self.category_centroids,
+        }
+        if self.bias_centroids is not None:
+            arrays['bias_centroids'] = self.bias_centroids
+        # np.savez appends .npz to names without it; write in place of `path`
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(name) for name in data['category_names']],
+                data['category_centroids'],
+                data['bias_centroids'] if 'bias_centroids' in data.files else None,
+                str(data['model_name']),
+            )
+
+
+_heads = None
+_heads_mtime = None
+_heads_lock = threading.Lock()
+
+
+def get_embedding_heads():
+    """
+    Return the trained heads, or None before train_embedding_heads has
+    run. The file is re-read when it changes, so long-running workers pick
+    up retrained heads.
+    """
+    global _heads, _heads_mtime
+    path = str(getattr(settings, 'EMBEDDING_HEADS_PATH', ''))
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if mtime != _heads_mtime:
+        with _heads_lock:
+            if mtime != _heads_mtime:
+                heads = EmbeddingHeads.load(path)
+                if heads.model_name != EMBEDDING_MODEL_NAME:
+                    logger.warning(
+                        f"Ignoring embedding heads trained on {heads.model_name}; "
+                        f"retrain them for {EMBEDDING_MODEL_NAME}")
+                    heads = None
+                _heads, _heads_mtime = heads, mtime
+    return _heads
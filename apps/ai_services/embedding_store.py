@@ -0,0 +1,172 @@
+# apps/ai_services/embedding_store.py
+"""
+Shared, read-mostly copy of every stored Article.embedding: one float32
+matrix in a .npy file plus a sorted int64 array of article IDs, both
+opened with mmap so web and worker processes share the pages through the
+OS page cache instead of each holding a copy.
+
+compact_embedding_store rebuilds the files from the database every few
+minutes and publishes them by atomically replacing a small manifest;
+readers notice the new manifest and remap. Articles embedded since the
+last compaction are read from Article.embedding, so no lookup ever needs
+the sentence model.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+from django.conf import settings
+
+from .embeddings import EMBEDDING_DIM, EMBEDDING_MODEL_NAME, vector_from_bytes
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'current.json'
+
+
+class EmbeddingStore:
+    def __init__(self, directory=None):
+        self.directory = str(directory or getattr(
+            settings, 'EMBEDDING_STORE_DIR', settings.BASE_DIR / 'models' / 'embedding_store'))
+        self._lock = threading.Lock()
+        self._manifest_mtime = None
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def snapshot(self):
+        """
+        (ids, vectors) of the last compaction: sorted article IDs and the
+        memory-mapped matrix with one row per ID. Empty before the first
+        compaction or when it was built for another embedding model.
+        """
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return self._ids, self._vectors
+        if mtime != self._manifest_mtime:
+            with self._lock:
+                if mtime != self._manifest_mtime:
+                    self._open(mtime)
+        return self._ids, self._vectors
+
+    def _open(self, mtime):
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['model'] != EMBEDDING_MODEL_NAME:
+            logger.warning(
+                f"Ignoring embedding store built with {manifest['model']}; "
+                f"compact it again for {EMBEDDING_MODEL_NAME}")
+            ids = np.zeros(0, dtype=np.int64)
+            vectors = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        else:
+            ids = np.load(os.path.join(self.directory, manifest['ids']), mmap_mode='r')
+            vectors = np.load(os.path.join(self.directory, manifest['vectors']), mmap_mode='r')
+        self._ids, self._vectors, self._manifest_mtime = ids, vectors, mtime
+
+    def vectors_for(self, article_ids):
+        """
+        Embeddings of `article_ids` in the given order, as a matrix and a
+        boolean mask of the rows that have one (articles not embedded yet
+        get a zero row). Rows come from the mapped matrix, falling back to
+        Article.embedding for articles newer than the last compaction.
+        """
+        from apps.news.models import Article
+
+        ids = np.asarray(article_ids, dtype=np.int64).reshape(-1)
+        vectors = np.zeros((len(ids), EMBEDDING_DIM), dtype=np.float32)
+        store_ids, store_vectors = self.snapshot()
+        found = np.zeros(len(ids), dtype=bool)
+        if len(store_ids) and len(ids):
+            positions = np.minimum(np.searchsorted(store_ids, ids), len(store_ids) - 1)
+            found = store_ids[positions] == ids
+            vectors[found] = store_vectors[positions[found]]
+        missing = ids[~found]
+        if len(missing):
+            row_of = {article_id: i for i, article_id in enumerate(ids.tolist())}
+            for article_id, blob in Article.objects.filter(
+                    id__in=missing.tolist(), embedding__isnull=False
+            ).values_list('id', 'embedding'):
+                vector = vector_from_bytes(blob)
+                if len(vector) == EMBEDDING_DIM:
+                    vectors[row_of[article_id]] = vector
+                    found[row_of[article_id]] = True
+        return vectors, found
+
+    def compact(self, chunk_size=2000):
+        """
+        Rebuild the files from every stored Article.embedding, streaming
+        rows into a new mapped file, and publish them. Returns the number
+        of articles in the new snapshot.
+        """
+        from apps.news.models import Article
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Never reuse a name: other processes may still map older files
+        version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        ids_name, vectors_name = f'ids-{version}.npy', f'vectors-{version}.npy'
+        rows = Article.objects.filter(embedding__isnull=False).order_by('id')
+        capacity = rows.count()
+        vectors = np.lib.format.open_memmap(
+            os.path.join(self.directory, vectors_name), mode='w+',
+            dtype=np.float32, shape=(capacity, EMBEDDING_DIM))
+        ids = np.empty(capacity, dtype=np.int64)
+        count = 0
+        for article_id, blob in rows.values_list('id', 'embedding').iterator(chunk_size=chunk_size):
+            vector = vector_from_bytes(blob)
+            if count == capacity or len(vector) != EMBEDDING_DIM:
+                # Articles embedded after count() wait for the next compaction
+                continue
+            ids[count], vectors[count] = article_id, vector
+            count += 1
+        vectors.flush()
+        del vectors
+        if count < capacity:
+            # Rows deleted while streaming: trim the file to the rows written
+            full = np.load(os.path.join(self.directory, vectors_name), mmap_mode='r')
+            np.save(os.path.join(self.directory, vectors_name + '.tmp'), full[:count])
+            del full
+            os.replace(os.path.join(self.directory, vectors_name + '.tmp.npy'),
+                       os.path.join(self.directory, vectors_name))
+        np.save(os.path.join(self.directory, ids_name), ids[:count])
+
+        manifest = {'model': EMBEDDING_MODEL_NAME, 'count': count,
+                    'ids': ids_name, 'vectors': vectors_name}
+        tmp_path = f'{self.manifest_path}.{version}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+        self._remove_old_files(keep={ids_name, vectors_name})
+        logger.info(f"Compacted embedding store: {count} articles")
+        return count
+
+    def _remove_old_files(self, keep):
+        # Processes that still map an old snapshot keep reading it after
+        # the unlink until they remap
+        for name in os.listdir(self.directory):
+            if name.endswith('.npy') and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError as e:
+                    logger.warning(f"Could not remove old embedding file {name}: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store():
+    """Return the process-wide EmbeddingStore."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EmbeddingStore()
+    return _store
@@ -0,0 +1,68 @@
+# apps/ai_services/embeddings.py
+"""
+Sentence embeddings of articles. Each article is encoded once, when it is
+ingested (apps.news.tasks.embed_articles); the stored vector then feeds
+the NumPy heads in embedding_heads.py and the recommendations.
+"""
+import threading
+
+import numpy as np
+from django.conf import settings
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_DIM = 384
+
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Return the shared SentenceTransformer, loading it on first call."""
+    global _embedding_model
+    if _embedding_model is None:
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+                _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return _embedding_model
+
+
+def embedding_text(title, description=''):
+    # The model reads 256 word pieces at most; headline and standfirst
+    # carry the story
+    return f"{title}. {description}" if description else title
+
+
+def encode(texts, batch_size=None):
+    """Unit-length float32 embeddings of `texts`, one row per text."""
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    vectors = get_embedding_model().encode(
+        list(texts),
+        batch_size=batch_size or getattr(settings, 'EMBEDDING_BATCH_SIZE', 64),
+        convert_to_numpy=True,
+    )
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def encode_articles(articles, batch_size=None):
+    return encode([embedding_text(article.title, article.description)
+                   for article in articles], batch_size)
+
+
+def vector_to_bytes(vector):
+    """Serialize a vector for Article.embedding."""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def vector_from_bytes(data):
+    return np.frombuffer(data, dtype=np.float32)
+
+
+def stack_vectors(blobs):
+    """Matrix with one stored Article.embedding per row."""
+    if not blobs:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    return np.frombuffer(b''.join(blobs), dtype=np.float32).reshape(len(blobs), -1)
@@ -0,0 +1,60 @@
+# apps/ai_services/html_extract.py
+from collections import namedtuple
+from html.parser import HTMLParser
+
+HtmlExtract = namedtuple('HtmlExtract', ['text', 'image_url', 'word_count'])
+
+# Elements whose text is never shown to a reader
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template'}
+
+
+class _FragmentParser(HTMLParser):
+    """Streaming parser collecting text nodes and the first <img> src."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self.image_url = ''
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == 'img' and not self.image_url:
+            self.image_url = (dict(attrs).get('src') or '').strip()
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'img' and not self.image_url:
+            self.image_url = (dict(attrs).get('src') or '').strip()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            data = data.strip()
+            if data:
+                self.chunks.append(data)
+
+
+def extract_html(fragment, separator='\n'):
+    """
+    Extract clean text, the first image URL and a word count from an HTML
+    fragment in a single streaming pass.
+
+    Text nodes are stripped and joined with ``separator``, matching
+    BeautifulSoup's ``get_text(separator=..., strip=True)``.
+    """
+    if not fragment:
+        return HtmlExtract('', '', 0)
+    if '<' not in fragment and '&' not in fragment:
+        # Plain text, nothing to parse
+        text = fragment.strip()
+        return HtmlExtract(text, '', len(text.split()))
+
+    parser = _FragmentParser()
+    parser.feed(fragment)
+    parser.close()
+    text = separator.join(parser.chunks)
+    return HtmlExtract(text, parser.image_url, sum(len(c.split()) for c in parser.chunks))
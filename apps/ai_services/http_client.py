@@ -0,0 +1,242 @@
+# apps/ai_services/http_client.py
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Responses worth another attempt; anything else is returned to the caller
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of contacting a host whose circuit is open."""
+
+
+class HostState:
+    """Concurrency, rate limiting and counters for a single host."""
+
+    def __init__(self, concurrency, rate):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.short_circuits = 0
+        self.request_time = 0.0
+        self.wait_time = 0.0
+        self.bytes = 0
+
+    def wait_for_slot(self):
+        """Block until the host's rate limit allows another request."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+            self.wait_time += slot - now
+
+
+class HttpClient:
+    """
+    Shared HTTP client for news sources.
+
+    One keep-alive connection pool for all hosts, a concurrency cap and
+    minimum request interval per host, retries with jittered exponential
+    backoff, and a circuit breaker: after `breaker_threshold` consecutive
+    failed calls a host is skipped for `breaker_cooldown` seconds. Breaker
+    state lives in the Django cache so it holds across worker processes
+    and hourly runs; a failure after the cooldown reopens it immediately.
+    Breakers are kept per client `name`, so failing article pages do not
+    cut off a publisher's feed and vice versa.
+    """
+
+    def __init__(self, name='sources', pool_size=None, per_host_concurrency=None,
+                 per_host_rate=None, host_limits=None, max_retries=None,
+                 backoff_base=None, backoff_max=None,
+                 breaker_threshold=None, breaker_cooldown=None):
+        def setting(value, name, default):
+            return value if value is not None else getattr(settings, name, default)
+
+        self.name = name
+        self.pool_size = setting(pool_size, 'NEWS_HTTP_POOL_SIZE', 20)
+        self.per_host_concurrency = setting(
+            per_host_concurrency, 'NEWS_HTTP_PER_HOST_CONCURRENCY', 4)
+        self.per_host_rate = setting(per_host_rate, 'NEWS_HTTP_PER_HOST_RATE', 5.0)
+        self.host_limits = setting(host_limits, 'NEWS_HTTP_HOST_LIMITS', {})
+        self.max_retries = setting(max_retries, 'NEWS_HTTP_MAX_RETRIES', 2)
+        self.backoff_base = setting(backoff_base, 'NEWS_HTTP_BACKOFF_BASE', 0.5)
+        self.backoff_max = setting(backoff_max, 'NEWS_HTTP_BACKOFF_MAX', 10.0)
+        self.breaker_threshold = setting(
+            breaker_threshold, 'NEWS_HTTP_BREAKER_THRESHOLD', 3)
+        self.breaker_cooldown = setting(
+            breaker_cooldown, 'NEWS_HTTP_BREAKER_COOLDOWN', 2 * 3600)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'personalized-news-aggregator/1.0'
+        # Retries are handled here so they respect the rate limit and breaker
+        adapter = HTTPAdapter(pool_connections=self.pool_size,
+                              pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def host_state(self, host):
+        with self._hosts_lock:
+            state = self._hosts.get(host)
+            if state is None:
+                limits = self.host_limits.get(host, {})
+                state = HostState(
+                    limits.get('concurrency', self.per_host_concurrency),
+                    limits.get('rate', self.per_host_rate))
+                self._hosts[host] = state
+            return state
+
+    def breaker_key(self, host):
+        return f'http_client:{self.name}:breaker:{host}'
+
+    def breaker(self, host):
+        """
+        Breaker state of `host`, or None (closed) when the cache is down: a
+        cache outage costs the breaker, not the requests.
+        """
+        try:
+            return cache.get(self.breaker_key(host))
+        except Exception as e:
+            logger.warning(f"Circuit breaker state unavailable for {host}: {e}")
+            return None
+
+    def circuit_open(self, host):
+        breaker = self.breaker(host)
+        return bool(breaker) and breaker.get('open_until', 0) > time.time()
+
+    def record_success(self, host):
+        breaker = self.breaker(host)
+        if breaker:
+            try:
+                cache.delete(self.breaker_key(host))
+            except Exception as e:
+                logger.warning(f"Could not close circuit for {host}: {e}")
+                return
+            if 'open_until' in breaker:
+                logger.info(f"Circuit closed for {host}")
+
+    def record_failure(self, host):
+        breaker = self.breaker(host) or {'failures': 0}
+        breaker['failures'] += 1
+        if breaker['failures'] >= self.breaker_threshold:
+            breaker['open_until'] = time.time() + self.breaker_cooldown
+        try:
+            # Keep the failure count a while past the cooldown so a failing
+            # probe reopens the circuit straight away
+            cache.set(self.breaker_key(host), breaker, self.breaker_cooldown * 2)
+        except Exception as e:
+            logger.warning(f"Could not record failure for {host}: {e}")
+            return
+        if 'open_until' in breaker:
+            logger.warning(
+                f"Circuit opened for {host} after {breaker['failures']} "
+                f"consecutive failures; skipping it for {self.breaker_cooldown}s")
+
+    def backoff(self, attempt, response=None):
+        """Full-jitter exponential backoff, honouring Retry-After."""
+        retry_after = response is not None and response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max,
+                                     self.backoff_base * 2 ** attempt))
+
+    def get(self, url, **kwargs):
+        """
+        GET `url` through the pool. Returns the last response (which may
+        still carry an error status) or raises a RequestException;
+        CircuitOpenError if the host is currently being skipped. With
+        stream=True the caller reads the body and reports its size
+        through record_bytes().
+        """
+        host = urlsplit(url).netloc
+        state = self.host_state(host)
+        if self.circuit_open(host):
+            state.short_circuits += 1
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        for attempt in range(self.max_retries + 1):
+            response = error = None
+            with state.semaphore:
+                state.wait_for_slot()
+                start_time = time.monotonic()
+                try:
+                    response = self.session.get(url, **kwargs)
+                except requests.exceptions.RequestException as req_err:
+                    error = req_err
+                state.request_time += time.monotonic() - start_time
+                state.requests += 1
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                if not kwargs.get('stream'):
+                    state.bytes += len(response.content)
+                self.record_success(host)
+                return response
+
+            state.errors += 1
+            if attempt == self.max_retries:
+                break
+            state.retries += 1
+            if response is not None:
+                response.close()
+            time.sleep(self.backoff(attempt, response))
+
+        self.record_failure(host)
+        if error is not None:
+            raise error
+        return response
+
+    def record_bytes(self, url, count):
+        """Count the body size of a streamed response read by the caller."""
+        self.host_state(urlsplit(url).netloc).bytes += count
+
+    def stats(self):
+        """Per-host counters since the client was created."""
+        with self._hosts_lock:
+            hosts = list(self._hosts.items())
+        return {
+            host: {
+                'requests': state.requests,
+                'errors': state.errors,
+                'retries': state.retries,
+                'short_circuits': state.short_circuits,
+                'request_time': state.request_time,
+                'wait_time': state.wait_time,
+                'bytes': state.bytes,
+                'circuit_open': self.circuit_open(host),
+            }
+            for host, state in hosts
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Process-wide HttpClient, so connections are reused across fetches."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.ann_index import IVFFlatIndex, train_centroids
+from apps.ai_services.embeddings import EMBEDDING_DIM
+
+
+def exact_search(vectors, published, query, k, published_after):
+    """Brute-force top-k, the baseline the index is measured against."""
+    scores = np.where(published >= published_after, vectors @ query, -np.inf)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class Command(BaseCommand):
+    help = ('Recall@k and latency of the IVF-flat ANN index against exact '
+            'search on synthetic clustered embeddings (no DB access).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=200000)
+        parser.add_argument('--topics', type=int, default=2000,
+                            help='Clusters in the synthetic embeddings')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--n-lists', type=int, default=None,
+                            help='Default: sqrt(articles)')
+        parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 4, 8, 16, 32, 64])
+        parser.add_argument('--window-days', type=float, default=3,
+                            help='Recency filter for the filtered runs (articles span 30 days)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n, k = options['articles'], options['k']
+
+        # Articles scattered around topic directions, like news embeddings
+        topics = rng.standard_normal((options['topics'], EMBEDDING_DIM)).astype(np.float32)
+        vectors = np.empty((n, EMBEDDING_DIM), dtype=np.float32)
+        for start in range(0, n, 50000):
+            end = min(n, start + 50000)
+            chunk = (topics[rng.integers(0, len(topics), end - start)] +
+                     0.8 * rng.standard_normal((end - start, EMBEDDING_DIM)))
+            vectors[start:end] = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+        now = int(time.time())
+        published = now - rng.integers(0, 30 * 86400, n)
+        ids = np.arange(1, n + 1, dtype=np.int64)
+        # Queries near stored articles, as for related stories and profiles
+        queries = vectors[rng.choice(n, options['queries'], replace=False)] + 0.3 / np.sqrt(
+            EMBEDDING_DIM) * rng.standard_normal((options['queries'], EMBEDDING_DIM))
+        queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+        n_lists = options['n_lists'] or int(np.sqrt(n))
+        start = time.perf_counter()
+        centroids = train_centroids(vectors, n_lists)
+        index = IVFFlatIndex.build(ids, vectors, published, centroids)
+        self.stdout.write(f"{n} articles, {n_lists} lists, built in "
+                          f"{time.perf_counter() - start:.1f}s")
+
+        for label, published_after in (('all', 0),
+                                        (f"last {options['window_days']:g} days",
+                                         now - int(options['window_days'] * 86400))):
+            truth, exact_times = [], []
+            for query in queries:
+                start = time.perf_counter()
+                truth.append(set(ids[exact_search(vectors, published, query, k, published_after)]))
+                exact_times.append(time.perf_counter() - start)
+            self.stdout.write(f"\n{label}: exact search p50 "
+                              f"{np.percentile(exact_times, 50) * 1000:.2f} ms")
+            self.stdout.write(f"{'n_probe':>8} {f'recall@{k}':>10} {'p50 ms':>8} {'p95 ms':>8}")
+            for n_probe in options['n_probe']:
+                recalls, times = [], []
+                for query, expected in zip(queries, truth):
+                    start = time.perf_counter()
+                    found, _ = index.search(query, k=k, n_probe=n_probe,
+                                            published_after=published_after)
+                    times.append(time.perf_counter() - start)
+                    recalls.append(len(expected.intersection(found.tolist())) / k)
+                self.stdout.write(
+                    f"{n_probe:>8} {np.mean(recalls):>10.3f} "
+                    f"{np.percentile(times, 50) * 1000:>8.2f} "
+                    f"{np.percentile(times, 95) * 1000:>8.2f}")
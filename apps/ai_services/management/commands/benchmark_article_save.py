@@ -0,0 +1,81 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.ai_services.news_fetcher import NewsFetcher
+from apps.ai_services.summarizer import OptimizedSummarizer
+from apps.news.models import Article
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Measure ingestion time per article: the old Article.save() that '
+            'summarized inline, the current save() that leaves enrichment to '
+            'the background pipeline, and NewsFetcher.ingest_items. All '
+            'writes are rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=50)
+        parser.add_argument('--skip-legacy', action='store_true',
+                            help='Do not load the summarization model')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'] if options['seed'] is not None else time.time_ns())
+        vocabulary = [''.join(rng.choices('abcdefghiklmnoprstuvwy', k=rng.randint(2, 9)))
+                      for _ in range(3000)]
+        run_id = rng.getrandbits(32)
+
+        def rows(mode):
+            return [{
+                'title': ' '.join(rng.choices(vocabulary, k=10)).capitalize(),
+                'description': ' '.join(rng.choices(vocabulary, k=40)) + '.',
+                'content': ' '.join(rng.choices(vocabulary, k=350)) + '.',
+                'url': f'https://bench.example/{run_id}/{mode}/{n}',
+                'source': 'Benchmark',
+                'author': '',
+                'image_url': '',
+                'published_date': timezone.now(),
+            } for n in range(options['articles'])]
+
+        modes = [('current save()', self.save_each), ('ingest_items', self.ingest_batch)]
+        if not options['skip_legacy']:
+            summarizer = OptimizedSummarizer()
+            # Load the model first so only per-article work is timed
+            summarizer.summarize(rows('warmup')[0]['content'])
+            modes.insert(0, ('legacy inline save()',
+                             lambda data: self.save_each(data, summarizer)))
+
+        self.stdout.write(f"{options['articles']} articles per mode")
+        for label, run in modes:
+            data = rows(label.split()[0])
+            try:
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        run(data)
+                        elapsed = time.perf_counter() - start
+                    raise _Rollback
+            except _Rollback:
+                pass
+            self.stdout.write(
+                f"{label:<22} {elapsed / len(data) * 1000:9.2f} ms/article "
+                f"{len(queries) / len(data):6.2f} queries/article")
+
+    def save_each(self, data, summarizer=None):
+        for row in data:
+            article = Article(**row)
+            if summarizer:
+                # What Article.save() used to do for every new article
+                article.summary = summarizer.summarize(article.content or article.description)
+            article.save()
+
+    def ingest_batch(self, data):
+        NewsFetcher().ingest_items(data)
@@ -0,0 +1,77 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.bias_detector import BiasDetector, load_lexicon
+
+FILLER_WORDS = [
+    'the', 'a', 'report', 'says', 'new', 'after', 'week', 'officials',
+    'plan', 'people', 'year', 'first', 'announced', 'over', 'talks', 'record',
+]
+# Roughly one lexicon term in fifty words of article text
+TERM_RATIO = 0.02
+
+
+def legacy_detect_bias(left_keywords, right_keywords, text, threshold=3):
+    """Scoring as BiasDetector.detect_bias did it before the compiled
+    lexicon: lowercase the text and substring-scan it once per keyword."""
+    left_score = sum(w for k, w in left_keywords.items() if k in text.lower())
+    right_score = sum(w for k, w in right_keywords.items() if k in text.lower())
+    if left_score == 0 and right_score == 0:
+        return "UNKNOWN"
+    elif left_score >= threshold and right_score >= threshold:
+        return "MIXED"
+    elif left_score - right_score >= threshold:
+        return "LEFT-LEANING"
+    elif right_score - left_score >= threshold:
+        return "RIGHT-LEANING"
+    return "NEUTRAL"
+
+
+class Command(BaseCommand):
+    help = ('Compare the compiled bias lexicon with the legacy per-keyword '
+            'scan on synthetic articles, for the shipped lexicon and for '
+            'lexicons grown with synthetic terms (no DB access).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=2000)
+        parser.add_argument('--words', type=int, default=600,
+                            help='Words per article')
+        parser.add_argument('--lexicon-sizes', type=int, nargs='+', default=[0, 1000, 5000],
+                            help='Synthetic terms added to the lexicon (0 = as shipped)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        base_left, base_right = load_lexicon()
+        filler = FILLER_WORDS + [f'word{i}' for i in range(500)]
+
+        self.stdout.write(f"{options['articles']} articles of {options['words']} words")
+        self.stdout.write(f"{'terms':>7} {'legacy us/article':>18} {'compiled us/article':>20} "
+                          f"{'speedup':>8} {'agreement':>10}")
+        for extra in options['lexicon_sizes']:
+            left, right = dict(base_left), dict(base_right)
+            for i in range(extra):
+                term = ' '.join(f'term{i}x{j}' for j in range(rng.randint(1, 3)))
+                (left if i % 2 else right)[term] = rng.randint(1, 3)
+            terms = list(left) + list(right)
+            texts = [' '.join(rng.choice(terms) if rng.random() < TERM_RATIO
+                              else rng.choice(filler) for _ in range(options['words']))
+                     for _ in range(options['articles'])]
+
+            start = time.perf_counter()
+            legacy = [legacy_detect_bias(left, right, text) for text in texts]
+            legacy_time = time.perf_counter() - start
+
+            detector = BiasDetector(left, right)
+            start = time.perf_counter()
+            compiled = [score.label for score in detector.detect_bias_many(texts)]
+            compiled_time = time.perf_counter() - start
+
+            agreement = sum(a == b for a, b in zip(legacy, compiled)) / len(texts)
+            n = len(texts)
+            self.stdout.write(
+                f"{len(terms):>7} {legacy_time / n * 1e6:>18.1f} "
+                f"{compiled_time / n * 1e6:>20.1f} {legacy_time / compiled_time:>7.1f}x "
+                f"{agreement:>10.1%}")
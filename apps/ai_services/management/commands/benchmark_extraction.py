@@ -0,0 +1,87 @@
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from apps.ai_services import content_extractor
+from apps.ai_services.content_extractor import ContentExtractor
+from apps.ai_services.standin_server import StandInNewsServer
+
+
+class Command(BaseCommand):
+    help = ('Extract article text from pages served by the local stand-in '
+            'news server and report throughput and how much of the known '
+            'article body (and nothing else) was recovered.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100)
+        parser.add_argument('--hosts', type=int, default=4,
+                            help='Stand-in servers to spread the articles over')
+        parser.add_argument('--paragraphs', type=int, default=8)
+        parser.add_argument('--latency', type=float, default=0.05)
+        parser.add_argument('--error-rate', type=float, default=0.0)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Override CONTENT_EXTRACTION_MAX_WORKERS')
+        parser.add_argument('--per-host-concurrency', type=int, default=None)
+        parser.add_argument('--per-host-rate', type=float, default=None,
+                            help='Requests/second per host (0 = unlimited)')
+
+    def handle(self, *args, **options):
+        servers = [StandInNewsServer(paragraphs=options['paragraphs'],
+                                     latency=options['latency'],
+                                     error_rate=options['error_rate'],
+                                     seed=n).start()
+                   for n in range(options['hosts'])]
+        overrides = {}
+        if options['workers']:
+            overrides['CONTENT_EXTRACTION_MAX_WORKERS'] = options['workers']
+        if options['per_host_concurrency']:
+            overrides['CONTENT_EXTRACTION_PER_HOST_CONCURRENCY'] = options['per_host_concurrency']
+        if options['per_host_rate'] is not None:
+            overrides['CONTENT_EXTRACTION_PER_HOST_RATE'] = options['per_host_rate']
+
+        expected = {}
+        articles = []
+        for n in range(options['articles']):
+            server = servers[n % len(servers)]
+            item = server.item('bench', n)
+            expected[n] = ' '.join(item['paragraphs'])
+            articles.append(SimpleNamespace(id=n, url=server.article_url(item), content=''))
+
+        try:
+            with override_settings(**overrides):
+                # A client of its own, so the overridden limits apply
+                content_extractor._client = None
+                extractor = ContentExtractor()
+                start = time.perf_counter()
+                extracted = extractor.extract_many(articles)
+                elapsed = time.perf_counter() - start
+                hosts = extractor.http.stats()
+        finally:
+            content_extractor._client = None
+            for server in servers:
+                server.stop()
+
+        recalls, precisions = [], []
+        for article_id, text in extracted.items():
+            got = Counter(text.split())
+            want = Counter(expected[article_id].split())
+            overlap = sum((got & want).values())
+            recalls.append(overlap / sum(want.values()))
+            precisions.append(overlap / sum(got.values()))
+
+        count = len(articles)
+        self.stdout.write(f"articles:     {count} on {len(servers)} host(s)")
+        self.stdout.write(f"extracted:    {len(extracted)} ({count - len(extracted)} failed)")
+        self.stdout.write(f"wall time:    {elapsed:.2f}s ({count / elapsed:.1f} pages/sec)")
+        if extracted:
+            self.stdout.write(f"recall:       {sum(recalls) / len(recalls):.3f} "
+                              f"(min {min(recalls):.3f})")
+            self.stdout.write(f"precision:    {sum(precisions) / len(precisions):.3f} "
+                              f"(min {min(precisions):.3f})")
+        for host, stats in hosts.items():
+            self.stdout.write(
+                f"{host}: {stats['requests']} requests, {stats['errors']} errors, "
+                f"{stats['bytes'] / 1024:.0f}KB, throttled {stats['wait_time']:.2f}s")
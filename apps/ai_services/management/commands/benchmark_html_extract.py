@@ -0,0 +1,79 @@
+import random
+import time
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.html_extract import extract_html
+
+WORDS = ('the government announced new measures on tuesday as markets '
+         'reacted to rising inflation and officials said talks would '
+         'continue next week').split()
+
+
+def legacy_extract(description_html, content_html):
+    """The BeautifulSoup path create_article_from_rss used: the description
+    parsed once for text and again for <img>, then the full content."""
+    description_text = BeautifulSoup(
+        description_html, 'html.parser').get_text(separator='\n', strip=True)
+    img_tag = BeautifulSoup(description_html, 'html.parser').find('img')
+    image_url = img_tag['src'] if img_tag and img_tag.get('src') else ''
+    content = BeautifulSoup(
+        content_html, 'html.parser').get_text(separator='\n\n', strip=True)
+    return description_text, image_url, content
+
+
+def single_pass_extract(description_html, content_html):
+    description = extract_html(description_html)
+    content = extract_html(content_html, separator='\n\n')
+    return description.text, description.image_url, content.text
+
+
+class Command(BaseCommand):
+    help = ('Measure CPU time of RSS entry HTML extraction per 1,000 entries: '
+            'legacy BeautifulSoup passes vs the single-pass extractor.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=1000)
+        parser.add_argument('--paragraphs', type=int, default=12,
+                            help='Paragraphs in each entry\'s full content')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        def paragraph():
+            return ' '.join(rng.choices(WORDS, k=rng.randint(30, 80)))
+
+        entries = []
+        for i in range(options['entries']):
+            description = (f'<p><img src="https://cdn.example.com/{i}.jpg" alt="">'
+                           f'{paragraph()} <a href="https://example.com/{i}">More</a></p>')
+            content = ''.join(
+                f'<p>{paragraph()} <em>{rng.choice(WORDS)}</em> &amp; more.</p>'
+                for _ in range(options['paragraphs']))
+            entries.append((description, content))
+
+        # Both paths must agree before timing them
+        for description, content in entries[:50]:
+            if legacy_extract(description, content) != single_pass_extract(description, content):
+                self.stderr.write('Warning: extractors disagree on sample output')
+                break
+
+        start = time.process_time()
+        for description, content in entries:
+            legacy_extract(description, content)
+        legacy_cpu = time.process_time() - start
+
+        start = time.process_time()
+        for description, content in entries:
+            single_pass_extract(description, content)
+        single_cpu = time.process_time() - start
+
+        per_1000 = 1000 / len(entries)
+        self.stdout.write(f"entries:                  {len(entries)}")
+        self.stdout.write(f"BeautifulSoup (3 passes): {legacy_cpu * per_1000:.3f}s CPU per 1,000 entries")
+        self.stdout.write(f"single pass:              {single_cpu * per_1000:.3f}s CPU per 1,000 entries")
+        self.stdout.write(
+            f"saved:                    {(legacy_cpu - single_cpu) * per_1000:.3f}s CPU per 1,000 entries "
+            f"({legacy_cpu / single_cpu:.1f}x)")
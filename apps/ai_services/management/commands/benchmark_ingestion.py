@@ -0,0 +1,161 @@
+import resource
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.ai_services import http_client
+from apps.ai_services.news_fetcher import NewsFetcher
+from apps.ai_services.standin_server import StandInNewsServer
+from apps.news.models import Feed, SourceWatermark
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Run the fetch_latest_news pipeline (NewsFetcher.fetch_all) against '
+            'a local stand-in news server and report ingestion throughput. '
+            'Everything written is rolled back unless --keep is given; even '
+            'then only the articles are kept, not the stand-in feeds or '
+            'watermarks.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sources', nargs='+', default=NewsFetcher.SOURCES,
+                            choices=NewsFetcher.SOURCES)
+        parser.add_argument('--feeds', type=int, default=20)
+        parser.add_argument('--entries', type=int, default=20,
+                            help='Entries per feed (also used as the feed entry_limit)')
+        parser.add_argument('--api-items', type=int, default=100,
+                            help='Articles available from each API source')
+        parser.add_argument('--paragraphs', type=int, default=8)
+        parser.add_argument('--latency', type=float, default=0.05,
+                            help='Mean response latency in seconds')
+        parser.add_argument('--error-rate', type=float, default=0.0)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Override NEWS_FETCH_MAX_WORKERS')
+        parser.add_argument('--max-pages', type=int, default=None,
+                            help='Override NEWS_FETCH_MAX_PAGES')
+        parser.add_argument('--per-host-concurrency', type=int, default=None,
+                            help='Override NEWS_HTTP_PER_HOST_CONCURRENCY (default: '
+                                 '--workers, as every source shares the stand-in host)')
+        parser.add_argument('--per-host-rate', type=float, default=0,
+                            help='Override NEWS_HTTP_PER_HOST_RATE (0 = unlimited)')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Content seed (default: a new one per run so '
+                                 'conditional-GET caches never hit)')
+        parser.add_argument('--keep', action='store_true',
+                            help='Commit the ingested articles instead of rolling back')
+
+    def handle(self, *args, **options):
+        server = StandInNewsServer(
+            api_items=options['api_items'],
+            feeds=options['feeds'],
+            entries_per_feed=options['entries'],
+            paragraphs=options['paragraphs'],
+            latency=options['latency'],
+            error_rate=options['error_rate'],
+            seed=options['seed'] if options['seed'] is not None else time.time_ns(),
+        )
+        overrides = {
+            'NEWSAPI_URL': f'{server.base_url}/newsapi',
+            'GUARDIAN_URL': f'{server.base_url}/guardian',
+            'NEWSAPI_KEY': 'standin',
+            'GUARDIAN_API_KEY': 'standin',
+            'NEWS_HTTP_PER_HOST_RATE': options['per_host_rate'],
+            'NEWS_HTTP_PER_HOST_CONCURRENCY': (
+                options['per_host_concurrency'] or options['workers']
+                or getattr(settings, 'NEWS_FETCH_MAX_WORKERS', 8)),
+        }
+        if options['workers']:
+            overrides['NEWS_FETCH_MAX_WORKERS'] = options['workers']
+        if options['max_pages']:
+            overrides['NEWS_FETCH_MAX_PAGES'] = options['max_pages']
+
+        with server, override_settings(**overrides):
+            # A client of its own, so the overridden limits apply
+            http_client._client = None
+            try:
+                with transaction.atomic():
+                    # Only the stand-in feeds and a fresh watermark take part
+                    active_feed_ids = list(Feed.objects.filter(
+                        is_active=True).values_list('id', flat=True))
+                    watermarks = list(SourceWatermark.objects.filter(
+                        source__in=options['sources']))
+                    Feed.objects.update(is_active=False)
+                    standin_feeds = Feed.objects.bulk_create([
+                        Feed(url=url, source_name=f'Stand-in {n}',
+                             entry_limit=options['entries'])
+                        for n, url in enumerate(server.feed_urls())])
+                    SourceWatermark.objects.filter(source__in=options['sources']).delete()
+
+                    fetcher = NewsFetcher()
+                    # Enrichment is queued on commit, so a rolled-back run
+                    # never reaches the Celery broker
+                    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        report = fetcher.fetch_all(options['sources'])
+                        elapsed = time.perf_counter() - start
+                    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+                    self.print_report(server, report, elapsed, len(queries), start_rss, peak_rss)
+                    if not options['keep']:
+                        raise _Rollback
+                    # Keep the articles only: the real feeds and watermarks
+                    # are restored and the stand-in feeds (pointing at a
+                    # port that is about to close) removed
+                    Feed.objects.filter(url__in=[feed.url for feed in standin_feeds]).delete()
+                    Feed.objects.filter(id__in=active_feed_ids).update(is_active=True)
+                    SourceWatermark.objects.filter(source__in=options['sources']).delete()
+                    SourceWatermark.objects.bulk_create(watermarks)
+            except _Rollback:
+                self.stdout.write('Rolled back benchmark data (use --keep to retain it)')
+            finally:
+                http_client._client = None
+
+    def print_report(self, server, report, elapsed, query_count, start_rss, peak_rss):
+        created = report['total']
+        self.stdout.write(f"requests served:     {server.requests_served}")
+        self.stdout.write(f"articles created:    {created}")
+        self.stdout.write(f"wall time:           {elapsed:.2f}s")
+        self.stdout.write(f"articles/sec:        {created / elapsed:.1f}")
+        self.stdout.write(
+            f"queries per article: {query_count / created:.2f} ({query_count} total)"
+            if created else f"queries:             {query_count}")
+        # ru_maxrss is reported in kilobytes on Linux
+        self.stdout.write(
+            f"peak RSS:            {peak_rss / 1024:.1f}MB "
+            f"(+{(peak_rss - start_rss) / 1024:.1f}MB during the run)")
+
+        by_source = {}
+        for stats in report['sources'].values():
+            entry = by_source.setdefault(stats['source'], {
+                'latencies': [], 'created': 0, 'errors': 0, 'ingest_time': 0.0})
+            entry['latencies'].extend(stats['request_times'])
+            entry['created'] += stats['created']
+            entry['errors'] += bool(stats['error'])
+            entry['ingest_time'] += stats['ingest_time']
+
+        self.stdout.write('')
+        self.stdout.write(f"{'source':<10} {'requests':>8} {'p50':>8} {'p95':>8} "
+                          f"{'ingest':>8} {'created':>8} {'errors':>7}")
+        for source, entry in sorted(by_source.items()):
+            latencies = entry['latencies'] or [0.0]
+            p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+            self.stdout.write(
+                f"{source:<10} {len(entry['latencies']):>8} {p50:>6.0f}ms {p95:>6.0f}ms "
+                f"{entry['ingest_time']:>7.2f}s {entry['created']:>8} {entry['errors']:>7}")
+
+        self.stdout.write('')
+        self.stdout.write(f"{'host':<22} {'requests':>8} {'errors':>7} {'retries':>7} "
+                          f"{'skipped':>7} {'time':>8} {'throttled':>9}")
+        for host, stats in report['hosts'].items():
+            self.stdout.write(
+                f"{host:<22} {stats['requests']:>8} {stats['errors']:>7} "
+                f"{stats['retries']:>7} {stats['short_circuits']:>7} "
+                f"{stats['request_time']:>7.2f}s {stats['wait_time']:>8.2f}s")
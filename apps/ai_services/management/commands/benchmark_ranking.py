@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.ranking import HybridRanker, get_candidate_pool, rank_queryset
+
+TARGET_MS = 10
+
+
+class Command(BaseCommand):
+    help = ('Time the HybridRanker scoring pass on synthetic candidate '
+            'features (no DB access), or with --stored the whole rank_queryset '
+            'path over the stored articles.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, nargs='+', default=[1000, 5000, 20000])
+        parser.add_argument('--sources', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--stored', action='store_true',
+                            help='Rank the stored articles (ID query, features and scoring).')
+        parser.add_argument('--user', help='Username to rank --stored for (default: anonymous).')
+
+    def handle(self, *args, **options):
+        if options['stored']:
+            return self.benchmark_stored(options)
+        rng = np.random.default_rng(options['seed'])
+        ranker = HybridRanker()
+        now = time.time()
+        self.stdout.write(f"{'candidates':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for n in options['candidates']:
+            features = {
+                'category': (rng.random(n) < 0.3).astype(np.float32),
+                'similarity': rng.random(n, dtype=np.float32),
+                'popularity': rng.random(n, dtype=np.float32),
+                'published': now - rng.random(n) * 3 * 86400,
+                'lean': rng.uniform(-1, 1, n).astype(np.float32),
+                'source': rng.integers(0, options['sources'], n),
+                'user_lean': 0.2,
+            }
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                ranker.rank(features, limit=options['page_size'], now=now)
+                timings.append(time.perf_counter() - start)
+            p50, p95 = np.percentile(timings, [50, 95]) * 1000
+            line = f"{n:>10} {p50:>8.2f} {p95:>8.2f}"
+            if n <= 5000 and p95 > TARGET_MS:
+                line = self.style.WARNING(f"{line}  (over the {TARGET_MS} ms target)")
+            self.stdout.write(line)
+
+    def benchmark_stored(self, options):
+        from django.contrib.auth.models import AnonymousUser, User
+
+        from apps.news.models import Article
+
+        user = (User.objects.get(username=options['user']) if options['user']
+                else AnonymousUser())
+        queryset = Article.objects.all()
+        start = time.perf_counter()
+        pool = get_candidate_pool()
+        self.stdout.write(f"candidate pool of {len(pool)} built in "
+                          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+        timings = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            rank_queryset(queryset, user, limit=options['page_size'])
+            timings.append(time.perf_counter() - start)
+        p50, p95 = np.percentile(timings, [50, 95]) * 1000
+        line = f"rank_queryset p50 {p50:.2f} ms, p95 {p95:.2f} ms"
+        if p95 > TARGET_MS:
+            line = self.style.WARNING(f"{line}  (over the {TARGET_MS} ms target)")
+        self.stdout.write(line)
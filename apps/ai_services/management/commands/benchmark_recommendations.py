@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.embedding_store import MANIFEST_NAME, EmbeddingStore
+from apps.ai_services.embeddings import EMBEDDING_DIM, EMBEDDING_MODEL_NAME, encode
+
+
+class Command(BaseCommand):
+    help = ('Compare ranking candidates by re-encoding them on every request '
+            '(as recommend_articles used to) with a lookup in a memory-mapped '
+            'embedding store of synthetic vectors (no DB access).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store-size', type=int, default=100000,
+                            help='Articles in the synthetic store')
+        parser.add_argument('--candidates', type=int, default=500,
+                            help='Candidate articles ranked per request')
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--encode-requests', type=int, default=1,
+                            help='Requests timed with re-encoding (slow)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        size, candidates = options['store_size'], options['candidates']
+        texts = [f"Headline {i} about the council budget. A short standfirst "
+                 f"describing story {i}." for i in range(candidates)]
+        profile = rng.standard_normal(EMBEDDING_DIM).astype(np.float32)
+        profile /= np.linalg.norm(profile)
+
+        encode(texts[:1])  # load the model outside the timings
+        start = time.perf_counter()
+        for _ in range(options['encode_requests']):
+            np.argsort(-(encode(texts) @ profile))[:10]
+        encode_time = (time.perf_counter() - start) / options['encode_requests']
+
+        with tempfile.TemporaryDirectory() as directory:
+            vectors = np.lib.format.open_memmap(
+                os.path.join(directory, 'vectors.npy'), mode='w+',
+                dtype=np.float32, shape=(size, EMBEDDING_DIM))
+            for start in range(0, size, 10000):
+                chunk = rng.standard_normal((min(10000, size - start), EMBEDDING_DIM))
+                vectors[start:start + len(chunk)] = chunk / np.linalg.norm(
+                    chunk, axis=1, keepdims=True)
+            vectors.flush()
+            del vectors
+            np.save(os.path.join(directory, 'ids.npy'), np.arange(1, size + 1, dtype=np.int64))
+            with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+                json.dump({'model': EMBEDDING_MODEL_NAME, 'count': size,
+                           'ids': 'ids.npy', 'vectors': 'vectors.npy'}, f)
+
+            store = EmbeddingStore(directory)
+            store.snapshot()
+            timings = []
+            for _ in range(options['requests']):
+                ids = rng.choice(size, candidates, replace=False) + 1
+                start = time.perf_counter()
+                matrix, found = store.vectors_for(ids)
+                np.argsort(-np.where(found, matrix @ profile, -np.inf))[:10]
+                timings.append(time.perf_counter() - start)
+
+            scan_start = time.perf_counter()
+            _, all_vectors = store.snapshot()
+            np.argpartition(-(all_vectors @ profile), 10)[:10]
+            scan_time = time.perf_counter() - scan_start
+
+        self.stdout.write(f"{candidates} candidates per request, store of {size} articles")
+        self.stdout.write(f"Re-encode per request: {encode_time * 1000:10.1f} ms")
+        self.stdout.write(f"Store lookup p50:      {np.percentile(timings, 50) * 1000:10.2f} ms")
+        self.stdout.write(f"Store lookup p95:      {np.percentile(timings, 95) * 1000:10.2f} ms")
+        self.stdout.write(f"Full store scan:       {scan_time * 1000:10.2f} ms")
@@ -0,0 +1,69 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Packages a web process should never import
+HEAVY_MODULES = ['torch', 'transformers', 'sentence_transformers', 'sklearn',
+                 'tensorflow', 'onnxruntime']
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = ('Measure process startup: wall time of `manage.py check` and a '
+            '`python -X importtime` breakdown of what it imports, flagging '
+            'ML libraries that web workers should not load.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Timed `manage.py check` runs (median is reported)')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Slowest top-level imports to list')
+
+    def handle(self, *args, **options):
+        manage_py = os.path.join(settings.BASE_DIR, 'manage.py')
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'config.settings'))
+        command = [sys.executable, manage_py, 'check']
+
+        times = []
+        for _ in range(options['runs']):
+            start = time.perf_counter()
+            subprocess.run(command, env=env, check=True, capture_output=True)
+            times.append(time.perf_counter() - start)
+        self.stdout.write(
+            f"manage.py check: median {statistics.median(times):.2f}s "
+            f"(min {min(times):.2f}s, max {max(times):.2f}s, {len(times)} runs)")
+
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + command[1:],
+            env=env, check=True, capture_output=True, text=True)
+        top_level = []
+        imported = set()
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if not match:
+                continue
+            _, cumulative, indent, name = match.groups()
+            imported.add(name.split('.')[0])
+            if len(indent) == 1:
+                top_level.append((int(cumulative), name))
+
+        total = sum(cumulative for cumulative, _ in top_level)
+        self.stdout.write(f"imports: {len(top_level)} top-level, {total / 1e6:.2f}s cumulative")
+        for cumulative, name in sorted(top_level, reverse=True)[:options['top']]:
+            self.stdout.write(f"  {cumulative / 1e3:9.1f}ms  {name}")
+
+        heavy = [name for name in HEAVY_MODULES if name in imported]
+        if heavy:
+            self.stdout.write(self.style.WARNING(
+                f"ML libraries imported at startup: {', '.join(heavy)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"No ML libraries imported at startup ({', '.join(HEAVY_MODULES)})"))
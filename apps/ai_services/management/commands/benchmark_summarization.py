@@ -0,0 +1,62 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.extractive import ExtractiveSummarizer
+from apps.ai_services.summarizer import OptimizedSummarizer
+
+
+class Command(BaseCommand):
+    help = ('Measure OptimizedSummarizer throughput (articles/sec) for '
+            'several batch sizes on synthetic articles of mixed length, '
+            'against the extractive summarizer used at ingestion.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=64)
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32])
+        parser.add_argument('--min-chars', type=int, default=600)
+        parser.add_argument('--max-chars', type=int, default=4000)
+        parser.add_argument('--no-bucketing', action='store_true',
+                            help='Keep input order instead of sorting batches by length')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = [''.join(rng.choices('abcdefghiklmnoprstuvwy', k=rng.randint(2, 9)))
+                      for _ in range(3000)]
+
+        def article():
+            words = []
+            length = rng.randint(options['min_chars'], options['max_chars'])
+            while sum(len(word) + 1 for word in words) < length:
+                sentence = rng.choices(vocabulary, k=rng.randint(8, 20))
+                words.extend([sentence[0].capitalize()] + sentence[1:-1] + [sentence[-1] + '.'])
+            return ' '.join(words)
+
+        texts = [article() for _ in range(options['articles'])]
+        summarizer = OptimizedSummarizer()
+        # Warm up so one-off initialisation isn't charged to the first size
+        summarizer.summarize_many(texts[:2], batch_size=2)
+
+        self.stdout.write(
+            f"{len(texts)} articles, {options['min_chars']}-{options['max_chars']} "
+            f"characters, length bucketing {'off' if options['no_bucketing'] else 'on'}")
+        baseline = None
+        for batch_size in options['batch_sizes']:
+            start = time.perf_counter()
+            summarizer.summarize_many(texts, batch_size=batch_size,
+                                      bucket=not options['no_bucketing'])
+            elapsed = time.perf_counter() - start
+            rate = len(texts) / elapsed
+            baseline = baseline or rate
+            self.stdout.write(
+                f"batch size {batch_size:>3}: {rate:8.2f} articles/s "
+                f"({elapsed:.2f}s, {rate / baseline:.2f}x)")
+
+        start = time.perf_counter()
+        ExtractiveSummarizer().summarize_many(texts)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"extractive:     {len(texts) / elapsed:8.2f} articles/s "
+            f"({elapsed / len(texts) * 1000:.2f}ms per article)")
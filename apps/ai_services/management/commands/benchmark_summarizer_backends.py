@@ -0,0 +1,178 @@
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Length
+
+from apps.ai_services.summarizer import (
+    BACKENDS, OptimizedSummarizer, get_summarizer_pipeline, model_identity)
+from apps.ai_services.worker_preload import memory_usage
+from apps.news.models import Article
+
+
+def rouge_l(reference, candidate):
+    """ROUGE-L F1 between two summaries (longest common word subsequence)."""
+    reference, candidate = reference.lower().split(), candidate.lower().split()
+    if not reference or not candidate:
+        return float(reference == candidate)
+    previous = [0] * (len(candidate) + 1)
+    for word in reference:
+        current = [0]
+        for j, other in enumerate(candidate):
+            current.append(previous[j] + 1 if word == other
+                           else max(previous[j + 1], current[j]))
+        previous = current
+    common = previous[-1]
+    if not common:
+        return 0.0
+    precision, recall = common / len(candidate), common / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+
+class Command(BaseCommand):
+    help = ('Compare summarizer backends (SUMMARIZER_BACKEND) on the same '
+            'articles: load time, memory, per-article latency and batched '
+            'throughput, plus a parity check of the summaries against the '
+            'first backend. Fails if the mean ROUGE-L F1 is below --min-rouge.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+        parser.add_argument('--articles', type=int, default=32)
+        parser.add_argument('--batch-size', type=int, default=8)
+        parser.add_argument('--max-length', type=int, default=100)
+        parser.add_argument('--synthetic', action='store_true',
+                            help='Use generated text instead of stored articles')
+        parser.add_argument('--min-rouge', type=float, default=0.75)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--backend', choices=BACKENDS,
+                            help='Run a single backend and print JSON (used internally)')
+        parser.add_argument('--input', help='JSON file with the texts (used internally)')
+
+    def handle(self, *args, **options):
+        if options['backend']:
+            with open(options['input']) as f:
+                texts = json.load(f)
+            result = self.run_backend(options['backend'], texts,
+                                      options['batch_size'], options['max_length'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        texts = self.texts(options)
+        if not texts:
+            raise CommandError('No articles long enough to summarize; try --synthetic')
+
+        # Each backend runs in a fresh interpreter so their memory is measured apart
+        results = {}
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as input_file:
+            json.dump(texts, input_file)
+            input_file.flush()
+            for backend in options['backends']:
+                command = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'),
+                           'benchmark_summarizer_backends', '--backend', backend,
+                           '--input', input_file.name,
+                           '--batch-size', str(options['batch_size']),
+                           '--max-length', str(options['max_length'])]
+                completed = subprocess.run(command, capture_output=True, text=True)
+                if completed.returncode:
+                    raise CommandError(f"{backend} backend failed:\n{completed.stderr[-2000:]}")
+                results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        backends = list(results)
+        self.stdout.write(f"{len(texts)} articles, batch size {options['batch_size']}, "
+                          f"max_length {options['max_length']}")
+        for backend in backends:
+            self.stdout.write(f"{backend}: {results[backend]['model']}")
+        self.stdout.write(f"{'':<30}" + ''.join(f"{backend:>14}" for backend in backends))
+        rows = [
+            ('load time (s)', lambda r: f"{r['load_time']:.2f}"),
+            ('RSS after load (MB)', lambda r: f"{r['loaded']['rss']:.0f}"),
+            ('model memory (MB)', lambda r: f"{r['loaded']['rss'] - r['base']['rss']:.0f}"),
+            ('peak RSS (MB)', lambda r: f"{r['peak_rss']:.0f}"),
+            ('latency p50 (ms)', lambda r: f"{self.percentile(r['latencies'], 50):.0f}"),
+            ('latency p95 (ms)', lambda r: f"{self.percentile(r['latencies'], 95):.0f}"),
+            ("batched (articles/s)", lambda r: f"{len(texts) / r['batch_time']:.2f}"),
+        ]
+        for label, value in rows:
+            self.stdout.write(f"{label:<30}" + ''.join(
+                f"{value(results[backend]):>14}" for backend in backends))
+
+        reference = backends[0]
+        failed = []
+        for backend in backends[1:]:
+            scores = [rouge_l(a, b) for a, b in zip(
+                results[reference]['summaries'], results[backend]['summaries'])]
+            exact = sum(a == b for a, b in zip(
+                results[reference]['summaries'], results[backend]['summaries']))
+            speedup = results[reference]['batch_time'] / results[backend]['batch_time']
+            self.stdout.write(
+                f"{backend} vs {reference}: {speedup:.2f}x batched throughput, "
+                f"{exact}/{len(scores)} identical summaries, ROUGE-L F1 "
+                f"mean {statistics.mean(scores):.3f} min {min(scores):.3f}")
+            if statistics.mean(scores) < options['min_rouge']:
+                failed.append(backend)
+        if failed:
+            raise CommandError(
+                f"Summaries from {', '.join(failed)} diverge from {reference} "
+                f"(mean ROUGE-L below {options['min_rouge']})")
+
+    def texts(self, options):
+        min_chars = OptimizedSummarizer.min_model_chars
+        if not options['synthetic']:
+            return list(Article.objects.annotate(length=Length('content')).filter(
+                length__gte=min_chars).order_by('-published_date').values_list(
+                'content', flat=True)[:options['articles']])
+
+        rng = random.Random(options['seed'])
+        vocabulary = [''.join(rng.choices('abcdefghiklmnoprstuvwy', k=rng.randint(2, 9)))
+                      for _ in range(3000)]
+        texts = []
+        for _ in range(options['articles']):
+            words = []
+            length = rng.randint(min_chars, 4000)
+            while sum(len(word) + 1 for word in words) < length:
+                sentence = rng.choices(vocabulary, k=rng.randint(8, 20))
+                words.extend([sentence[0].capitalize()] + sentence[1:-1] + [sentence[-1] + '.'])
+            texts.append(' '.join(words))
+        return texts
+
+    def percentile(self, values, percent):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+    def run_backend(self, backend, texts, batch_size, max_length):
+        settings.SUMMARIZER_BACKEND = backend
+        summarizer = OptimizedSummarizer()
+        base = memory_usage()
+        start = time.perf_counter()
+        get_summarizer_pipeline()
+        load_time = time.perf_counter() - start
+        loaded = memory_usage()
+        summarizer.summarize(texts[0], max_length)  # first call initialises lazily
+
+        summaries, latencies = [], []
+        for text in texts:
+            start = time.perf_counter()
+            summaries.append(summarizer.summarize(text, max_length))
+            latencies.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        summarizer.summarize_many(texts, max_length, batch_size)
+        batch_time = time.perf_counter() - start
+
+        return {
+            'model': model_identity(backend),
+            'load_time': load_time,
+            'base': base,
+            'loaded': loaded,
+            'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'latencies': latencies,
+            'batch_time': batch_time,
+            'summaries': summaries,
+        }
@@ -0,0 +1,93 @@
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.worker_preload import memory_usage, preload_models, warm_up_inference
+
+
+def _child(barrier, results, embeddings):
+    cold_start = warm_up_inference(embeddings)
+    # Measure once every child is up, so shared pages are split between all
+    barrier.wait()
+    results.put(dict(memory_usage(), cold_start=cold_start))
+    barrier.wait()
+
+
+class Command(BaseCommand):
+    help = ('Compare prefork worker children that load the AI models '
+            'themselves with children forked from a parent that preloaded '
+            'them: cold-start time to the first inference and per-child '
+            'RSS/USS/PSS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--children', type=int, default=4)
+        parser.add_argument('--no-embeddings', action='store_true',
+                            help='Only load the summarizer')
+        parser.add_argument('--mode', choices=['cold', 'preloaded'],
+                            help='Run a single mode and print JSON (used internally)')
+
+    def handle(self, *args, **options):
+        embeddings = not options['no_embeddings']
+        if options['mode']:
+            result = self.run_mode(options['mode'], options['children'], embeddings)
+            self.stdout.write(json.dumps(result))
+            return
+
+        # Each mode runs in a fresh interpreter so nothing is loaded up front
+        results = {}
+        for mode in ('cold', 'preloaded'):
+            command = [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'),
+                       'benchmark_worker_preload', '--mode', mode,
+                       '--children', str(options['children'])]
+            if not embeddings:
+                command.append('--no-embeddings')
+            output = subprocess.run(command, check=True, capture_output=True,
+                                    text=True).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+        self.stdout.write(f"{options['children']} children, "
+                          f"models: summarizer{' + embeddings' if embeddings else ''}")
+        self.stdout.write(f"{'':<28} {'cold':>10} {'preloaded':>10}")
+        rows = [
+            ('parent load time (s)', lambda r: r['parent_load']),
+            ('parent RSS (MB)', lambda r: r['parent']['rss']),
+            ('child cold start, median (s)',
+             lambda r: statistics.median(c['cold_start'] for c in r['children'])),
+            ('child cold start, max (s)',
+             lambda r: max(c['cold_start'] for c in r['children'])),
+            ('child RSS, mean (MB)', lambda r: self.mean(r, 'rss')),
+            ('child USS, mean (MB)', lambda r: self.mean(r, 'uss')),
+            ('child PSS, mean (MB)', lambda r: self.mean(r, 'pss')),
+            ('total PSS (MB)',
+             lambda r: r['parent'].get('pss', 0) + sum(c.get('pss', 0) for c in r['children'])),
+        ]
+        for label, value in rows:
+            self.stdout.write(f"{label:<28} {value(results['cold']):>10.2f} "
+                              f"{value(results['preloaded']):>10.2f}")
+
+    def mean(self, result, name):
+        return statistics.mean(child.get(name, 0) for child in result['children'])
+
+    def run_mode(self, mode, children, embeddings):
+        parent_load = preload_models(embeddings) if mode == 'preloaded' else 0.0
+        context = multiprocessing.get_context('fork')
+        # A child that fails breaks the barrier instead of hanging the run
+        barrier = context.Barrier(children + 1, timeout=600)
+        results = context.Queue()
+        processes = [context.Process(target=_child, args=(barrier, results, embeddings))
+                     for _ in range(children)]
+        for process in processes:
+            process.start()
+        barrier.wait()
+        child_results = [results.get() for _ in processes]
+        parent = memory_usage()
+        barrier.wait()
+        for process in processes:
+            process.join()
+        return {'parent_load': parent_load, 'parent': parent, 'children': child_results}
@@ -0,0 +1,64 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai_services.summarizer import MODEL_NAME
+
+
+class Command(BaseCommand):
+    help = ('Export the summarization model to ONNX and quantize its weights '
+            'to int8 (dynamic quantization) for SUMMARIZER_BACKEND = "onnx". '
+            'Needs optimum[onnxruntime] and access to the Hugging Face Hub.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Target directory (default: SUMMARIZER_ONNX_DIR)')
+        parser.add_argument('--arch', default='avx2',
+                            choices=['arm64', 'avx2', 'avx512', 'avx512_vnni'],
+                            help='CPU instruction set the quantized kernels target')
+        parser.add_argument('--per-channel', action='store_true',
+                            help='Quantize weights per channel (slower, closer to fp32)')
+
+    def handle(self, *args, **options):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise CommandError('Install optimum[onnxruntime] first (see requirements.txt)')
+
+        output = Path(options['output'] or settings.SUMMARIZER_ONNX_DIR)
+        output.mkdir(parents=True, exist_ok=True)
+        quantization_config = getattr(AutoQuantizationConfig, options['arch'])(
+            is_static=False, per_channel=options['per_channel'])
+
+        with tempfile.TemporaryDirectory() as export_dir:
+            start_time = time.monotonic()
+            model = ORTModelForSeq2SeqLM.from_pretrained(MODEL_NAME, export=True)
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(output)
+            self.stdout.write(
+                f"Exported {MODEL_NAME} to ONNX in {time.monotonic() - start_time:.1f}s")
+
+            # The encoder and both decoders are quantized separately; the
+            # results keep their original file names so the directory loads
+            # like an unquantized export
+            for onnx_file in sorted(Path(export_dir).glob('*.onnx')):
+                ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name).quantize(
+                    save_dir=output, quantization_config=quantization_config)
+                quantized = output / f'{onnx_file.stem}_quantized.onnx'
+                quantized.replace(output / onnx_file.name)
+                self.stdout.write(
+                    f"{onnx_file.name}: {onnx_file.stat().st_size / 1024 / 1024:.0f}MB fp32 -> "
+                    f"{(output / onnx_file.name).stat().st_size / 1024 / 1024:.0f}MB int8")
+            for config_file in Path(export_dir).glob('*.json'):
+                shutil.copy(config_file, output / config_file.name)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Quantized model ({options['arch']}) written to {output}. Check it with "
+            f"`manage.py benchmark_summarizer_backends` before setting "
+            f"SUMMARIZER_BACKEND = 'onnx'."))
@@ -0,0 +1,24 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.user_profiles import rebuild_profile
+
+
+class Command(BaseCommand):
+    help = ('Rebuild stored user profile vectors by replaying reads and '
+            'bookmarks, e.g. after the embedding model changes or for '
+            'history recorded before profiles existed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[],
+                            help='Username to rebuild (repeatable; default: all users)')
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(username__in=options['user'])
+        count = 0
+        for user_id in users.values_list('id', flat=True).iterator():
+            rebuild_profile(user_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} user profiles"))
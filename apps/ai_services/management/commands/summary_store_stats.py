@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.ai_services.summary_store import SummaryStore
+from apps.news.models import SummaryRecord
+
+
+class Command(BaseCommand):
+    help = 'Show summary store hit/miss counters and the number of stored summaries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        store = SummaryStore()
+        stats = store.stats()
+        self.stdout.write(f"stored summaries: {SummaryRecord.objects.count()}")
+        self.stdout.write(f"hot hits:         {stats['hot_hits']}")
+        self.stdout.write(f"cold hits:        {stats['cold_hits']}")
+        self.stdout.write(f"misses:           {stats['misses']}")
+        self.stdout.write(f"hit rate:         {stats['hit_rate']:.1%}")
+        if options['reset']:
+            store.reset_stats()
+            self.stdout.write('Counters reset')
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai_services.categorizer import DEFAULT_CATEGORY
+from apps.ai_services.embedding_heads import LEFT_LABEL, RIGHT_LABEL, EmbeddingHeads
+from apps.ai_services.embeddings import encode_articles, stack_vectors, vector_to_bytes
+from apps.news.models import Article
+
+
+class Command(BaseCommand):
+    help = ('Train the category and bias-lean heads on stored article '
+            'embeddings, report their accuracy on a holdout split and save '
+            'them to EMBEDDING_HEADS_PATH.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--embed-missing', action='store_true',
+                            help='Encode articles that have no embedding yet first')
+        parser.add_argument('--min-examples', type=int, default=5,
+                            help='Articles needed before a label gets a centroid')
+        parser.add_argument('--holdout', type=float, default=0.2,
+                            help='Share of articles held out for the accuracy report')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options['embed_missing']:
+            self.embed_missing()
+
+        articles = list(Article.objects.filter(embedding__isnull=False)
+                        .only('id', 'embedding', 'bias_score')
+                        .prefetch_related('categories'))
+        if not articles:
+            raise CommandError('No embedded articles; run with --embed-missing')
+        vectors = stack_vectors([bytes(article.embedding) for article in articles])
+        # The fallback category carries no signal of its own
+        category_labels = [{category.name for category in article.categories.all()
+                            if category.name != DEFAULT_CATEGORY} for article in articles]
+        bias_labels = [article.bias_score for article in articles]
+        self.stdout.write(f"{len(articles)} embedded articles")
+
+        order = list(range(len(articles)))
+        random.Random(options['seed']).shuffle(order)
+        split = int(len(order) * options['holdout'])
+        test, train = np.array(order[:split], dtype=int), np.array(order[split:], dtype=int)
+        if len(test):
+            heads = EmbeddingHeads.train(
+                vectors[train], [category_labels[i] for i in train],
+                [bias_labels[i] for i in train], options['min_examples'])
+            self.report(heads, vectors[test], [category_labels[i] for i in test],
+                        [bias_labels[i] for i in test])
+
+        heads = EmbeddingHeads.train(vectors, category_labels, bias_labels,
+                                     options['min_examples'])
+        path = str(settings.EMBEDDING_HEADS_PATH)
+        heads.save(path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Saved {len(heads.category_names)} category centroids"
+            f"{' and a bias head' if heads.bias_centroids is not None else ''} to {path}"))
+
+    def embed_missing(self):
+        missing = list(Article.objects.filter(embedding__isnull=True)
+                       .only('id', 'title', 'description'))
+        batch_size = getattr(settings, 'EMBEDDING_BATCH_SIZE', 64) * 16
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            for article, vector in zip(batch, encode_articles(batch)):
+                article.embedding = vector_to_bytes(vector)
+            Article.objects.bulk_update(batch, ['embedding'])
+        self.stdout.write(f"Embedded {len(missing)} articles")
+
+    def report(self, heads, vectors, category_labels, bias_labels):
+        """Top-1 category accuracy and lean-sign accuracy on held-out rows."""
+        predicted = heads.predict_categories(vectors, min_similarity=-1, limit=1)
+        scored = [(names[0] in labels) for names, labels in zip(predicted, category_labels)
+                  if labels and names]
+        if scored:
+            self.stdout.write(f"Category top-1 accuracy: {np.mean(scored):.1%} "
+                              f"({len(scored)} held-out articles)")
+        leans = heads.bias_lean(vectors)
+        if leans is None:
+            self.stdout.write('Bias head: not enough LEFT/RIGHT-LEANING articles')
+            return
+        sides = [(lean > 0) == (label == RIGHT_LABEL) for lean, label in zip(leans, bias_labels)
+                 if label in (LEFT_LABEL, RIGHT_LABEL)]
+        if sides:
+            self.stdout.write(f"Bias lean sign accuracy: {np.mean(sides):.1%} "
+                              f"({len(sides)} held-out articles)")
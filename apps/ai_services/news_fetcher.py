@@ -1,22 +1,93 @@
 import requests
 import feedparser
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
-from django.utils.text import slugify
-from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+import hashlib
 import logging
-from bs4 import BeautifulSoup
-from apps.news.models import Article, Category  
+import threading
+import time
+from apps.news.models import Article, Feed, SourceWatermark
+from .bias_detector import get_bias_detector
+from .categorizer import get_categorizer
+from .dedup import SimHashIndex, canonicalize_url, simhash
+from .extractive import ExtractiveSummarizer
+from .html_extract import extract_html
+from .http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+NEWSAPI_URL = "https://newsapi.org/v2/top-headlines"
+GUARDIAN_URL = "https://content.guardianapis.com/search"
+
+_dedup_index = None
+_dedup_last_id = 0
+_dedup_built_at = 0.0
+_dedup_synced_at = 0.0
+_dedup_lock = threading.Lock()
+
+
+def get_dedup_index():
+    """
+    Process-wide SimHash index of recent canonical articles, shared by all
+    fetchers (one per feed poll). Articles stored by other processes are
+    added at most every NEWS_DEDUP_SYNC_SECONDS; the index is rebuilt every
+    NEWS_DEDUP_REBUILD_SECONDS so old stories leave the window.
+    """
+    global _dedup_index, _dedup_last_id, _dedup_built_at, _dedup_synced_at
+    now = time.monotonic()
+    with _dedup_lock:
+        if _dedup_index is None or now - _dedup_built_at >= getattr(
+                settings, 'NEWS_DEDUP_REBUILD_SECONDS', 3600):
+            _dedup_index = SimHashIndex(getattr(settings, 'NEWS_DEDUP_MAX_DISTANCE', 6))
+            _dedup_last_id, _dedup_built_at, _dedup_synced_at = 0, now, 0.0
+        if now - _dedup_synced_at >= getattr(settings, 'NEWS_DEDUP_SYNC_SECONDS', 30):
+            recent = Article.objects.filter(
+                id__gt=_dedup_last_id,
+                published_date__gte=timezone.now() - timedelta(
+                    hours=getattr(settings, 'NEWS_DEDUP_WINDOW_HOURS', 48)),
+                simhash__isnull=False,
+                duplicate_of__isnull=True,
+            ).order_by('id').values_list('id', 'simhash')
+            for article_id, fingerprint in recent.iterator():
+                _dedup_index.add(article_id, fingerprint)
+                _dedup_last_id = article_id
+            _dedup_synced_at = now
+        return _dedup_index
+
 
 class NewsFetcher:
+    SOURCES = ['newsapi', 'guardian', 'rss']
+
     def __init__(self):
         # Initialize API keys from Django settings
         # Ensure NEWSAPI_KEY and GUARDIAN_API_KEY are defined in your settings.py
         self.newsapi_key = getattr(settings, 'NEWSAPI_KEY', None)
         self.guardian_key = getattr(settings, 'GUARDIAN_API_KEY', None)
+        # Overridable so benchmarks can point the fetcher at a local stand-in
+        self.newsapi_url = getattr(settings, 'NEWSAPI_URL', NEWSAPI_URL)
+        self.guardian_url = getattr(settings, 'GUARDIAN_URL', GUARDIAN_URL)
+        # Concurrent downloads in fetch_all() and per-request timeout (seconds)
+        self.max_workers = getattr(settings, 'NEWS_FETCH_MAX_WORKERS', 8)
+        self.timeout = getattr(settings, 'NEWS_FETCH_TIMEOUT', 30)
+        # Pooled connections, per-host limits, retries and circuit breaking
+        self.http = get_http_client()
+        # Upper bound on API pages requested per source and run
+        self.max_pages = getattr(settings, 'NEWS_FETCH_MAX_PAGES', 5)
+        # How long ETag/Last-Modified/body digests are kept per feed or query
+        self.http_cache_timeout = getattr(
+            settings, 'NEWS_FETCH_HTTP_CACHE_TIMEOUT', 7 * 24 * 3600)
+        # Summaries and bias scores written at ingestion, before bulk_create
+        self.extractive_summarizer = ExtractiveSummarizer()
+        self.bias_detector = get_bias_detector()
+        # Teaser-only articles get their page text extracted after ingestion
+        self.extract_content = getattr(settings, 'CONTENT_EXTRACTION_ENABLED', False)
+        self.extract_min_words = getattr(settings, 'CONTENT_EXTRACTION_MIN_WORDS', 120)
 
     def fetch_from_source(self, source):
         """Fetch articles from specified source"""
@@ -32,112 +103,404 @@ class NewsFetcher:
 
     def fetch_from_newsapi(self):
         """Fetch articles from NewsAPI"""
-        if not self.newsapi_key:
-            logger.warning(
-                "NewsAPI key not configured. Please set NEWSAPI_KEY in your Django settings.")
-            return 0
-
-        try:
-            url = "https://newsapi.org/v2/top-headlines"
-            params = {
-                'apiKey': self.newsapi_key,
-                'country': 'us',  # Consider making this configurable
-                # Number of results to return per request (max 100 for developer, 20 for free)
-                'pageSize': 20,
-                'sortBy': 'publishedAt'
-            }
-
-            # Make the GET request to NewsAPI
-            response = requests.get(
-                url, params=params, timeout=30)  # 30 seconds timeout
-            response.raise_for_status()  # Raise HTTPError for bad responses 
-            data = response.json()
-
-            articles_created = 0
-            for item in data.get('articles', []):
-                if self.create_article_from_newsapi(item):
-                    articles_created += 1
-
-            logger.info(f"Created {articles_created} articles from NewsAPI")
-            return articles_created
-
-        except requests.exceptions.HTTPError as http_err:
-            logger.error(
-                f"HTTP error occurred while fetching from NewsAPI: {http_err} - {response.text}")
-        except requests.exceptions.RequestException as req_err:
-            logger.error(f"Error during request to NewsAPI: {req_err}")
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred fetching from NewsAPI: {str(e)}")
-        return 0
+        return sum(self.run_job(job)['created']
+                   for job in self.build_jobs(['newsapi']))
 
     def fetch_from_guardian(self):
         """Fetch articles from Guardian API"""
-        if not self.guardian_key:
-            logger.warning(
-                "Guardian API key not configured. Please set GUARDIAN_API_KEY in your Django settings.")
-            return 0
+        return sum(self.run_job(job)['created']
+                   for job in self.build_jobs(['guardian']))
 
-        try:
-            url = "https://content.guardianapis.com/search"
-            params = {
-                'api-key': self.guardian_key,
-                # headline,standfirst,body,byline,thumbnail,publication
-                'show-fields': 'trailText,body,byline,thumbnail',
-                'page-size': 20,  # Max 50 per page
-                'order-by': 'newest'
-            }
+    def fetch_from_rss(self):
+        """Fetch articles from RSS feeds"""
+        articles_created = sum(self.run_job(job)['created']
+                               for job in self.build_jobs(['rss']))
+        logger.info(f"Created {articles_created} articles from RSS feeds")
+        return articles_created
 
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+    def fetch_feed(self, feed):
+        """Poll a single registered Feed; used by the per-feed scheduler."""
+        return self.run_job(self.feed_job(feed))
 
-            articles_created = 0
-            for item in data.get('response', {}).get('results', []):
-                if self.create_article_from_guardian(item):
-                    articles_created += 1
+    def fetch_all(self, sources=None, max_workers=None):
+        """
+        Download every source (and every RSS feed) concurrently, then parse
+        and store the responses on the calling thread as they arrive.
 
-            logger.info(f"Created {articles_created} articles from Guardian")
-            return articles_created
+        Only the network I/O runs in the thread pool; parsing and DB writes
+        stay on the consumer side, which never holds more than
+        2 * max_workers downloaded payloads at once.
+        Returns a report with per-source timing and per-host HTTP stats.
+        """
+        max_workers = max_workers or self.max_workers
+        jobs = iter(self.build_jobs(sources or self.SOURCES))
+        report = {'total': 0, 'unchanged': 0, 'bytes_saved': 0,
+                  'parse_time_saved': 0.0, 'sources': {}}
+        start_time = time.monotonic()
+        hosts_before = self.http.stats()
+
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix='news-fetch') as executor:
+            pending = set()
+            for job in islice(jobs, max_workers * 2):
+                pending.add(executor.submit(self.download, job))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, payload = future.result()
+                    stats = self.ingest(job, payload)
+                    report['sources'][job['name']] = stats
+                    report['total'] += stats['created']
+                    report['unchanged'] += stats['unchanged']
+                    report['bytes_saved'] += stats['bytes_saved']
+                    report['parse_time_saved'] += stats['parse_time_saved']
+
+                    next_job = next(jobs, None)
+                    if next_job is not None:
+                        pending.add(executor.submit(self.download, next_job))
+
+        report['elapsed'] = time.monotonic() - start_time
+        report['hosts'] = self.host_stats_since(hosts_before)
+        for name, stats in report['sources'].items():
+            logger.info(
+                f"[{name}] created={stats['created']} "
+                f"download={stats['download_time']:.2f}s "
+                f"ingest={stats['ingest_time']:.2f}s"
+                + (" unchanged" if stats['unchanged'] else '')
+                + (f" error={stats['error']}" if stats['error'] else ''))
+        for host, stats in sorted(report['hosts'].items(),
+                                  key=lambda item: -item[1]['request_time']):
+            logger.info(
+                f"[{host}] requests={stats['requests']} "
+                f"errors={stats['errors']} retries={stats['retries']} "
+                f"skipped={stats['short_circuits']} "
+                f"time={stats['request_time']:.2f}s "
+                f"throttled={stats['wait_time']:.2f}s"
+                + (" circuit=open" if stats['circuit_open'] else ''))
+        logger.info(
+            f"Fetched {report['total']} articles from "
+            f"{len(report['sources'])} sources in {report['elapsed']:.2f}s "
+            f"({report['unchanged']} unchanged, saved "
+            f"{report['bytes_saved']} bytes and "
+            f"{report['parse_time_saved']:.2f}s of parsing)")
+        return report
+
+    def host_stats_since(self, before):
+        """Per-host HTTP counters accumulated since the `before` snapshot."""
+        hosts = {}
+        for host, stats in self.http.stats().items():
+            previous = before.get(host, {})
+            delta = {key: value - previous.get(key, 0)
+                     for key, value in stats.items() if key != 'circuit_open'}
+            if delta['requests'] or delta['short_circuits']:
+                hosts[host] = dict(delta, circuit_open=stats['circuit_open'])
+        return hosts
+
+    def build_jobs(self, sources):
+        """Expand source names into one download job per request."""
+        jobs = []
+        watermarks = dict(SourceWatermark.objects.filter(
+            source__in=sources).values_list('source', 'published_date'))
+        for source in sources:
+            if source == 'newsapi':
+                if not self.newsapi_key:
+                    logger.warning(
+                        "NewsAPI key not configured. Please set NEWSAPI_KEY in your Django settings.")
+                    continue
+                # top-headlines cannot filter by date, so pages are read
+                # newest first until one reaches the watermark
+                jobs.append({
+                    'name': 'newsapi',
+                    'source': 'newsapi',
+                    'url': self.newsapi_url,
+                    'params': {
+                        'apiKey': self.newsapi_key,
+                        'country': 'us',  # Consider making this configurable
+                        # Number of results to return per request (max 100 for developer, 20 for free)
+                        'pageSize': 20,
+                        'sortBy': 'publishedAt'
+                    },
+                    'watermark': watermarks.get('newsapi'),
+                    'newest_first': True,
+                })
+            elif source == 'guardian':
+                if not self.guardian_key:
+                    logger.warning(
+                        "Guardian API key not configured. Please set GUARDIAN_API_KEY in your Django settings.")
+                    continue
+                params = {
+                    'api-key': self.guardian_key,
+                    # headline,standfirst,body,byline,thumbnail,publication
+                    'show-fields': 'trailText,body,byline,thumbnail',
+                    'page-size': 200,  # API maximum
+                    'order-by': 'newest'
+                }
+                watermark = watermarks.get('guardian')
+                if watermark:
+                    # Catch up oldest first from the watermark, so a run
+                    # capped at max_pages leaves no gap for the next one.
+                    # from-date takes a full timestamp, so nothing already
+                    # ingested earlier that day is downloaded again
+                    params['from-date'] = watermark.astimezone(
+                        dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                    params['order-by'] = 'oldest'
+                jobs.append({
+                    'name': 'guardian',
+                    'source': 'guardian',
+                    'url': self.guardian_url,
+                    'params': params,
+                    'watermark': watermark,
+                    'newest_first': not watermark,
+                })
+            elif source == 'rss':
+                # Feeds are managed in the Feed registry (admin)
+                for feed in Feed.objects.filter(is_active=True):
+                    jobs.append(self.feed_job(feed))
+            else:
+                logger.error(f"Unknown source: {source}")
+        return jobs
+
+    def feed_job(self, feed):
+        return {
+            'name': feed.url,
+            'source': 'rss',
+            'url': feed.url,
+            'params': None,
+            'feed': feed,
+        }
+
+    def run_job(self, job):
+        """Download and ingest a single job on the calling thread."""
+        job, payload = self.download(job)
+        return self.ingest(job, payload)
+
+    def download(self, job):
+        """
+        Perform the network request for a job. Safe to call from worker
+        threads: it touches neither the ORM nor the article parsers.
 
+        Sends If-None-Match/If-Modified-Since from the previous run and
+        flags the payload as unchanged on a 304 or an identical body.
+        API sources are followed page by page (see download_pages).
+        """
+        payload = {'body': None, 'items': [], 'pages': 0, 'request_times': [],
+                   'error': None, 'unchanged': False, 'bytes_saved': 0,
+                   'parse_time_saved': 0.0}
+        # A catch-up query (oldest first from the watermark) keeps returning
+        # the same first page while new items land on later pages, so only
+        # newest-first queries and feeds can be skipped when unchanged
+        conditional = job['source'] == 'rss' or job['newest_first']
+        validators = self.get_validators(job) if conditional else {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        start_time = time.monotonic()
+        try:
+            if job['source'] == 'rss':
+                logger.info(f"Fetching RSS feed: {job['url']}")
+            request_start = time.monotonic()
+            response = self.http.get(
+                job['url'], params=job['params'], headers=headers,
+                timeout=self.timeout)
+            payload['request_times'].append(time.monotonic() - request_start)
+            if response.status_code == 304:
+                payload['unchanged'] = True
+                payload['bytes_saved'] = validators.get('size', 0)
+            else:
+                response.raise_for_status()  # Raise HTTPError for bad responses
+                payload['body'] = response.content
+                payload['digest'] = hashlib.sha256(response.content).hexdigest()
+                payload['etag'] = response.headers.get('ETag', '')
+                payload['last_modified'] = response.headers.get('Last-Modified', '')
+                payload['unchanged'] = payload['digest'] == validators.get('digest')
+            if payload['unchanged']:
+                payload['parse_time_saved'] = validators.get('parse_time', 0.0)
+            elif job['source'] in ('newsapi', 'guardian'):
+                self.download_pages(job, response, payload)
         except requests.exceptions.HTTPError as http_err:
-            logger.error(
-                f"HTTP error occurred while fetching from Guardian: {http_err} - {response.text}")
+            payload['error'] = f"HTTP error: {http_err} - {response.text[:200]}"
         except requests.exceptions.RequestException as req_err:
-            logger.error(f"Error during request to Guardian API: {req_err}")
+            payload['error'] = f"Request error: {req_err}"
         except Exception as e:
-            logger.error(
-                f"An unexpected error occurred fetching from Guardian: {str(e)}")
-        return 0
-
-    def fetch_from_rss(self):
-        """Fetch articles from RSS feeds"""
-        # Consider moving this list to Django settings or a database model for easier management
-        rss_feeds = [
-            'http://feeds.bbci.co.uk/news/rss.xml',
-            'http://rss.cnn.com/rss/edition.rss',
-            'https://feeds.reuters.com/reuters/topNews',
-            'https://techcrunch.com/feed/',
-            'https://feeds.arstechnica.com/arstechnica/index'
-        ]
-
-        articles_created = 0
-        for feed_url in rss_feeds:
-            try:
-                logger.info(f"Fetching RSS feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
+            payload['error'] = f"Unexpected error: {str(e)}"
+        payload['download_time'] = time.monotonic() - start_time
+        return job, payload
 
-                # Limit to a certain number of entries per feed to avoid overwhelming the system
-                # Process up to 5 newest entries
-                for entry in feed.entries[:5]:
-                    if self.create_article_from_rss(entry, feed_url):
-                        articles_created += 1
-            except Exception as e:
-                logger.error(f"Error parsing RSS feed {feed_url}: {str(e)}")
+    def download_pages(self, job, response, payload):
+        """
+        Collect API items page by page, stopping at the last page, at
+        max_pages, or (newest-first sources) once a page reaches items at
+        or before the job's watermark.
+        """
+        page = 1
+        # Pages made up entirely of items at the watermark (from-date is
+        # inclusive) are not counted towards max_pages
+        counted_pages = 0
+        while True:
+            data = response.json()
+            if job['source'] == 'newsapi':
+                items = data.get('articles', [])
+                page_count = -(-data.get('totalResults', 0) // job['params']['pageSize'])
+            else:
+                items = data.get('response', {}).get('results', [])
+                page_count = data.get('response', {}).get('pages', 1)
+            payload['items'].extend(items)
+            payload['pages'] = page
+            if not job['watermark'] or any(
+                    (self.item_date(job, item) or job['watermark']) > job['watermark']
+                    for item in items):
+                counted_pages += 1
+
+            reached_watermark = job['watermark'] and job['newest_first'] and any(
+                (self.item_date(job, item) or job['watermark']) <= job['watermark']
+                for item in items)
+            if not items or reached_watermark or page >= page_count:
+                break
+            if counted_pages >= self.max_pages:
+                if job['newest_first'] and job['watermark']:
+                    logger.warning(
+                        f"{job['name']}: stopped after {page} pages without "
+                        f"reaching the watermark; older items may be missed")
+                break
+
+            page += 1
+            request_start = time.monotonic()
+            response = self.http.get(
+                job['url'], params=dict(job['params'], page=page),
+                timeout=self.timeout)
+            payload['request_times'].append(time.monotonic() - request_start)
+            response.raise_for_status()
 
-        logger.info(f"Created {articles_created} articles from RSS feeds")
-        return articles_created
+    def item_date(self, job, item):
+        """Publication date of an API item, or None if missing or invalid."""
+        value = item.get('publishedAt' if job['source'] == 'newsapi'
+                         else 'webPublicationDate')
+        try:
+            published_date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return None
+        if timezone.is_naive(published_date):
+            published_date = timezone.make_aware(published_date, timezone.utc)
+        return published_date
+
+    def http_cache_key(self, job):
+        """Cache key for the validators of a feed URL or API query."""
+        params = sorted((job['params'] or {}).items())
+        digest = hashlib.sha1(
+            f"{job['url']}?{params}".encode('utf-8')).hexdigest()
+        return f'news_fetcher:http:{digest}'
+
+    def get_validators(self, job):
+        """
+        Validators stored by the previous run, or {} (a full GET) when the
+        cache is unavailable.
+        """
+        try:
+            return cache.get(self.http_cache_key(job)) or {}
+        except Exception as e:
+            logger.warning(f"Validator cache unavailable for {job['name']}: {e}")
+            return {}
 
+    def set_validators(self, job, validators):
+        try:
+            cache.set(self.http_cache_key(job), validators, self.http_cache_timeout)
+        except Exception as e:
+            logger.warning(f"Could not store validators for {job['name']}: {e}")
+
+    def ingest(self, job, payload):
+        """Parse a downloaded payload and store its articles."""
+        stats = {
+            'source': job['source'],
+            'created': 0,
+            'pages': payload['pages'],
+            'request_times': payload['request_times'],
+            'download_time': payload['download_time'],
+            'ingest_time': 0.0,
+            'unchanged': payload['unchanged'],
+            'bytes_saved': payload['bytes_saved'],
+            'parse_time_saved': payload['parse_time_saved'],
+            'error': payload['error'],
+        }
+        if payload['error']:
+            logger.error(f"Error fetching {job['name']}: {payload['error']}")
+            self.record_feed_poll(job, stats)
+            return stats
+        if payload['unchanged']:
+            logger.info(f"Skipping unchanged response for {job['name']}")
+            self.record_feed_poll(job, stats)
+            return stats
+
+        start_time = time.monotonic()
+        try:
+            if job['source'] == 'newsapi':
+                stats['created'] = self.ingest_items(
+                    [self.normalize_newsapi(item)
+                     for item in self.items_since_watermark(job, payload)])
+                self.advance_watermark(job, payload)
+                logger.info(f"Created {stats['created']} articles from NewsAPI")
+            elif job['source'] == 'guardian':
+                stats['created'] = self.ingest_items(
+                    [self.normalize_guardian(item)
+                     for item in self.items_since_watermark(job, payload)])
+                self.advance_watermark(job, payload)
+                logger.info(f"Created {stats['created']} articles from Guardian")
+            elif job['source'] == 'rss':
+                parsed = feedparser.parse(payload['body'])
+                feed = job['feed']
+                # Limit to a certain number of entries per feed to avoid overwhelming the system
+                stats['created'] = self.ingest_items(
+                    [self.normalize_rss(entry, feed.url, feed.source_name)
+                     for entry in parsed.entries[:feed.entry_limit]])
+        except Exception as e:
+            stats['error'] = f"Parse error: {str(e)}"
+            logger.error(f"Error parsing {job['name']}: {str(e)}")
+        stats['ingest_time'] = time.monotonic() - start_time
+
+        # Only remember the validators once the body was processed, so a
+        # failed parse is retried in full on the next run
+        if not stats['error']:
+            self.set_validators(job, {
+                'etag': payload['etag'],
+                'last_modified': payload['last_modified'],
+                'digest': payload['digest'],
+                'size': len(payload['body']),
+                'parse_time': stats['ingest_time'],
+            })
+        self.record_feed_poll(job, stats)
+        return stats
+
+    def items_since_watermark(self, job, payload):
+        """Drop API items older than the source's watermark."""
+        watermark = job['watermark']
+        if not watermark:
+            return payload['items']
+        return [item for item in payload['items']
+                if (self.item_date(job, item) or watermark) >= watermark]
+
+    def advance_watermark(self, job, payload):
+        """Move the source's watermark to the newest item just ingested."""
+        dates = [d for d in (self.item_date(job, item) for item in payload['items']) if d]
+        if not dates:
+            return
+        newest = max(dates)
+        if job['watermark'] and newest <= job['watermark']:
+            return
+        SourceWatermark.objects.update_or_create(
+            source=job['source'], defaults={'published_date': newest})
+
+    def record_feed_poll(self, job, stats):
+        """Feed the outcome of a poll back into the feed's adaptive schedule."""
+        feed = job.get('feed')
+        if feed is None:
+            return
+        if stats['error']:
+            feed.record_error(stats['error'])
+        else:
+            feed.record_fetch(stats['created'])
 
 
     def get_valid_image_url(self, url):
@@ -150,8 +513,194 @@ class NewsFetcher:
 
 
 
-    def create_article_from_newsapi(self, item):
-        """Create article from NewsAPI data, ensuring not to create duplicates."""
+    def ingest_items(self, rows):
+        """
+        Store a page of normalized rows (see the normalize_* methods) in a
+        handful of queries: one url__in lookup for deduplication, one
+        bulk_create, one bulk insert into the categories through table,
+        a single extraction task for teaser-only articles and a single
+        embedding task. Articles are
+        stored with an extractive summary and a bias score already set.
+        Returns the number of articles created.
+        """
+        # Drop invalid rows and duplicates within the page itself. A URL
+        # too long for Article.url would fail the whole bulk insert (and so
+        # the page, on every poll), and can't be truncated
+        max_url_length = Article._meta.get_field('url').max_length
+        unique_rows = {}
+        for row in rows:
+            if not row:
+                continue
+            if len(row['url']) > max_url_length:
+                logger.warning(f"Skipping article with a URL over {max_url_length} "
+                               f"characters: {row['url'][:100]}...")
+                continue
+            row['canonical_url'] = canonicalize_url(row['url'])[:1000]
+            if row['canonical_url'] not in unique_rows:
+                unique_rows[row['canonical_url']] = row
+        if not unique_rows:
+            return 0
+
+        # The same link under another scheme or with tracking parameters
+        # counts as already stored
+        existing = Article.objects.filter(
+            Q(url__in=[row['url'] for row in unique_rows.values()]) |
+            Q(canonical_url__in=list(unique_rows))
+        ).values_list('url', 'canonical_url')
+        existing_urls = {url for pair in existing for url in pair}
+        if existing_urls:
+            logger.info(f"Skipping {len(existing)} articles that already exist")
+        new_rows = [row for canonical_url, row in unique_rows.items()
+                    if canonical_url not in existing_urls
+                    and row['url'] not in existing_urls]
+        if not new_rows:
+            return 0
+
+        self.link_near_duplicates(new_rows)
+        self.summarize_rows(new_rows)
+
+        with transaction.atomic():
+            # bulk_create bypasses post_save, so stored articles don't
+            # queue the abstractive model
+            Article.objects.bulk_create(
+                [Article(**{k: v for k, v in row.items() if not k.startswith('_')})
+                 for row in new_rows],
+                ignore_conflicts=True,
+            )
+            # With ignore_conflicts the primary keys are not set on the
+            # instances, so read them back in one query
+            article_ids = dict(Article.objects.filter(
+                url__in=[row['url'] for row in new_rows]).values_list('url', 'id'))
+
+            created_rows = [row for row in new_rows if row['url'] in article_ids]
+            new_ids = [article_ids[row['url']] for row in created_rows]
+            dedup_index = get_dedup_index()
+            for row in created_rows:
+                if row['simhash'] is not None and not row.get('duplicate_of_id'):
+                    dedup_index.add(article_ids[row['url']], row['simhash'])
+            extract_ids = []
+            if self.extract_content:
+                extract_ids = [article_ids[row['url']] for row in created_rows
+                               if not row.get('duplicate_of_id')
+                               and len(row['content'].split()) < self.extract_min_words]
+            category_ids = get_categorizer().categorize_many(
+                [{'title': row['title'], 'description': row['description'],
+                  'section': row.get('_section')} for row in created_rows])
+
+            Through = Article.categories.through
+            Through.objects.bulk_create(
+                [Through(article_id=article_id, category_id=category_id)
+                 for article_id, ids in zip(new_ids, category_ids)
+                 for category_id in ids],
+                ignore_conflicts=True,
+            )
+
+            transaction.on_commit(lambda: self.enqueue_extraction(extract_ids))
+            transaction.on_commit(lambda: self.enqueue_embedding(new_ids))
+
+        for row in new_rows:
+            logger.info(f"Created article ({row['source']}): {row['title']}")
+        return len(new_ids)
+
+    def link_near_duplicates(self, rows):
+        """
+        Fingerprint each row and point it at an earlier article telling the
+        same story (within the dedup window), copying that article's
+        summary and bias score when it already has them.
+        """
+        index = get_dedup_index()
+        for row in rows:
+            row['simhash'] = simhash(f"{row['title']} {row['description']}")
+            if row['simhash'] is not None:
+                match = index.find(row['simhash'])
+                if match is not None:
+                    row['duplicate_of_id'] = match
+
+        canonical_ids = {row['duplicate_of_id'] for row in rows
+                         if row.get('duplicate_of_id')}
+        if not canonical_ids:
+            return
+        canonicals = {a['id']: a for a in Article.objects.filter(
+            id__in=canonical_ids).values('id', 'summary', 'summary_tier', 'bias_score')}
+        now = timezone.now()
+        for row in rows:
+            if row.get('duplicate_of_id') and row['duplicate_of_id'] not in canonicals:
+                # Deleted since the shared index saw it (or never committed)
+                del row['duplicate_of_id']
+            canonical = canonicals.get(row.get('duplicate_of_id'))
+            if canonical and canonical['summary']:
+                row['summary'] = canonical['summary']
+                row['summary_tier'] = canonical['summary_tier']
+                row['bias_score'] = canonical['bias_score']
+                row['enrichment_status'] = Article.ENRICHMENT_DONE
+                row['enriched_at'] = now
+        logger.info(f"Linked {sum(1 for row in rows if row.get('duplicate_of_id'))} "
+                    f"near-duplicate articles to existing stories")
+
+    def summarize_rows(self, rows):
+        """
+        Give rows without a summary an extractive one and a bias score, so
+        articles are complete as soon as they are stored. The abstractive
+        model runs later, for articles that are read or rank highly (see
+        apps.news.tasks.request_abstractive_summaries).
+        """
+        rows = [row for row in rows if not row.get('summary')]
+        texts = [row['content'] or row['description'] for row in rows]
+        summaries = self.extractive_summarizer.summarize_many(texts)
+        bias_scores = self.bias_detector.detect_bias_many(texts)
+        now = timezone.now()
+        for row, text, summary, bias_score in zip(rows, texts, summaries, bias_scores):
+            if not text:
+                row['enrichment_status'] = Article.ENRICHMENT_SKIPPED
+                continue
+            row['summary'] = summary
+            row['summary_tier'] = Article.SUMMARY_TIER_EXTRACTIVE
+            row['bias_score'] = bias_score.label
+            row['enrichment_status'] = Article.ENRICHMENT_DONE
+            row['enriched_at'] = now
+
+    def enqueue_extraction(self, article_ids):
+        """Queue page text extraction as one task."""
+        if not article_ids:
+            return
+        from apps.news.tasks import extract_articles_content
+        try:
+            extract_articles_content.delay(article_ids)
+        except Exception as e:
+            # Runs after the commit: the articles are stored and keep their
+            # teaser text
+            logger.error(f"Could not queue extraction for {len(article_ids)} articles: {e}")
+
+    def enqueue_embedding(self, article_ids):
+        """Queue the sentence embedding of new articles as one task."""
+        if not article_ids:
+            return
+        from apps.news.tasks import embed_articles
+        try:
+            embed_articles.delay(article_ids)
+        except Exception as e:
+            # process_pending_articles embeds them later
+            logger.error(f"Could not queue embedding for {len(article_ids)} articles: {e}")
+
+    def parse_iso_date(self, date_str, label):
+        """Parse an ISO 8601 date from an API, defaulting to now."""
+        published_date = timezone.now()  # Default to now if parsing fails
+        if date_str:
+            try:
+                published_date = datetime.fromisoformat(
+                    date_str.replace('Z', '+00:00'))
+                # Ensure it's timezone-aware (Django expects this)
+                if timezone.is_naive(published_date):
+                    published_date = timezone.make_aware(
+                        published_date, timezone.utc)
+            except ValueError:
+                logger.warning(
+                    f"Invalid date format for {label} article: '{date_str}'. Using current time."
+                )
+        return published_date
+
+    def normalize_newsapi(self, item):
+        """Convert a NewsAPI item into Article field values, or None to skip it."""
         try:
             article_url = item.get('url')
             article_title = item.get('title')
@@ -160,54 +709,27 @@ class NewsFetcher:
             if not article_url or not article_title:
                 logger.warning(
                     f"Skipping NewsAPI item due to missing URL or title: {item}")
-                return False
-
-            # Check if article already exists to prevent duplicates
-            if Article.objects.filter(url=article_url).exists():
-                logger.info(f"Article already exists (NewsAPI): {article_url}")
-                return False
+                return None
 
-            published_date_str = item.get('publishedAt')
-            published_date = timezone.now()  # Default to now if parsing fails
-            if published_date_str:
-                try:
-                    # NewsAPI uses ISO 8601 format
-                    published_date = datetime.fromisoformat(
-                        published_date_str.replace('Z', '+00:00'))
-                    # Ensure it's timezone-aware (Django expects this)
-                    if timezone.is_naive(published_date):
-                        published_date = timezone.make_aware(
-                            published_date, timezone.utc)
-                except ValueError:
-                    logger.warning(
-                        f"Invalid date format for NewsAPI article: '{published_date_str}'. Using current time."
-                    )
-
-            # Create article instance
-            article = Article.objects.create(
+            return {
                 # Ensure title fits model constraints
-                title=article_title[:500],
-                url=article_url,
-                description=item.get('description', '')[
-                    :1000],  # Limit description length
-                content=item.get('content', '')[:5000],  # Limit content length
-                author=item.get('author', '')[:200],  # Limit author length
-                source=item.get('source', {}).get('name', 'NewsAPI')[
-                    :200],  # Limit source name length
-                image_url= self.get_valid_image_url(item.get('urlToImage')),
-                published_date=published_date
-            )
-            logger.info(f"Created article (NewsAPI): {article.title}")
-            self.auto_categorize_article(article)
-            return True
-
+                'title': article_title[:500],
+                'url': article_url,
+                'description': (item.get('description') or '')[:1000],
+                'content': (item.get('content') or '')[:5000],
+                'author': (item.get('author') or '')[:200],
+                'source': ((item.get('source') or {}).get('name') or 'NewsAPI')[:200],
+                'image_url': self.get_valid_image_url(item.get('urlToImage')),
+                # NewsAPI uses ISO 8601 format
+                'published_date': self.parse_iso_date(item.get('publishedAt'), 'NewsAPI'),
+            }
         except Exception as e:
             logger.error(
-                f"Error creating article from NewsAPI item '{item.get('title')}': {str(e)}")
-            return False
+                f"Error normalizing NewsAPI item '{item.get('title')}': {str(e)}")
+            return None
 
-    def create_article_from_guardian(self, item):
-        """Create article from Guardian API data, ensuring not to create duplicates."""
+    def normalize_guardian(self, item):
+        """Convert a Guardian API result into Article field values, or None to skip it."""
         try:
             article_url = item.get('webUrl')
             article_title = item.get('webTitle')
@@ -215,62 +737,32 @@ class NewsFetcher:
             if not article_url or not article_title:
                 logger.warning(
                     f"Skipping Guardian item due to missing URL or title: {item}")
-                return False
-
-            if Article.objects.filter(url=article_url).exists():
-                logger.info(
-                    f"Article already exists (Guardian): {article_url}")
-                return False
-
-            published_date_str = item.get('webPublicationDate')
-            published_date = timezone.now()
-            if published_date_str:
-                try:
-                    published_date = datetime.fromisoformat(
-                        published_date_str.replace('Z', '+00:00'))
-                    if timezone.is_naive(published_date):
-                        published_date = timezone.make_aware(
-                            published_date, timezone.utc)
-                except ValueError:
-                    logger.warning(
-                        f"Invalid date format for Guardian article: '{published_date_str}'. Using current time."
-                    )
+                return None
 
             fields = item.get('fields', {})
-            description = fields.get('trailText', '')
             # Guardian content can be HTML
-            content_html = fields.get('body', '')
-            author = fields.get('byline', '')
-            image_url = self.get_valid_image_url(item.get('urlToImage'))
-            # Clean HTML from content using BeautifulSoup
-            content_text = ''
-            if content_html:
-                soup = BeautifulSoup(content_html, 'html.parser')
-                content_text = soup.get_text(
-                    separator='\n\n', strip=True)  # Get clean text
-
-            article = Article.objects.create(
-                title=article_title[:500],
-                url=article_url,
-                description=description[:1000],
-                content=content_text[:5000],
-                author=author[:200],
-                source='The Guardian',  # Static source for Guardian API
-                published_date=published_date,
-                image_url=image_url[:1000],
-            )
-            logger.info(f"Created article (Guardian): {article.title}")
-            # Pass sectionName for better categorization if available
-            self.auto_categorize_article(article, item.get('sectionName', ''))
-            return True
-
+            content_text = extract_html(fields.get('body', ''), separator='\n\n').text
+
+            return {
+                'title': article_title[:500],
+                'url': article_url,
+                'description': (fields.get('trailText') or '')[:1000],
+                'content': content_text[:5000],
+                'author': (fields.get('byline') or '')[:200],
+                'source': 'The Guardian',  # Static source for Guardian API
+                'published_date': self.parse_iso_date(
+                    item.get('webPublicationDate'), 'Guardian'),
+                'image_url': self.get_valid_image_url(fields.get('thumbnail')),
+                # Pass sectionName for better categorization if available
+                '_section': item.get('sectionName', ''),
+            }
         except Exception as e:
             logger.error(
-                f"Error creating article from Guardian item '{item.get('webTitle')}': {str(e)}")
-            return False
+                f"Error normalizing Guardian item '{item.get('webTitle')}': {str(e)}")
+            return None
 
-    def create_article_from_rss(self, entry, feed_url):
-        """Create article from RSS entry, ensuring not to create duplicates."""
+    def normalize_rss(self, entry, feed_url, source_name=''):
+        """Convert an RSS entry into Article field values, or None to skip it."""
         try:
             article_url = entry.get('link')
             article_title = entry.get('title')
@@ -278,12 +770,7 @@ class NewsFetcher:
             if not article_url or not article_title:
                 logger.warning(
                     f"Skipping RSS entry from {feed_url} due to missing link or title: {entry}")
-                return False
-
-            if Article.objects.filter(url=article_url).exists():
-                logger.info(
-                    f"Article already exists (RSS: {feed_url}): {article_url}")
-                return False
+                return None
 
             published_date = timezone.now()
             if hasattr(entry, 'published_parsed') and entry.published_parsed:
@@ -307,61 +794,54 @@ class NewsFetcher:
                         f"Invalid updated_date format for RSS article ({feed_url}): {entry.get('updated_parsed')} - {e}. Using current time."
                     )
 
-            source_name = self.get_source_from_url(feed_url)
+            source_name = source_name or self.get_source_from_url(feed_url)
 
-            # RSS summary can be HTML
-            description_html = getattr(entry, 'summary', '')
-            description_text = ''
-            if description_html:
-                soup = BeautifulSoup(description_html, 'html.parser')
-                description_text = soup.get_text(separator='\n', strip=True)
+            # RSS summary can be HTML; one pass yields both text and image
+            description = extract_html(getattr(entry, 'summary', ''))
+            description_text = description.text
 
-            image_url = ''
-            if hasattr(entry, 'media_content'):
+            image_url = description.image_url
+            if hasattr(entry, 'media_content') and entry.media_content:
                 media = entry.media_content[0]
                 if 'url' in media:
                     image_url = media['url']
-            else:
-                img_tag = BeautifulSoup(description_html, 'html.parser').find('img')
-                if img_tag and img_tag.get('src'):
-                    image_url = img_tag['src']
 
-            # Fallback to placeholder if still empty
-            image_url = self.get_valid_image_url(item.get('urlToImage'))
-            
             # RSS feeds usually provide summaries, not full content.
             # Full content might require scraping the article URL, which is a more complex task.
             content = ''  # Placeholder for full content if you decide to scrape later
             if hasattr(entry, 'content'):  # Some feeds might have a 'content' field
                 # entry.content is often a list of content objects
                 if isinstance(entry.content, list) and entry.content:
-                    content_html_full = entry.content[0].get('value', '')
-                    if content_html_full:
-                        soup_full = BeautifulSoup(
-                            content_html_full, 'html.parser')
-                        content = soup_full.get_text(
-                            separator='\n\n', strip=True)
-
-            article = Article.objects.create(
-                title=article_title[:500],
-                url=article_url,
-                description=description_text[:1000],
-                # Use parsed content if available
-                content=content[:5000] if content else '',
-                author=getattr(entry, 'author', '')[:200],
-                source=source_name[:200],
-                published_date=published_date,
-                image_url=image_url[:1000]
-            )
-            logger.info(
-                f"Created article (RSS: {source_name}): {article.title}")
-            self.auto_categorize_article(article)
-            return True
-
+                    content = extract_html(
+                        entry.content[0].get('value', ''), separator='\n\n').text
+
+            return {
+                'title': article_title[:500],
+                'url': article_url,
+                'description': description_text[:1000],
+                'content': content[:5000],
+                'author': getattr(entry, 'author', '')[:200],
+                'source': source_name[:200],
+                'published_date': published_date,
+                # Fallback to placeholder if still empty
+                'image_url': self.get_valid_image_url(image_url),
+            }
         except Exception as e:
             logger.error(
-                f"Error creating article from RSS entry '{entry.get('title')}' from {feed_url}: {str(e)}")
-            return False
+                f"Error normalizing RSS entry '{entry.get('title')}' from {feed_url}: {str(e)}")
+            return None
+
+    def create_article_from_newsapi(self, item):
+        """Create article from NewsAPI data, ensuring not to create duplicates."""
+        return self.ingest_items([self.normalize_newsapi(item)]) > 0
+
+    def create_article_from_guardian(self, item):
+        """Create article from Guardian API data, ensuring not to create duplicates."""
+        return self.ingest_items([self.normalize_guardian(item)]) > 0
+
+    def create_article_from_rss(self, entry, feed_url):
+        """Create article from RSS entry, ensuring not to create duplicates."""
+        return self.ingest_items([self.normalize_rss(entry, feed_url)]) > 0
 
     def get_source_from_url(self, url):
         """Extract a more human-readable source name from feed URL."""
@@ -395,68 +875,11 @@ class NewsFetcher:
         then title and description keywords.
         """
         try:
-            categories_to_add_names = set()  # Use a set to avoid duplicate category names
-
-            # Category mapping (keywords are case-insensitive)
-            # Consider moving this to a more configurable location (e.g., JSON file, database)
-            category_keywords = {
-                'Technology': ['tech', 'software', 'computer', 'internet', 'digital', 'ai', 'artificial intelligence', 'gadget', 'startup', 'cybersecurity', 'innovation', 'platform', 'app', 'device', 'data', 'cloud'],
-                'Politics': ['election', 'government', 'congress', 'senate', 'political', 'policy', 'president', 'vote', 'parliament', 'legislation', 'diplomacy', 'white house', 'candidate'],
-                'Business': ['business', 'economy', 'market', 'finance', 'stock', 'company', 'invest', 'trade', 'economic', 'corporate', 'industry', 'merger', 'acquisition', 'earnings', 'inflation', 'gdp'],
-                'Sports': ['sport', 'football', 'basketball', 'soccer', 'game', 'player', 'team', 'match', 'olympics', 'league', 'championship', 'nfl', 'nba', 'mlb', 'tournament'],
-                'Health': ['health', 'medical', 'hospital', 'doctor', 'medicine', 'disease', 'wellness', 'covid', 'pandemic', 'virus', 'vaccine', 'healthcare', 'mental health', 'nutrition'],
-                'Science': ['science', 'research', 'study', 'discovery', 'scientist', 'space', 'biology', 'physics', 'chemistry', 'astronomy', 'environment', 'climate', 'nasa'],
-                'Entertainment': ['entertainment', 'movie', 'film', 'celebrity', 'music', 'tv', 'hollywood', 'art', 'culture', 'theatre', 'award', 'series', 'actor', 'actress', 'album'],
-                'World News': ['world', 'international', 'global', 'country', 'geopolitics', 'conflict', 'diplomacy', 'united nations', 'foreign affairs', 'war', 'peace'],
-                'Local News': ['local', 'city', 'community', 'town', 'neighborhood', 'regional', 'state'],
-                'Opinion': ['opinion', 'editorial', 'commentary', 'viewpoint'],
-                'Lifestyle': ['lifestyle', 'travel', 'food', 'fashion', 'home', 'garden', 'well-being'],
-                'Education': ['education', 'school', 'university', 'college', 'student', 'teacher', 'learning'],
-            }
-
-            # 1. Check section first (often more reliable if available, e.g., from Guardian)
-            if section:
-                section_lower = section.lower()
-                for cat_name, keywords in category_keywords.items():
-                    # Check if the section name itself is a keyword or part of keywords
-                    if section_lower == cat_name.lower() or section_lower in keywords or any(keyword in section_lower for keyword in keywords if len(keyword) > 3):  # len >3 to avoid matching 'ai' in 'train'
-                        categories_to_add_names.add(cat_name)
-                        # Don't break here, a section might map to multiple relevant categories based on keywords
-
-            # 2. Check title and description for keywords
-            text_to_check = (article.title + ' ' + article.description).lower()
-            for cat_name, keywords in category_keywords.items():
-                if any(f' {keyword} ' in text_to_check or text_to_check.startswith(keyword + ' ') or text_to_check.endswith(' ' + keyword) for keyword in keywords):
-                    categories_to_add_names.add(cat_name)
-
-            # Create categories if they don't exist and add to article
-            # Limit to a few categories (e.g., 3) to keep it manageable
-            final_categories = []
-            # Limit to 3 categories
-            for cat_name in list(categories_to_add_names)[:3]:
-                category, created = Category.objects.get_or_create(
-                    name=cat_name,
-                    # slugify ensures URL-friendly slug
-                    defaults={'slug': slugify(cat_name)}
-                )
-                if created:
-                    logger.info(f"Created new category: {cat_name}")
-                final_categories.append(category)
-
-            # If no specific categories found, assign to a default category
-            if not final_categories:
-                general_cat, created = Category.objects.get_or_create(
-                    name='General News',
-                    defaults={'slug': 'general-news'}
-                )
-                if created:
-                    logger.info("Created default category: General News")
-                final_categories.append(general_cat)
-
-            # Add all collected categories
-            article.categories.add(*final_categories)
+            categorizer = get_categorizer()
+            names = categorizer.match(article.title, article.description, section)
+            article.categories.add(*categorizer.category_ids(names).values())
             logger.info(
-                f"Categorized article '{article.title}' into: {[cat.name for cat in final_categories]}")
+                f"Categorized article '{article.title}' into: {names}")
 
         except Exception as e:
             logger.error(
@@ -3,27 +3,78 @@
 
 
 
-from sentence_transformers import SentenceTransformer
+from datetime import timedelta
+
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from django.conf import settings
+from django.utils import timezone
+
+from .ann_index import get_article_index
+from .embedding_store import get_embedding_store
+from .user_profiles import profile_vector
+
+
 class NewsPersonalizer:
-    def __init__(self):
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    """
+    Ranks articles against the user's reading history using the stored
+    article embeddings (see embedding_store.py); nothing is encoded on the
+    request path.
+    """
 
     def generate_user_profile(self, user):
-        articles = user.read_articles.all()
-        article_texts = [
-            f"{article.title} {article.description}" for article in articles]
-        embeddings = self.embedding_model.encode(article_texts)
-        return np.mean(embeddings, axis=0)
+        """The user's stored profile vector (see user_profiles.py), or None."""
+        return profile_vector(user)
 
     def recommend_articles(self, user, articles, top_n=10):
+        """
+        The `top_n` articles closest to the user's profile. `articles` is
+        a queryset or a list; for a queryset only the IDs are read until
+        the winners are known.
+        """
         user_profile = self.generate_user_profile(user)
-        article_texts = [
-            f"{article.title} {article.description}" for article in articles]
-        article_embeddings = self.embedding_model.encode(article_texts)
+        if user_profile is None:
+            return list(articles[:top_n])
+        is_list = isinstance(articles, (list, tuple))
+        article_ids = ([article.id for article in articles] if is_list
+                       else list(dict.fromkeys(articles.values_list('id', flat=True))))
+        vectors, found = get_embedding_store().vectors_for(article_ids)
+        # Stored vectors are unit length, so the dot product is the cosine
+        similarities = np.where(found, vectors @ user_profile, -np.inf)
+        top_n = min(top_n, len(article_ids))
+        if not top_n:
+            return []
+        top = np.argpartition(-similarities, top_n - 1)[:top_n]
+        ranked_indices = top[np.argsort(-similarities[top], kind='stable')]
+
+        if is_list:
+            return [articles[i] for i in ranked_indices]
+        by_id = articles.in_bulk([article_ids[i] for i in ranked_indices])
+        return [by_id[article_ids[i]] for i in ranked_indices if article_ids[i] in by_id]
+
+    def related_articles(self, article, top_n=5, window_days=None):
+        """
+        Stories closest to `article` published within RELATED_ARTICLES_WINDOW_DAYS,
+        leaving out the article itself and its near-duplicates.
+        """
+        from apps.news.models import Article
+
+        vectors, found = get_embedding_store().vectors_for([article.id])
+        if not found[0]:
+            return []
+        window_days = window_days or getattr(settings, 'RELATED_ARTICLES_WINDOW_DAYS', 7)
+        canonical_id = article.duplicate_of_id or article.id
+        same_story = {article.id, canonical_id, *Article.objects.filter(
+            duplicate_of_id=canonical_id).values_list('id', flat=True)}
+        since = timezone.now() - timedelta(days=window_days)
+        # Extra hits make up for other stories' near-duplicates, left out below
+        ids, _ = get_article_index().search(
+            vectors[0], k=top_n * 2, published_after=since.timestamp(), exclude=same_story)
+        return [related for related in self._in_order(ids.tolist())
+                if related.duplicate_of_id is None][:top_n]
 
-        similarities = cosine_similarity([user_profile], article_embeddings)[0]
-        ranked_indices = np.argsort(similarities)[::-1][:top_n]
+    def _in_order(self, article_ids):
+        """Articles for `article_ids` in that order, skipping deleted ones."""
+        from apps.news.models import Article
 
-        return [articles[i] for i in ranked_indices]
+        by_id = Article.objects.prefetch_related('categories').in_bulk(article_ids)
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
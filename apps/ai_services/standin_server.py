@@ -0,0 +1,272 @@
+# apps/ai_services/standin_server.py
+"""
+Local stand-in for newsapi.org, the Guardian Content API and RSS/Atom
+hosts, used to benchmark NewsFetcher without touching the network.
+
+Every response is generated deterministically from a seed, so repeated
+runs against the same server see the same articles.
+"""
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+
+class StandInNewsServer:
+    """
+    Threaded HTTP server with configurable size, latency and error rate.
+
+    Routes (all under ``base_url``):
+      /newsapi          NewsAPI top-headlines JSON (page, pageSize)
+      /guardian         Guardian search JSON (page, page-size, order-by, from-date)
+      /rss/<n>.xml      RSS 2.0 feed number n
+      /atom/<n>.xml     Atom feed number n
+      /article/<key>    HTML article page linked from the feeds
+    """
+
+    def __init__(self, api_items=100, feeds=10, entries_per_feed=20,
+                 paragraphs=8, latency=0.05, latency_jitter=0.5,
+                 error_rate=0.0, seed=42, host='127.0.0.1', port=0):
+        self.api_items = api_items
+        self.feeds = feeds
+        self.entries_per_feed = entries_per_feed
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._vocabulary = [
+            ''.join(random.Random(seed + i).choices('bcdfghklmnprstvz', k=3))
+            + ''.join(random.Random(seed - i).choices('aeiou', k=2))
+            for i in range(5000)]
+
+        handler = type('Handler', (_Handler,), {'standin': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def feed_urls(self):
+        """One URL per feed, alternating RSS and Atom."""
+        return [f'{self.base_url}/{"atom" if n % 2 else "rss"}/{n}.xml'
+                for n in range(self.feeds)]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name='standin-news-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Synthetic content -------------------------------------------------
+
+    def _words(self, rng, count):
+        return ' '.join(rng.choices(self._vocabulary, k=count))
+
+    def item(self, key, index):
+        """Deterministic article number ``index`` of stream ``key``."""
+        rng = random.Random(f'{self.seed}:{key}:{index}')
+        return {
+            'key': f'{key}-{index}',
+            'title': self._words(rng, 10).capitalize(),
+            'description': self._words(rng, 35) + '.',
+            'paragraphs': [self._words(rng, rng.randint(40, 90)) + '.'
+                           for _ in range(self.paragraphs)],
+            # index 0 is the newest, one article every 5 minutes
+            'published': self.now - timedelta(minutes=5 * index),
+        }
+
+    def article_url(self, item):
+        return f'{self.base_url}/article/{item["key"]}'
+
+    def article_html(self, item):
+        """
+        Article page with the usual boilerplate around the story: site
+        navigation, a share bar, a related-links rail, a cookie notice and
+        a footer. Only ``item['paragraphs']`` is the article text.
+        """
+        rng = random.Random(f'{self.seed}:page:{item["key"]}')
+        body = ''.join(f'<p>{p}</p>' for p in item['paragraphs'])
+        related = ''.join(
+            f'<li><a href="/article/related-{n}">{self._words(rng, 8)}</a></li>'
+            for n in range(6))
+        return (
+            '<!DOCTYPE html><html><head>'
+            f'<title>{escape(item["title"])}</title>'
+            '<script>window.analytics = {page: "article"};</script></head><body>'
+            '<header><nav><a href="/">Home</a> <a href="/world">World</a> '
+            '<a href="/business">Business</a></nav></header>'
+            '<div class="cookie-banner"><p>We use cookies to improve your '
+            'experience, personalise content and analyse our traffic.</p></div>'
+            '<main><div class="share-tools"><a href="/share">Share</a> '
+            '<a href="/print">Print</a></div>'
+            f'<article class="story"><h1>{escape(item["title"])}</h1>'
+            f'<div class="story-body">{body}</div></article>'
+            f'<aside class="related"><h2>Related stories</h2><ul>{related}</ul></aside>'
+            f'<div class="comments"><p>{self._words(rng, 30)}</p></div></main>'
+            '<footer><p>&copy; Stand-in News. All rights reserved.</p></footer>'
+            '</body></html>')
+
+    def newsapi_page(self, query):
+        page = int(query.get('page', 1))
+        page_size = int(query.get('pageSize', 20))
+        items = [self.item('newsapi', i) for i in range(
+            (page - 1) * page_size, min(page * page_size, self.api_items))]
+        return {
+            'status': 'ok',
+            'totalResults': self.api_items,
+            'articles': [{
+                'source': {'id': None, 'name': 'Stand-in Wire'},
+                'author': 'Stand-in Reporter',
+                'title': item['title'],
+                'description': item['description'],
+                'url': self.article_url(item),
+                'urlToImage': f'{self.base_url}/images/{item["key"]}.jpg',
+                'publishedAt': item['published'].isoformat().replace('+00:00', 'Z'),
+                'content': ' '.join(item['paragraphs'])[:200],
+            } for item in items],
+        }
+
+    def guardian_page(self, query):
+        page = int(query.get('page', 1))
+        page_size = int(query.get('page-size', 10))
+        indexes = list(range(self.api_items))
+        if query.get('from-date'):
+            # A date or a full timestamp, as the Content API accepts
+            since = datetime.fromisoformat(query['from-date'].replace('Z', '+00:00'))
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            indexes = [i for i in indexes
+                       if self.item('guardian', i)['published'] >= since]
+        if query.get('order-by') == 'oldest':
+            indexes.reverse()
+        pages = max(1, -(-len(indexes) // page_size))
+        items = [self.item('guardian', i)
+                 for i in indexes[(page - 1) * page_size:page * page_size]]
+        return {'response': {
+            'status': 'ok',
+            'total': len(indexes),
+            'currentPage': page,
+            'pages': pages,
+            'results': [{
+                'webTitle': item['title'],
+                'webUrl': self.article_url(item),
+                'webPublicationDate': item['published'].isoformat().replace('+00:00', 'Z'),
+                'sectionName': 'World news',
+                'fields': {
+                    'trailText': item['description'],
+                    'body': ''.join(f'<p>{p}</p>' for p in item['paragraphs']),
+                    'byline': 'Stand-in Correspondent',
+                    'thumbnail': f'{self.base_url}/images/{item["key"]}.jpg',
+                },
+            } for item in items],
+        }}
+
+    def rss_feed(self, n):
+        entries = ''.join(
+            '<item>'
+            f'<title>{escape(item["title"])}</title>'
+            f'<link>{self.article_url(item)}</link>'
+            f'<description>{escape(self._summary_html(item))}</description>'
+            f'<pubDate>{format_datetime(item["published"])}</pubDate>'
+            '</item>'
+            for item in (self.item(f'rss{n}', i) for i in range(self.entries_per_feed)))
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f'<title>Stand-in feed {n}</title><link>{self.base_url}</link>'
+                f'<description>Synthetic feed</description>{entries}</channel></rss>')
+
+    def atom_feed(self, n):
+        entries = ''.join(
+            '<entry>'
+            f'<title>{escape(item["title"])}</title>'
+            f'<link href="{self.article_url(item)}"/>'
+            f'<id>{self.article_url(item)}</id>'
+            f'<updated>{item["published"].isoformat()}</updated>'
+            f'<summary type="html">{escape(self._summary_html(item))}</summary>'
+            '<author><name>Stand-in Author</name></author>'
+            '</entry>'
+            for item in (self.item(f'atom{n}', i) for i in range(self.entries_per_feed)))
+        return ('<?xml version="1.0" encoding="utf-8"?>'
+                '<feed xmlns="http://www.w3.org/2005/Atom">'
+                f'<title>Stand-in feed {n}</title><id>{self.base_url}/atom/{n}</id>'
+                f'<updated>{self.now.isoformat()}</updated>{entries}</feed>')
+
+    def _summary_html(self, item):
+        return (f'<p><img src="{self.base_url}/images/{item["key"]}.jpg"/>'
+                f'{item["description"]}</p>')
+
+    # Request handling ---------------------------------------------------
+
+    def delay(self):
+        with self._lock:
+            self.requests_served += 1
+            jitter = self._rng.uniform(-self.latency_jitter, self.latency_jitter)
+            fail = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(max(0.0, self.latency * (1 + jitter)))
+        return fail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    standin = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.standin
+        if server.delay():
+            return self._send(503, 'text/plain', b'Service Unavailable')
+
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        segments = parts.path.strip('/').split('/')
+        try:
+            if segments == ['newsapi']:
+                body = json.dumps(server.newsapi_page(query))
+                return self._send(200, 'application/json', body.encode())
+            if segments == ['guardian']:
+                body = json.dumps(server.guardian_page(query))
+                return self._send(200, 'application/json', body.encode())
+            if len(segments) == 2 and segments[0] in ('rss', 'atom'):
+                n = int(segments[1].split('.')[0])
+                if segments[0] == 'rss':
+                    return self._send(200, 'application/rss+xml', server.rss_feed(n).encode())
+                return self._send(200, 'application/atom+xml', server.atom_feed(n).encode())
+            if len(segments) == 2 and segments[0] == 'article':
+                key, index = segments[1].rsplit('-', 1)
+                html = server.article_html(server.item(key, int(index)))
+                return self._send(200, 'text/html; charset=utf-8', html.encode())
+        except (ValueError, IndexError):
+            pass
+        return self._send(404, 'text/plain', b'Not Found')
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -1,33 +1,146 @@
 # apps/ai_services/summarizer.py (optimized)
-from transformers import pipeline
-import torch
+import logging
+import os
+import threading
+import time
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .extractive import ExtractiveSummarizer
+
+logger = logging.getLogger(__name__)
 
-# Global model loading - once at startup
-DEVICE = 0 if torch.cuda.is_available() else -1
 MODEL_NAME = "google/flan-t5-small"
 
-# Global summarizer instance (created once)
-summarizer_pipeline = pipeline(
-    "summarization",
-    model=MODEL_NAME,
-    device=DEVICE
-)
+# Inference backends (SUMMARIZER_BACKEND): the PyTorch pipeline in fp32,
+# or an int8-quantized ONNX export of the same model (see the
+# export_onnx_summarizer command) run by ONNX Runtime on CPU
+BACKENDS = ('torch', 'onnx')
+
+# Built on first use (or by warm_up), once per process; torch and
+# transformers are not imported before that
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def summarizer_backend():
+    backend = getattr(settings, 'SUMMARIZER_BACKEND', 'torch')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"SUMMARIZER_BACKEND must be one of {', '.join(BACKENDS)}, not {backend!r}")
+    return backend
+
+
+def model_identity(backend=None):
+    """
+    Name of the model as run by `backend`. The quantized model can phrase
+    a summary differently, so its summaries are stored under their own
+    name in the SummaryStore.
+    """
+    backend = backend or summarizer_backend()
+    return MODEL_NAME if backend == 'torch' else f"{MODEL_NAME}+onnx-int8"
+
+
+def load_pipeline(backend):
+    """Build a summarization pipeline for `backend`."""
+    if backend == 'torch':
+        import torch
+        from transformers import pipeline
+
+        device = 0 if torch.cuda.is_available() else -1
+        return pipeline("summarization", model=MODEL_NAME, device=device)
+
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "SUMMARIZER_BACKEND = 'onnx' needs optimum[onnxruntime]") from e
+    from transformers import AutoTokenizer, pipeline
+
+    model_dir = str(getattr(settings, 'SUMMARIZER_ONNX_DIR', ''))
+    if not os.path.isdir(model_dir):
+        raise ImproperlyConfigured(
+            f"No ONNX summarizer in {model_dir!r}; run manage.py export_onnx_summarizer")
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = getattr(settings, 'SUMMARIZER_ONNX_THREADS', 0)
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir, provider='CPUExecutionProvider', session_options=session_options)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+
+def get_summarizer_pipeline():
+    """Return the shared summarization pipeline, loading it on first call."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                start_time = time.monotonic()
+                backend = summarizer_backend()
+                _pipeline = load_pipeline(backend)
+                logger.info(
+                    f"Loaded {model_identity(backend)} ({backend}) "
+                    f"in {time.monotonic() - start_time:.2f}s")
+    return _pipeline
 
 
 class OptimizedSummarizer:
+    # Texts shorter than this get an extractive summary instead
+    min_model_chars = 500
+
+    @property
+    def model_name(self):
+        return model_identity()
+
+    def generation_params(self, max_length=100):
+        return {
+            'max_length': max_length,
+            'min_length': 30,
+            'do_sample': False,
+            'truncation': True,
+        }
+
+    def short_summary(self, text):
+        """Summary of a text too short for the model."""
+        return ExtractiveSummarizer().summarize(text)
+
     def summarize(self, text, max_length=100):
-        if len(text) < 500:
-            return text[:200] + "..."
-
-        # ✅ Use the globally loaded pipeline
-        return summarizer_pipeline(
-            text,
-            max_length=max_length,
-            min_length=30,
-            do_sample=False,
-            truncation=True
-        )[0]['summary_text']
+        if len(text) < self.min_model_chars:
+            return self.short_summary(text)
+
+        # ✅ Use the shared, lazily loaded pipeline
+        return get_summarizer_pipeline()(
+            text, **self.generation_params(max_length))[0]['summary_text']
+
+    def summarize_many(self, texts, max_length=100, batch_size=8, bucket=True):
+        """
+        Summarize a list of texts, running the model over `batch_size`
+        inputs per forward pass. With `bucket`, inputs are sorted by length
+        first so each batch pads to similar lengths. Results are returned
+        in the order of `texts`.
+        """
+        summaries = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if len(text) < self.min_model_chars:
+                summaries[i] = self.short_summary(text)
+            else:
+                pending.append(i)
+        if bucket:
+            pending.sort(key=lambda i: len(texts[i]))
+
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            results = get_summarizer_pipeline()(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                **self.generation_params(max_length)
+            )
+            for i, result in zip(batch, results):
+                summaries[i] = result['summary_text']
+        return summaries
 
     # Use smaller, faster models
     # self.model_name = "facebook/bart-large-mnli"
@@ -0,0 +1,100 @@
+# apps/ai_services/summary_store.py
+import hashlib
+import json
+import logging
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'summary_store:v1'
+COUNTERS = ('hot_hits', 'cold_hits', 'misses')
+
+
+def normalize_text(text):
+    """Unicode-normalize and collapse whitespace, so trivially different copies match."""
+    return ' '.join(unicodedata.normalize('NFKC', text or '').split())
+
+
+def summary_digest(text, model_name, params):
+    """sha256 of the normalized full text, the model and its generation parameters."""
+    payload = json.dumps(
+        {'model': model_name, 'params': params, 'text': normalize_text(text)},
+        sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SummaryStore:
+    """
+    Summaries keyed by content digest, in two tiers: the Redis cache (hot,
+    expiring) in front of SummaryRecord rows (cold, permanent). Cold hits
+    are promoted to the hot tier. Hit/miss counters are kept in the cache
+    so they add up across processes.
+    """
+
+    def __init__(self):
+        self.hot_timeout = getattr(settings, 'SUMMARY_STORE_HOT_TIMEOUT', 7 * 24 * 3600)
+
+    def cache_key(self, digest):
+        return f'{KEY_PREFIX}:{digest}'
+
+    def get_many(self, digests):
+        """Return {digest: summary} for the digests that are stored."""
+        digests = list(dict.fromkeys(digests))
+        if not digests:
+            return {}
+        hot = cache.get_many([self.cache_key(d) for d in digests])
+        found = {d: hot[self.cache_key(d)] for d in digests if self.cache_key(d) in hot}
+
+        missing = [d for d in digests if d not in found]
+        cold = {}
+        if missing:
+            from apps.news.models import SummaryRecord
+            cold = dict(SummaryRecord.objects.filter(
+                digest__in=missing).values_list('digest', 'summary'))
+            if cold:
+                cache.set_many({self.cache_key(d): s for d, s in cold.items()},
+                               self.hot_timeout)
+            found.update(cold)
+
+        self.count(hot_hits=len(found) - len(cold), cold_hits=len(cold),
+                   misses=len(digests) - len(found))
+        return found
+
+    def put_many(self, summaries, model_name):
+        """Store {digest: summary} in both tiers."""
+        if not summaries:
+            return
+        from apps.news.models import SummaryRecord
+        SummaryRecord.objects.bulk_create(
+            [SummaryRecord(digest=d, model_name=model_name, summary=s)
+             for d, s in summaries.items()],
+            ignore_conflicts=True,
+        )
+        cache.set_many({self.cache_key(d): s for d, s in summaries.items()},
+                       self.hot_timeout)
+
+    def count(self, **increments):
+        for name, value in increments.items():
+            if not value:
+                continue
+            key = f'{KEY_PREFIX}:stats:{name}'
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                # Evicted between add() and incr()
+                cache.set(key, value, None)
+
+    def stats(self):
+        """Counters since they were last reset, plus the hit rate."""
+        values = cache.get_many([f'{KEY_PREFIX}:stats:{name}' for name in COUNTERS])
+        stats = {name: values.get(f'{KEY_PREFIX}:stats:{name}', 0) for name in COUNTERS}
+        lookups = sum(stats.values())
+        stats['hit_rate'] = (stats['hot_hits'] + stats['cold_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def reset_stats(self):
+        cache.delete_many([f'{KEY_PREFIX}:stats:{name}' for name in COUNTERS])
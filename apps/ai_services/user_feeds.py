@@ -0,0 +1,164 @@
+# apps/ai_services/user_feeds.py
+"""
+Materialized per-user recommendation feeds (not to be confused with the
+RSS Feed registry): the top USER_FEED_SIZE article IDs of each active
+user, ranked in the background (apps.news.tasks.refresh_user_feeds) by
+the HybridRanker (ranking.py) and kept in a Redis sorted set scored by
+rank. A dashboard page is one ZREVRANGE plus one id__in query, whatever
+the size of the table.
+
+Feeds are refreshed when new articles are embedded and when a user's
+profile changes, debounced to one refresh per USER_FEED_REFRESH_DEBOUNCE
+seconds. Users who have not logged in for USER_FEED_ACTIVE_DAYS are
+skipped; their feed is built on demand when they come back.
+"""
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .ann_index import get_article_index
+from .ranking import rank_candidates
+from .user_profiles import profile_vector
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'user_feeds'
+
+
+def feed_key(user_id):
+    return f'{KEY_PREFIX}:user:{user_id}'
+
+
+def get_redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def rank_feed(user):
+    """
+    (article IDs, scores) of the user's feed, best first. Candidates are
+    the unread articles of the last RECOMMENDATION_WINDOW_HOURS closest to
+    the user's profile (from the ANN index) plus the newest ones; the
+    HybridRanker orders them. Empty for users with neither history nor
+    interests.
+    """
+    from apps.news.models import Article, UserActivity
+
+    profile = profile_vector(user)
+    if profile is None:
+        return [], []
+    feed_size = getattr(settings, 'USER_FEED_SIZE', 200)
+    since = timezone.now() - timedelta(
+        hours=getattr(settings, 'RECOMMENDATION_WINDOW_HOURS', 72))
+    read_ids = set(UserActivity.objects.filter(
+        user=user, action='read').values_list('article_id', flat=True))
+    similar_ids, _ = get_article_index().search(
+        profile, k=feed_size * 4, published_after=since.timestamp(), exclude=read_ids)
+    newest_ids = Article.objects.filter(published_date__gte=since).order_by(
+        '-published_date').values_list('id', flat=True)[:feed_size]
+    candidates = [article_id for article_id in dict.fromkeys([*newest_ids, *similar_ids.tolist()])
+                  if article_id not in read_ids]
+    return rank_candidates(candidates, user, limit=feed_size)
+
+
+def write_feed(user_id, article_ids, scores, redis=None):
+    """Replace the user's feed in one step; readers never see a partial one."""
+    redis = redis or get_redis()
+    key = feed_key(user_id)
+    if not article_ids:
+        redis.delete(key)
+        return
+    tmp_key = f'{key}:{uuid.uuid4().hex}'
+    pipe = redis.pipeline(transaction=True)
+    pipe.zadd(tmp_key, dict(zip(article_ids, scores)))
+    pipe.expire(tmp_key, getattr(settings, 'USER_FEED_TTL', 24 * 3600))
+    pipe.rename(tmp_key, key)
+    pipe.execute()
+
+
+def refresh_feed(user, redis=None):
+    """Rank and store one user's feed. Returns its length."""
+    article_ids, scores = rank_feed(user)
+    write_feed(user.id, article_ids, scores, redis)
+    return len(article_ids)
+
+
+def active_users():
+    from django.contrib.auth.models import User
+
+    return User.objects.filter(is_active=True, last_login__gte=timezone.now() - timedelta(
+        days=getattr(settings, 'USER_FEED_ACTIVE_DAYS', 14)))
+
+
+def schedule_feed_refresh(user_ids=None):
+    """
+    Queue refresh_user_feeds for `user_ids` (None: every active user)
+    unless one is already queued for them within USER_FEED_REFRESH_DEBOUNCE.
+    """
+    from apps.news.tasks import refresh_user_feeds
+
+    debounce = getattr(settings, 'USER_FEED_REFRESH_DEBOUNCE', 60)
+    if user_ids is None:
+        if cache.add(f'{KEY_PREFIX}:queued:all', 1, debounce):
+            refresh_user_feeds.apply_async(countdown=debounce)
+        return
+    user_ids = [user_id for user_id in user_ids
+                if cache.add(f'{KEY_PREFIX}:queued:user:{user_id}', 1, debounce)]
+    if user_ids:
+        refresh_user_feeds.apply_async(args=[user_ids], countdown=debounce)
+
+
+class RankedFeed:
+    """
+    A user's stored feed as a lazy sequence of articles for Paginator:
+    len() is a ZCARD, a slice is a ZREVRANGE and one id__in query.
+    """
+
+    def __init__(self, user_id, queryset, redis=None):
+        self.key = feed_key(user_id)
+        self.queryset = queryset
+        self.redis = redis or get_redis()
+        self._length = None
+
+    def exists(self):
+        return len(self) > 0
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self.redis.zcard(self.key)
+        return self._length
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop, _ = index.indices(len(self))
+        if stop <= start:
+            return []
+        article_ids = [int(article_id) for article_id in
+                       self.redis.zrevrange(self.key, start, stop - 1)]
+        by_id = self.queryset.in_bulk(article_ids)
+        # Articles deleted since the feed was ranked are skipped
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+
+def user_feed(user, queryset, redis=None):
+    """
+    The user's RankedFeed over `queryset`. Without a stored feed one is
+    ranked and stored on the spot (one ANN query); None if the user has
+    nothing to rank by or Redis is unavailable.
+    """
+    try:
+        redis = redis or get_redis()
+        feed = RankedFeed(user.id, queryset, redis)
+        if not feed.exists():
+            if not refresh_feed(user, redis):
+                return None
+            feed = RankedFeed(user.id, queryset, redis)
+        return feed
+    except Exception as e:
+        logger.error(f"Feed unavailable for user {user.id}: {e}")
+        return None
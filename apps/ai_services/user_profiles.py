@@ -0,0 +1,164 @@
+# apps/ai_services/user_profiles.py
+"""
+Stored user profile vectors (apps.news.models.UserProfile). Each read or
+bookmark folds the article's embedding into an exponentially decayed sum,
+so an event costs one vector lookup and one row update whatever the
+user's history. Interest categories give new users a prior that fades
+as their own reading accumulates.
+"""
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .embedding_heads import get_embedding_heads
+from .embedding_store import get_embedding_store
+from .embeddings import stack_vectors, vector_from_bytes, vector_to_bytes
+
+logger = logging.getLogger(__name__)
+
+# Articles averaged per category for the prior when no heads are trained
+PRIOR_ARTICLES_PER_CATEGORY = 50
+
+
+def event_weight(action):
+    return getattr(settings, 'USER_PROFILE_EVENT_WEIGHTS', {
+        'read': 1.0, 'bookmark': 2.0}).get(action, 0.0)
+
+
+def decay(since, now):
+    """Factor that ages event weights from `since` to `now`."""
+    half_life = getattr(settings, 'USER_PROFILE_HALF_LIFE_DAYS', 14) * 86400
+    elapsed = max((now - since).total_seconds(), 0.0)
+    return 0.5 ** (elapsed / half_life)
+
+
+def _profile_for_update(user_id):
+    from apps.news.models import UserProfile
+
+    profile, _ = UserProfile.objects.select_for_update().get_or_create(user_id=user_id)
+    return profile
+
+
+def record_event(user_id, article_id, action, when=None):
+    """
+    Fold one read/bookmark of `article_id` into the user's profile. Events
+    for articles without an embedding yet are skipped. Returns True if the
+    profile changed.
+    """
+    weight = event_weight(action)
+    if not weight:
+        return False
+    vectors, found = get_embedding_store().vectors_for([article_id])
+    if not found[0]:
+        logger.debug(f"No embedding for article {article_id}; profile event skipped")
+        return False
+    when = when or timezone.now()
+    with transaction.atomic():
+        profile = _profile_for_update(user_id)
+        factor = decay(profile.decayed_at, when)
+        current = (vector_from_bytes(profile.activity_vector) if profile.activity_vector
+                   else np.zeros_like(vectors[0]))
+        profile.activity_vector = vector_to_bytes(current * factor + weight * vectors[0])
+        profile.activity_weight = profile.activity_weight * factor + weight
+        profile.decayed_at = max(profile.decayed_at, when)
+        profile.save(update_fields=['activity_vector', 'activity_weight', 'decayed_at', 'updated_at'])
+    return True
+
+
+def interest_prior(user_id):
+    """
+    Unit-length mean of the user's interest categories: the category
+    centroids of the embedding heads when trained, otherwise the stored
+    embeddings of the latest articles in those categories. None without
+    interests.
+    """
+    from apps.news.models import Article, UserInterest
+
+    names = list(UserInterest.objects.filter(user_id=user_id).values_list(
+        'category__name', flat=True))
+    if not names:
+        return None
+    heads = get_embedding_heads()
+    rows = [heads.category_centroids[heads.category_names.index(name)]
+            for name in names if heads is not None and name in heads.category_names]
+    if not rows:
+        for name in names:
+            blobs = [bytes(blob) for blob in Article.objects.filter(
+                categories__name=name, embedding__isnull=False
+            ).order_by('-published_date').values_list('embedding', flat=True)[
+                :PRIOR_ARTICLES_PER_CATEGORY]]
+            if blobs:
+                rows.append(stack_vectors(blobs).mean(axis=0))
+    if not rows:
+        return None
+    prior = np.mean(rows, axis=0)
+    return prior / max(np.linalg.norm(prior), 1e-12)
+
+
+def refresh_prior(user_id):
+    """Recompute the interest prior, e.g. after the user edits interests."""
+    prior = interest_prior(user_id)
+    with transaction.atomic():
+        profile = _profile_for_update(user_id)
+        profile.prior_vector = None if prior is None else vector_to_bytes(prior)
+        profile.save(update_fields=['prior_vector', 'updated_at'])
+    return profile
+
+
+def profile_vector(user):
+    """
+    Unit-length profile of `user`, or None with neither history nor
+    interests. Activity is decayed to now and blended with the prior,
+    which counts as USER_PROFILE_PRIOR_WEIGHT events.
+    """
+    from apps.news.models import UserProfile
+
+    profile = UserProfile.objects.filter(user=user).first()
+    if profile is None:
+        profile = refresh_prior(user.id)
+    vector = None
+    if profile.activity_vector:
+        vector = vector_from_bytes(profile.activity_vector) * decay(
+            profile.decayed_at, timezone.now())
+    if profile.prior_vector:
+        prior = getattr(settings, 'USER_PROFILE_PRIOR_WEIGHT', 2.0) * vector_from_bytes(
+            profile.prior_vector)
+        vector = prior if vector is None else vector + prior
+    if vector is None or not np.any(vector):
+        return None
+    return vector / np.linalg.norm(vector)
+
+
+def rebuild_profile(user_id):
+    """Replay the user's reads and bookmarks into a fresh profile."""
+    from apps.news.models import Bookmark, UserActivity, UserProfile
+
+    events = sorted(
+        [(timestamp, article_id, 'read') for article_id, timestamp in UserActivity.objects.filter(
+            user_id=user_id, action='read').values_list('article_id', 'timestamp')] +
+        [(created_at, article_id, 'bookmark') for article_id, created_at in Bookmark.objects.filter(
+            user_id=user_id).values_list('article_id', 'created_at')])
+    vectors, found = get_embedding_store().vectors_for(
+        [article_id for _, article_id, _ in events])
+    activity, activity_weight, decayed_at = None, 0.0, timezone.now()
+    # The same fold as record_event, in event order
+    for (when, _, action), vector, has_vector in zip(events, vectors, found):
+        if not has_vector or not event_weight(action):
+            continue
+        factor = decay(decayed_at, when) if activity is not None else 1.0
+        activity = (0 if activity is None else activity * factor) + event_weight(action) * vector
+        activity_weight = activity_weight * factor + event_weight(action)
+        decayed_at = when
+    with transaction.atomic():
+        UserProfile.objects.filter(user_id=user_id).delete()
+        profile = UserProfile.objects.create(
+            user_id=user_id,
+            activity_vector=None if activity is None else vector_to_bytes(activity),
+            activity_weight=activity_weight,
+            decayed_at=decayed_at,
+        )
+    refresh_prior(user_id)
+    return profile
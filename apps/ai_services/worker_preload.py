@@ -0,0 +1,86 @@
+# apps/ai_services/worker_preload.py
+"""
+Model preloading for prefork Celery workers.
+
+The parent process loads the models before the pool forks, so every child
+maps the same weights copy-on-write instead of loading its own copy, and
+children recycled by worker_max_memory_per_child start without a model
+load. Hooked up to Celery's worker signals in config/celery.py.
+"""
+import gc
+import logging
+import os
+import time
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Long enough to go through the model (OptimizedSummarizer returns texts
+# under 500 characters without the model)
+WARM_UP_TEXT = ' '.join(
+    ['The city council approved the new transport budget on Tuesday, '
+     'funding additional bus routes and repairs to two bridges.'] * 6)
+
+
+def memory_usage():
+    """RSS, USS and PSS of this process in MB (USS/PSS where available)."""
+    try:
+        info = psutil.Process().memory_full_info()
+    except psutil.AccessDenied:
+        info = psutil.Process().memory_info()
+    return {name: getattr(info, name) / 1024 / 1024
+            for name in ('rss', 'uss', 'pss') if hasattr(info, name)}
+
+
+def format_memory(usage):
+    return ' '.join(f"{name}={value:.0f}MB" for name, value in usage.items())
+
+
+def preload_models(embeddings=True):
+    """
+    Load the models in this (parent) process and move everything allocated
+    so far out of the garbage collector's reach, so collections in the
+    children don't write to, and thereby copy, the shared pages.
+    Returns the load time in seconds.
+    """
+    from . import warm_up
+
+    start_time = time.monotonic()
+    warm_up(embeddings=embeddings)
+    gc.collect()
+    gc.freeze()
+    elapsed = time.monotonic() - start_time
+    logger.info(
+        f"Preloaded models in {elapsed:.2f}s before forking "
+        f"({gc.get_freeze_count()} objects frozen; {format_memory(memory_usage())})")
+    return elapsed
+
+
+def warm_up_inference(embeddings=True):
+    """
+    Run one dummy inference through each model so lazy initialisation
+    (and, without preloading, the model load itself) happens before the
+    first real task. Returns the time taken in seconds.
+    """
+    from .embeddings import get_embedding_model
+    from .summarizer import get_summarizer_pipeline
+
+    start_time = time.monotonic()
+    get_summarizer_pipeline()(WARM_UP_TEXT, max_length=20, min_length=5,
+                              do_sample=False, truncation=True)
+    if embeddings:
+        get_embedding_model().encode([WARM_UP_TEXT])
+    return time.monotonic() - start_time
+
+
+def warm_up_child(embeddings=True):
+    """
+    Warm up a freshly forked worker child and log its cold start. Runs
+    before the child reports ready, within worker_proc_alive_timeout.
+    """
+    elapsed = warm_up_inference(embeddings)
+    logger.info(
+        f"Worker child {os.getpid()} ready in {elapsed:.2f}s "
+        f"({format_memory(memory_usage())})")
+    return elapsed
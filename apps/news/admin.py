@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Article, UserInterest, Bookmark
+from .models import Category, Article, UserInterest, Bookmark, Feed
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -26,4 +26,13 @@ class UserInterestAdmin(admin.ModelAdmin):
 class BookmarkAdmin(admin.ModelAdmin):
     list_display = ['user', 'article', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['user__username', 'article__title']
\ No newline at end of file
+    search_fields = ['user__username', 'article__title']
+
+@admin.register(Feed)
+class FeedAdmin(admin.ModelAdmin):
+    list_display = ['url', 'source_name', 'is_active', 'poll_interval',
+                    'publish_rate', 'error_count', 'last_fetched_at', 'next_fetch_at']
+    list_filter = ['is_active']
+    search_fields = ['url', 'source_name']
+    readonly_fields = ['last_fetched_at', 'publish_rate', 'error_count',
+                       'last_error', 'created_at']
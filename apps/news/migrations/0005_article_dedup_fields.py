@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0004_alter_article_image_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="canonical_url",
+            field=models.URLField(blank=True, db_index=True, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="news.article",
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="simhash",
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="article",
+            name="bias_score",
+            field=models.CharField(
+                choices=[
+                    ("NEUTRAL", "Neutral"),
+                    ("LEFT-LEANING", "Left-Leaning"),
+                    ("RIGHT-LEANING", "Right-Leaning"),
+                    ("MIXED", "Mixed"),
+                    ("UNKNOWN", "Unknown"),
+                ],
+                db_index=True,
+                default="UNKNOWN",
+                max_length=15,
+            ),
+        ),
+    ]
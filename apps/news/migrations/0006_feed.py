@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# The feeds previously hard-coded in NewsFetcher.fetch_from_rss
+DEFAULT_FEEDS = [
+    ("http://feeds.bbci.co.uk/news/rss.xml", "BBC News"),
+    ("http://rss.cnn.com/rss/edition.rss", "CNN"),
+    ("https://feeds.reuters.com/reuters/topNews", "Reuters"),
+    ("https://techcrunch.com/feed/", "TechCrunch"),
+    ("https://feeds.arstechnica.com/arstechnica/index", "Ars Technica"),
+]
+
+
+def seed_default_feeds(apps, schema_editor):
+    Feed = apps.get_model("news", "Feed")
+    for url, source_name in DEFAULT_FEEDS:
+        Feed.objects.get_or_create(url=url, defaults={"source_name": source_name})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0005_article_dedup_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Feed",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.URLField(max_length=1000, unique=True)),
+                ("source_name", models.CharField(blank=True, max_length=200)),
+                ("entry_limit", models.PositiveIntegerField(default=5)),
+                ("is_active", models.BooleanField(default=True)),
+                ("last_fetched_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "next_fetch_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("poll_interval", models.PositiveIntegerField(default=3600)),
+                ("publish_rate", models.FloatField(default=0.0)),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["next_fetch_at"],
+            },
+        ),
+        migrations.RunPython(seed_default_feeds, migrations.RunPython.noop),
+    ]
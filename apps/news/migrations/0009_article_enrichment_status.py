@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:26
+
+from django.db import migrations, models
+
+
+def mark_summarized_articles_done(apps, schema_editor):
+    # Articles summarized inline by the old Article.save() need no enrichment
+    Article = apps.get_model("news", "Article")
+    Article.objects.exclude(summary="").update(enrichment_status="DONE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0008_summaryrecord"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="enriched_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="enrichment_attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="enrichment_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("PROCESSING", "Processing"),
+                    ("DONE", "Done"),
+                    ("FAILED", "Failed"),
+                    ("SKIPPED", "Skipped"),
+                ],
+                db_index=True,
+                default="PENDING",
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(mark_summarized_articles_done, migrations.RunPython.noop),
+    ]
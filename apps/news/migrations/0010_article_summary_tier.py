@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+
+def set_summary_tiers(apps, schema_editor):
+    # Existing summaries came from the model, except for short texts,
+    # which OptimizedSummarizer cut at 200 characters
+    Article = apps.get_model("news", "Article")
+    truncated = []
+    for article in (
+        Article.objects.exclude(summary="")
+        .only("id", "summary", "content", "description")
+        .iterator()
+    ):
+        text = article.content or article.description or ""
+        if article.summary == text[:200] + "...":
+            truncated.append(article.id)
+    Article.objects.exclude(summary="").exclude(id__in=truncated).update(
+        summary_tier="ABSTRACTIVE"
+    )
+    Article.objects.filter(id__in=truncated).update(summary_tier="EXTRACTIVE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0009_article_enrichment_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="summary_tier",
+            field=models.CharField(
+                choices=[
+                    ("NONE", "None"),
+                    ("EXTRACTIVE", "Extractive"),
+                    ("ABSTRACTIVE", "Abstractive"),
+                ],
+                default="NONE",
+                max_length=11,
+            ),
+        ),
+        migrations.RunPython(set_summary_tiers, migrations.RunPython.noop),
+    ]
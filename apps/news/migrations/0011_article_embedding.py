@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0010_article_summary_tier"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="bias_lean",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="embedding",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
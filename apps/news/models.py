@@ -1,7 +1,9 @@
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User  # Django's built-in User model
+from django.utils import timezone
 from django.utils.text import slugify
-from apps.ai_services import CachedSummarizer, BiasDetector
 
 
 class Category(models.Model):
@@ -31,7 +33,34 @@ class Article(models.Model):
         ('MIXED', 'Mixed'),
         ('UNKNOWN', 'Unknown'),
     ]
-    
+
+    # Background AI enrichment (see apps/news/tasks.py): articles are stored
+    # PENDING and summarized exactly once by process_articles_ai
+    ENRICHMENT_PENDING = 'PENDING'
+    ENRICHMENT_PROCESSING = 'PROCESSING'
+    ENRICHMENT_DONE = 'DONE'
+    ENRICHMENT_FAILED = 'FAILED'
+    ENRICHMENT_SKIPPED = 'SKIPPED'
+    ENRICHMENT_CHOICES = [
+        (ENRICHMENT_PENDING, 'Pending'),
+        (ENRICHMENT_PROCESSING, 'Processing'),
+        (ENRICHMENT_DONE, 'Done'),
+        (ENRICHMENT_FAILED, 'Failed'),
+        (ENRICHMENT_SKIPPED, 'Skipped'),  # nothing to summarize
+    ]
+
+    # Which summarizer wrote Article.summary: every article gets an
+    # extractive summary at ingestion; the abstractive model only upgrades
+    # articles that are read or rank highly
+    SUMMARY_TIER_NONE = 'NONE'
+    SUMMARY_TIER_EXTRACTIVE = 'EXTRACTIVE'
+    SUMMARY_TIER_ABSTRACTIVE = 'ABSTRACTIVE'
+    SUMMARY_TIER_CHOICES = [
+        (SUMMARY_TIER_NONE, 'None'),
+        (SUMMARY_TIER_EXTRACTIVE, 'Extractive'),
+        (SUMMARY_TIER_ABSTRACTIVE, 'Abstractive'),
+    ]
+
     title = models.CharField(max_length=500, db_index=True)
     image_url = models.URLField(max_length=1000, blank=True, null=True)
     url = models.URLField(unique=True)
@@ -53,11 +82,39 @@ class Article(models.Model):
         default='UNKNOWN',
         db_index=True
     )
+    summary_tier = models.CharField(
+        max_length=11,
+        choices=SUMMARY_TIER_CHOICES,
+        default=SUMMARY_TIER_NONE
+    )
+    enrichment_status = models.CharField(
+        max_length=10,
+        choices=ENRICHMENT_CHOICES,
+        default=ENRICHMENT_PENDING,
+        db_index=True
+    )
+    enrichment_attempts = models.PositiveSmallIntegerField(default=0)
+    enriched_at = models.DateTimeField(null=True, blank=True)
+    # Sentence embedding (float32 bytes, see apps/ai_services/embeddings.py)
+    # and the lean read from it: -1 left to +1 right
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    bias_lean = models.FloatField(null=True, blank=True)
 
     # Relationships
     categories = models.ManyToManyField(Category, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Near-duplicate detection (see apps/ai_services/dedup.py)
+    canonical_url = models.URLField(max_length=1000, blank=True, db_index=True)
+    simhash = models.BigIntegerField(null=True, blank=True, db_index=True)
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicates'
+    )
+
     class Meta:
         ordering = ['-published_date']
         indexes = [
@@ -88,27 +145,6 @@ class Article(models.Model):
         }
         return bias_labels.get(self.bias_score, 'Unknown')
 
-    def save(self, *args, **kwargs):
-        if not self.summary:
-            from apps.ai_services import CachedSummarizer
-            summarizer = CachedSummarizer()
-            self.summary = summarizer.summarize(
-                self.content or self.description)
-        super().save(*args, **kwargs)
-
-    def _generate_ai_content(self):
-        try:
-            summarizer = CachedSummarizer()
-            self.summary = summarizer.summarize(self.content)
-
-            bias_detector = BiasDetector()
-            self.bias_score = bias_detector.detect_bias(self.content)
-
-        except Exception as e:
-            print(f"AI processing failed for article {self.id}: {e}")
-            self.summary = self.description[:200] + "..."
-            self.bias_score = 'UNKNOWN'
-
 
 class UserInterest(models.Model):
     user = models.ForeignKey(
@@ -159,3 +195,120 @@ class UserActivity(models.Model):
             f"{self.user.username} - {self.action} - "
             f"{self.article.title[:50]}"
         )
+
+
+class Feed(models.Model):
+    """
+    An RSS/Atom feed polled on its own adaptive schedule: feeds that
+    publish often are polled more often, quiet or failing feeds back off.
+    """
+    url = models.URLField(max_length=1000, unique=True)
+    source_name = models.CharField(max_length=200, blank=True)
+    entry_limit = models.PositiveIntegerField(default=5)
+    is_active = models.BooleanField(default=True)
+
+    # Scheduling state
+    last_fetched_at = models.DateTimeField(null=True, blank=True)
+    next_fetch_at = models.DateTimeField(default=timezone.now, db_index=True)
+    poll_interval = models.PositiveIntegerField(default=3600)  # seconds
+    publish_rate = models.FloatField(default=0.0)  # new entries per hour
+    error_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_fetch_at']
+
+    def __str__(self):
+        return self.source_name or self.url
+
+    def record_fetch(self, new_entries, now=None):
+        """
+        Update the observed publish rate (exponentially smoothed) after a
+        successful poll and schedule the next one so that roughly half of
+        entry_limit new entries are waiting by then.
+        """
+        now = now or timezone.now()
+        min_interval = getattr(settings, 'FEED_MIN_POLL_INTERVAL', 300)
+        max_interval = getattr(settings, 'FEED_MAX_POLL_INTERVAL', 6 * 3600)
+        smoothing = getattr(settings, 'FEED_RATE_SMOOTHING', 0.3)
+
+        # The first poll returns a backlog, not a rate
+        if self.last_fetched_at:
+            hours = max((now - self.last_fetched_at).total_seconds() / 3600, 1 / 60)
+            self.publish_rate = (smoothing * (new_entries / hours)
+                                 + (1 - smoothing) * self.publish_rate)
+
+            target_entries = max(self.entry_limit / 2, 1)
+            if self.publish_rate > 0:
+                interval = target_entries / self.publish_rate * 3600
+            else:
+                interval = self.poll_interval * 2
+            self.poll_interval = int(min(max(interval, min_interval), max_interval))
+
+        self.last_fetched_at = now
+        self.next_fetch_at = now + timedelta(seconds=self.poll_interval)
+        self.error_count = 0
+        self.last_error = ''
+        self.save(update_fields=[
+            'publish_rate', 'poll_interval', 'last_fetched_at',
+            'next_fetch_at', 'error_count', 'last_error'])
+
+    def record_error(self, error, now=None):
+        """Back off exponentially after consecutive failed polls."""
+        now = now or timezone.now()
+        max_interval = getattr(settings, 'FEED_MAX_POLL_INTERVAL', 6 * 3600)
+        self.error_count += 1
+        self.last_error = str(error)[:1000]
+        delay = min(self.poll_interval * 2 ** self.error_count, max_interval)
+        self.next_fetch_at = now + timedelta(seconds=delay)
+        self.save(update_fields=['error_count', 'last_error', 'next_fetch_at'])
+
+
+class SourceWatermark(models.Model):
+    """Newest publication date ingested from a paginated API source."""
+    source = models.CharField(max_length=50, unique=True)
+    published_date = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} @ {self.published_date}"
+
+
+class SummaryRecord(models.Model):
+    """
+    Durable tier of the content-addressed summary store
+    (apps/ai_services/summary_store.py): one summary per digest of the
+    normalized text, model and generation parameters.
+    """
+    digest = models.CharField(max_length=64, unique=True)
+    model_name = models.CharField(max_length=200)
+    summary = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model_name} {self.digest[:12]}"
+
+
+class UserProfile(models.Model):
+    """
+    A user's interests as an embedding (apps/ai_services/user_profiles.py):
+    an exponentially decayed sum of the embeddings of articles they read or
+    bookmarked, plus a prior from their UserInterest categories that
+    carries new users until they have history.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='news_profile'
+    )
+    activity_vector = models.BinaryField(null=True, blank=True)
+    # Sum of the decayed event weights behind activity_vector
+    activity_weight = models.FloatField(default=0.0)
+    # Time activity_vector and activity_weight were last decayed to
+    decayed_at = models.DateTimeField(default=timezone.now)
+    prior_vector = models.BinaryField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} profile ({self.activity_weight:.1f})"
@@ -1,21 +1,75 @@
 # apps/news/signals.py
-from django.db.models.signals import post_save
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import Article, UserActivity
-from .ai_services import process_article_ai, update_user_preferences
-from django.contrib.auth import get_user_model
 
-User = get_user_model()
+from .models import Article, Bookmark, UserActivity, UserInterest
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=Article)
 def process_article_on_save(sender, instance, created, **kwargs):
+    # Articles saved one at a time (e.g. in the admin) are enriched in the
+    # background like ingested ones; NewsFetcher's bulk_create queues its own
     if created:
-        from apps.news.tasks import process_article_ai
-        process_article_ai.delay(instance.id)
+        enrich = instance.enrichment_status == Article.ENRICHMENT_PENDING
+        transaction.on_commit(lambda: _queue_enrichment(instance.id, enrich))
+
+
+def _queue_enrichment(article_id, enrich=True):
+    from apps.news.tasks import embed_articles, process_articles_ai
+    try:
+        if enrich:
+            process_articles_ai.delay([article_id])
+        embed_articles.delay([article_id])
+    except Exception as e:
+        # process_pending_articles picks the article up later
+        logger.error(f"Could not queue enrichment for article {article_id}: {e}")
 
 
 @receiver(post_save, sender=UserActivity)
-def update_user_preference_on_activity(sender, instance, created, **kwargs):
+def update_profile_on_read(sender, instance, created, **kwargs):
+    if created and instance.action == 'read':
+        transaction.on_commit(lambda: _record_profile_event(
+            instance.user_id, instance.article_id, 'read', instance.timestamp))
+
+
+@receiver(post_save, sender=Bookmark)
+def update_profile_on_bookmark(sender, instance, created, **kwargs):
     if created:
-        update_user_preferences.delay(instance.user.id)
+        transaction.on_commit(lambda: _record_profile_event(
+            instance.user_id, instance.article_id, 'bookmark', instance.created_at))
+
+
+def _record_profile_event(user_id, article_id, action, when):
+    from apps.ai_services.user_feeds import schedule_feed_refresh
+    from apps.ai_services.user_profiles import record_event
+    try:
+        if record_event(user_id, article_id, action, when):
+            schedule_feed_refresh([user_id])
+    except Exception as e:
+        # rebuild_user_profiles replays the event later
+        logger.error(f"Could not update profile of user {user_id}: {e}")
+
+
+@receiver(post_save, sender=UserInterest)
+@receiver(post_delete, sender=UserInterest)
+def update_profile_prior(sender, instance, **kwargs):
+    transaction.on_commit(lambda: _refresh_profile_prior(instance.user_id))
+
+
+def _refresh_profile_prior(user_id):
+    from django.contrib.auth.models import User
+
+    from apps.ai_services.user_feeds import schedule_feed_refresh
+    from apps.ai_services.user_profiles import refresh_prior
+    try:
+        # Interests are also deleted along with their user
+        if User.objects.filter(id=user_id).exists():
+            refresh_prior(user_id)
+            schedule_feed_refresh([user_id])
+    except Exception as e:
+        logger.error(f"Could not update interest prior of user {user_id}: {e}")
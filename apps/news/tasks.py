@@ -1,34 +1,40 @@
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 import logging
-from django.db.models import Q
+from django.db.models import Count, F, Q
 # from apps.news.models import Article, Category  # Keep only one import
-from apps.ai_services import CachedSummarizer, BiasDetector
+from apps.ai_services import CachedSummarizer
+from apps.ai_services.ann_index import build_article_index, get_article_index, timestamps
+from apps.ai_services.bias_detector import get_bias_detector
+from apps.ai_services.categorizer import get_categorizer
+from apps.ai_services.content_extractor import ContentExtractor
+from apps.ai_services.embedding_heads import get_embedding_heads
+from apps.ai_services.embedding_store import get_embedding_store
+from apps.ai_services.embeddings import encode_articles, vector_to_bytes
+from apps.ai_services.extractive import ExtractiveSummarizer
+from apps.ai_services.user_feeds import active_users, get_redis, refresh_feed, schedule_feed_refresh
 from apps.ai_services.news_fetcher import NewsFetcher
 import psutil  # Add this import
 import time
 # from django.db import models
-from .models import Article
+from .models import Article, Feed
 # from apps.ai_services.gemini_client import GeminiService
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, priority='medium', max_retries=3)
-def fetch_latest_news(self):
+def fetch_latest_news(self, sources=None):
     """Fetch latest news articles from various sources."""
     try:
         fetcher = NewsFetcher()
-        sources = ['newsapi', 'guardian', 'rss']
-        total_articles = 0
-        for source in sources:
-            try:
-                count = fetcher.fetch_from_source(source)
-                total_articles += count
-                logger.info(f"Fetched {count} articles from {source}")
-            except Exception as e:
-                logger.error(f"Error fetching from {source}: {str(e)}")
+        # Sources and feeds are downloaded concurrently; see NewsFetcher.fetch_all
+        report = fetcher.fetch_all(sources)
+        total_articles = report['total']
         logger.info(f"Total articles fetched: {total_articles}")
         return f"Successfully fetched {total_articles} articles"
     except Exception as e:
@@ -36,47 +42,390 @@ def fetch_latest_news(self):
         return f"Error: {str(e)}"
 
 
+@shared_task(bind=True, priority='medium', max_retries=3)
+def poll_feeds(self):
+    """Dispatch a fetch_feed task for every active feed that is due."""
+    try:
+        now = timezone.now()
+        due_ids = list(Feed.objects.filter(
+            is_active=True, next_fetch_at__lte=now).values_list('id', flat=True))
+        if not due_ids:
+            return "No feeds due"
+        # Push next_fetch_at forward before dispatching so a slow worker
+        # doesn't get the same feed queued again on the next beat;
+        # fetch_feed sets the real schedule once the poll completes
+        Feed.objects.filter(id__in=due_ids).update(
+            next_fetch_at=now + timedelta(minutes=15))
+        for feed_id in due_ids:
+            fetch_feed.delay(feed_id)
+        logger.info(f"Queued {len(due_ids)} feeds for polling")
+        return f"Queued {len(due_ids)} feeds"
+    except Exception as e:
+        logger.error(f"Error in poll_feeds: {str(e)}")
+        return f"Error: {str(e)}"
+
+
+@shared_task(bind=True, priority='medium', max_retries=3)
+def fetch_feed(self, feed_id):
+    """Poll a single feed and update its adaptive schedule."""
+    try:
+        feed = Feed.objects.get(id=feed_id, is_active=True)
+    except Feed.DoesNotExist:
+        logger.warning(f"Feed {feed_id} not found or inactive")
+        return 0
+    stats = NewsFetcher().fetch_feed(feed)
+    logger.info(
+        f"Polled {feed}: {stats['created']} new articles, "
+        f"next poll in {feed.poll_interval}s")
+    return stats['created']
+
+
 @shared_task(bind=True, priority='high', max_retries=3)
 def process_article_ai(self, article_id):
-    """Process article AI (summary and bias detection)"""
+    """Process article AI (abstractive summary and bias detection)"""
     start_time = time.time()
     process = psutil.Process()
     logger.info(f"Starting AI processing for article {article_id}")
     logger.info(
         f"Memory usage: {process.memory_info().rss / 1024 / 1024:.2f}MB")
+    articles = _claim_articles([article_id])
+    if not articles:
+        logger.info(f"Article {article_id} is missing, enriched or already being processed")
+        return
     try:
-        article = Article.objects.get(id=article_id)
-        content = article.content or article.description or ""
-        logger.info(f"[📝] Processing article {article.id} titled '{article.title}' — content length: {len(content)}")
-        if not content:
-            logger.warning(f"[⚠️] Empty content for article {article_id}")
-            return
-        summarizer = CachedSummarizer()
-        summary = summarizer.summarize(content)
-        detector = BiasDetector()
-        bias_score = detector.detect_bias(content)
-        article.summary = summary
-        article.bias_score = bias_score
-        article.save()
+        _enrich_articles(articles)
         duration = time.time() - start_time
         logger.info(
-            f"[✔] Saved summary for article {article.id} in {duration:.2f}s")
-    except Article.DoesNotExist:
-        logger.error(f"Article {article_id} not found")
-        self.retry(countdown=60, max_retries=3)
+            f"[✔] Saved summary for article {article_id} in {duration:.2f}s")
     except Exception as e:
         logger.error(f"[✘] Error processing article {article_id}: {e}")
+        _mark_failed([article_id])
+        self.retry(countdown=60, max_retries=3)
+
+
+@shared_task(bind=True, priority='high', max_retries=3)
+def process_articles_ai(self, article_ids):
+    """
+    Run the abstractive model over a batch of articles in one task,
+    ENRICHMENT_BATCH_SIZE articles per model call. Articles that are
+    not PENDING/FAILED or are claimed by another task are skipped.
+    """
+    start_time = time.time()
+    batch_size = getattr(settings, 'ENRICHMENT_BATCH_SIZE', 16)
+    articles = _claim_articles(article_ids)
+    processed = 0
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start:start + batch_size]
+        try:
+            processed += _enrich_articles(batch)
+        except Exception as e:
+            logger.error(
+                f"[✘] Error processing articles {[a.id for a in batch]}: {e}")
+            _mark_failed([a.id for a in batch])
+    duration = time.time() - start_time
+    logger.info(
+        f"[✔] Processed {processed}/{len(article_ids)} articles in {duration:.2f}s "
+        f"({processed / duration if duration else 0:.1f} articles/s)")
+    return processed
+
+
+@shared_task(bind=True, priority='high', max_retries=3)
+def embed_articles(self, article_ids):
+    """
+    Encode articles once with the sentence model and store the vector.
+    When trained heads exist (manage.py train_embedding_heads) the same
+    vectors add categories the keywords missed and set bias_lean.
+    """
+    start_time = time.time()
+    articles = list(Article.objects.filter(
+        id__in=article_ids, embedding__isnull=True).only(
+            'id', 'title', 'description', 'published_date'))
+    if not articles:
+        return 0
+    try:
+        vectors = encode_articles(articles)
+    except Exception as e:
+        logger.error(f"Error embedding articles {article_ids}: {e}")
         self.retry(countdown=60, max_retries=3)
+    for article, vector in zip(articles, vectors):
+        article.embedding = vector_to_bytes(vector)
+    fields = ['embedding']
+
+    heads = get_embedding_heads()
+    if heads is not None:
+        predicted = heads.predict_categories(vectors)
+        category_ids = get_categorizer().category_ids(
+            {name for names in predicted for name in names})
+        Through = Article.categories.through
+        Through.objects.bulk_create(
+            [Through(article_id=article.id, category_id=category_ids[name])
+             for article, names in zip(articles, predicted)
+             for name in names if name in category_ids],
+            ignore_conflicts=True,
+        )
+        leans = heads.bias_lean(vectors)
+        if leans is not None:
+            for article, lean in zip(articles, leans):
+                article.bias_lean = float(lean)
+            fields.append('bias_lean')
+    Article.objects.bulk_update(articles, fields)
+    # Other processes pick the new vectors up in ann_index.refresh()
+    get_article_index().add([article.id for article in articles], vectors,
+                            timestamps([article.published_date for article in articles]))
+    schedule_feed_refresh()
+    logger.info(
+        f"[✔] Embedded {len(articles)} articles in {time.time() - start_time:.2f}s")
+    return len(articles)
+
+
+@shared_task(bind=True, priority='medium', max_retries=3)
+def refresh_user_feeds(self, user_ids=None):
+    """
+    Re-rank the stored feeds of `user_ids`, or of every active user
+    (see apps/ai_services/user_feeds.py). Inactive users are skipped.
+    Article popularity comes from the process's candidate pool (see
+    ranking.get_candidate_pool), counted at most once per sync.
+    """
+    start_time = time.time()
+    users = active_users()
+    if user_ids is not None:
+        users = users.filter(id__in=user_ids)
+    redis = get_redis()
+    refreshed = 0
+    for user in users.iterator():
+        try:
+            refresh_feed(user, redis)
+            refreshed += 1
+        except Exception as e:
+            logger.error(f"Error refreshing feed of user {user.id}: {e}")
+    logger.info(f"[✔] Refreshed {refreshed} feeds in {time.time() - start_time:.2f}s")
+    return refreshed
+
+
+@shared_task(bind=True, priority='low', max_retries=3)
+def compact_embedding_store(self):
+    """
+    Rebuild the memory-mapped embedding matrix from Article.embedding so
+    recommendations read new articles from it rather than the database,
+    then rebuild the ANN index from it.
+    """
+    try:
+        store = get_embedding_store()
+        count = store.compact()
+        build_article_index(store)
+        return count
+    except Exception as e:
+        logger.error(f"Error in compact_embedding_store: {str(e)}")
+        self.retry(countdown=60, max_retries=3)
+
+
+@shared_task(bind=True, priority='low', max_retries=3)
+def extract_articles_content(self, article_ids):
+    """
+    Fill Article.content from the article pages (runs on the 'extraction'
+    queue) and redo the extractive summary and bias score from the full
+    text.
+    """
+    start_time = time.time()
+    articles = list(Article.objects.filter(id__in=article_ids).only(
+        'id', 'url', 'content', 'summary', 'summary_tier', 'bias_score'))
+    try:
+        extracted = ContentExtractor().extract_many(articles)
+    except Exception as e:
+        logger.error(f"Error in extract_articles_content: {str(e)}")
+        extracted = {}
+    updated = []
+    for article in articles:
+        text = extracted.get(article.id, '')
+        if len(text) > len(article.content):
+            article.content = text
+            updated.append(article)
+    # An abstractive summary written in the meantime is kept
+    resummarize = [article for article in updated
+                   if article.summary_tier != Article.SUMMARY_TIER_ABSTRACTIVE]
+    texts = [article.content for article in resummarize]
+    summaries = ExtractiveSummarizer().summarize_many(texts)
+    bias_scores = get_bias_detector().detect_bias_many(texts)
+    for article, summary, bias_score in zip(resummarize, summaries, bias_scores):
+        article.summary, article.bias_score = summary, bias_score.label
+        article.summary_tier = Article.SUMMARY_TIER_EXTRACTIVE
+    Article.objects.bulk_update(updated, ['content'])
+    # Skips articles the abstractive model upgraded while pages were downloading
+    Article.objects.exclude(summary_tier=Article.SUMMARY_TIER_ABSTRACTIVE).bulk_update(
+        resummarize, ['summary', 'summary_tier', 'bias_score'])
+    logger.info(
+        f"[✔] Extracted content for {len(updated)}/{len(article_ids)} "
+        f"articles in {time.time() - start_time:.2f}s")
+    return len(updated)
+
+
+def request_abstractive_summaries(article_ids):
+    """
+    Queue the abstractive model for articles that only have an extractive
+    summary, e.g. because someone opened them. Near-duplicates are
+    upgraded through their canonical article. Each article is sent to the
+    model once, on its DONE (extractive) -> PENDING transition; retries of
+    failed runs are left to process_pending_articles. Repeat requests for
+    an article within SUMMARY_REQUEST_DEBOUNCE seconds are dropped before
+    touching the database. Returns the IDs queued.
+    """
+    debounce = getattr(settings, 'SUMMARY_REQUEST_DEBOUNCE', 300)
+    try:
+        article_ids = [article_id for article_id in article_ids
+                       if cache.add(f'summaries:requested:{article_id}', 1, debounce)]
+    except Exception as e:
+        # Without the cache the row lock below still queues each article once
+        logger.warning(f"Summary request debounce unavailable: {e}")
+    if not article_ids:
+        return []
+    canonical_ids = {duplicate_of_id or article_id for article_id, duplicate_of_id in
+                     Article.objects.filter(id__in=article_ids).values_list('id', 'duplicate_of_id')}
+    with transaction.atomic():
+        ids = list(Article.objects.select_for_update(skip_locked=True).filter(
+            id__in=canonical_ids,
+            enrichment_status=Article.ENRICHMENT_DONE,
+            summary_tier=Article.SUMMARY_TIER_EXTRACTIVE,
+            enrichment_attempts=0,
+        ).values_list('id', flat=True))
+        Article.objects.filter(id__in=ids).update(
+            enrichment_status=Article.ENRICHMENT_PENDING, updated_at=timezone.now())
+        if ids:
+            transaction.on_commit(lambda: process_articles_ai.delay(ids))
+    return ids
+
+
+@shared_task(bind=True, priority='medium', max_retries=3)
+def upgrade_top_summaries(self):
+    """
+    Upgrade the recent articles readers engage with most (reads and
+    bookmarks), so popular stories have an abstractive summary before
+    most of their readers open them.
+    """
+    try:
+        now = timezone.now()
+        since = now - timedelta(hours=getattr(settings, 'SUMMARY_UPGRADE_WINDOW_HOURS', 24))
+        top_ids = list(Article.objects.filter(
+            published_date__gte=since,
+            duplicate_of__isnull=True,
+            summary_tier=Article.SUMMARY_TIER_EXTRACTIVE,
+            enrichment_status=Article.ENRICHMENT_DONE,
+            enrichment_attempts=0,
+        ).annotate(
+            engagement=Count('useractivity', filter=Q(
+                useractivity__action='read', useractivity__timestamp__gte=since),
+                distinct=True)
+            + Count('bookmarked_by', distinct=True)
+        ).order_by('-engagement', '-published_date').values_list('id', flat=True)[
+            :getattr(settings, 'SUMMARY_UPGRADE_TOP_N', 30)])
+        queued = request_abstractive_summaries(top_ids)
+        logger.info(f"Queued {len(queued)} top articles for abstractive summaries")
+        return f"Queued {len(queued)} articles for abstractive summaries"
+    except Exception as e:
+        logger.error(f"Error in upgrade_top_summaries: {str(e)}")
+        return f"Error: {str(e)}"
+
+
+def _claim_articles(article_ids):
+    """
+    Move the PENDING or FAILED articles among `article_ids` to PROCESSING
+    and return them, so each article is enriched by one task only.
+    """
+    with transaction.atomic():
+        claimed = list(Article.objects.select_for_update(skip_locked=True).filter(
+            id__in=article_ids,
+            enrichment_status__in=[Article.ENRICHMENT_PENDING, Article.ENRICHMENT_FAILED],
+        ).values_list('id', flat=True))
+        Article.objects.filter(id__in=claimed).update(
+            enrichment_status=Article.ENRICHMENT_PROCESSING,
+            enrichment_attempts=F('enrichment_attempts') + 1,
+            updated_at=timezone.now())
+    return list(Article.objects.filter(id__in=claimed).select_related('duplicate_of'))
+
+
+def _mark_failed(article_ids):
+    Article.objects.filter(
+        id__in=article_ids, enrichment_status=Article.ENRICHMENT_PROCESSING
+    ).update(enrichment_status=Article.ENRICHMENT_FAILED, updated_at=timezone.now())
+
+
+def _enrich_articles(articles):
+    """
+    Summarize and bias-score a batch of articles with one batched model
+    call and write the results back with bulk_update. Texts too short for
+    the model keep an extractive summary. Returns the number of articles
+    enriched.
+    """
+    to_model = []
+    enriched = []
+    skipped = []
+    for article in articles:
+        content = article.content or article.description or ""
+        if not content:
+            logger.warning(f"[⚠️] Empty content for article {article.id}")
+            article.enrichment_status = Article.ENRICHMENT_SKIPPED
+            skipped.append(article)
+            continue
+        canonical = article.duplicate_of
+        if canonical and canonical.summary_tier == Article.SUMMARY_TIER_ABSTRACTIVE:
+            # Near-duplicate of a story that is already summarized by the model
+            article.summary, article.bias_score = canonical.summary, canonical.bias_score
+            article.summary_tier = canonical.summary_tier
+        else:
+            to_model.append((article, content))
+        enriched.append(article)
+
+    if to_model:
+        texts = [content for _, content in to_model]
+        logger.info(
+            f"[📝] Summarizing {len(texts)} articles "
+            f"({sum(len(text) for text in texts)} characters)")
+        summarizer = CachedSummarizer()
+        summaries = summarizer.summarize_many(
+            texts, batch_size=getattr(settings, 'ENRICHMENT_BATCH_SIZE', 16))
+        bias_scores = get_bias_detector().detect_bias_many(texts)
+        for (article, content), summary, bias_score in zip(to_model, summaries, bias_scores):
+            article.summary = summary
+            article.bias_score = bias_score.label
+            article.summary_tier = (Article.SUMMARY_TIER_ABSTRACTIVE
+                                    if len(content) >= summarizer.min_model_chars
+                                    else Article.SUMMARY_TIER_EXTRACTIVE)
+
+    now = timezone.now()
+    for article in enriched:
+        article.enrichment_status = Article.ENRICHMENT_DONE
+        article.enriched_at = now
+    for article in enriched + skipped:
+        article.updated_at = now
+    # Near-duplicates linked to these articles share their enrichment
+    by_id = {article.id: article for article in enriched}
+    duplicates = list(Article.objects.filter(
+        duplicate_of_id__in=list(by_id)).exclude(id__in=list(by_id)).only('id', 'duplicate_of_id'))
+    for duplicate in duplicates:
+        canonical = by_id[duplicate.duplicate_of_id]
+        duplicate.summary, duplicate.bias_score = canonical.summary, canonical.bias_score
+        duplicate.summary_tier = canonical.summary_tier
+        duplicate.enrichment_status = Article.ENRICHMENT_DONE
+        duplicate.enriched_at = duplicate.updated_at = now
+    with transaction.atomic():
+        Article.objects.bulk_update(
+            enriched + skipped + duplicates,
+            ['summary', 'summary_tier', 'bias_score', 'enrichment_status',
+             'enriched_at', 'updated_at'])
+    return len(enriched)
 
 
 @shared_task(bind=True, priority='low', max_retries=3)
 def cleanup_old_articles(self):
-    """Remove articles older than 30 days."""
+    """Remove articles older than ARTICLE_RETENTION_DAYS (30 by default)."""
     try:
-        cutoff_date = timezone.now() - timedelta(days=30)
+        cutoff_date = timezone.now() - timedelta(
+            days=getattr(settings, 'ARTICLE_RETENTION_DAYS', 30))
         old_articles = Article.objects.filter(published_date__lt=cutoff_date)
-        count = old_articles.count()
+        old_ids = list(old_articles.values_list('id', flat=True))
+        count = len(old_ids)
         old_articles.delete()
+        # Other processes drop them through the same retention window
+        get_article_index().remove(old_ids)
         logger.info(f"Cleaned up {count} old articles")
         return f"Cleaned up {count} old articles"
     except Exception as e:
@@ -85,15 +434,46 @@ def cleanup_old_articles(self):
 
 
 @shared_task(bind=True, priority='medium', max_retries=3)
-def process_pending_articles(self, article_id):
-    """Process articles that haven't been analyzed by AI yet"""
+def process_pending_articles(self):
+    """
+    Re-queue enrichment that never completed: PENDING articles whose task
+    was lost, PROCESSING articles whose worker died, and FAILED articles
+    with attempts left.
+    """
     try:
-        pending_articles = Article.objects.filter(
-            Q(summary='') | Q(bias_score='UNKNOWN')
-        )[:10]  # Limit to 10 at a time
-        for article in pending_articles:
-            process_article_ai.delay(article.id)
-        count = pending_articles.count()
+        now = timezone.now()
+        stale = Article.objects.filter(
+            enrichment_status=Article.ENRICHMENT_PROCESSING,
+            updated_at__lt=now - timedelta(
+                seconds=getattr(settings, 'ENRICHMENT_STALE_AFTER', 30 * 60)),
+        ).update(enrichment_status=Article.ENRICHMENT_FAILED, updated_at=now)
+        if stale:
+            logger.warning(f"Reset {stale} articles stuck in processing")
+
+        pending_ids = list(Article.objects.filter(
+            Q(enrichment_status=Article.ENRICHMENT_PENDING,
+              created_at__lt=now - timedelta(
+                  seconds=getattr(settings, 'ENRICHMENT_SWEEP_DELAY', 30 * 60))) |
+            Q(enrichment_status=Article.ENRICHMENT_FAILED,
+              enrichment_attempts__lt=getattr(settings, 'ENRICHMENT_MAX_ATTEMPTS', 3))
+        ).order_by('-published_date').values_list('id', flat=True)[
+            :getattr(settings, 'ENRICHMENT_SWEEP_LIMIT', 200)])
+
+        batch_size = getattr(settings, 'ENRICHMENT_BATCH_SIZE', 16)
+        for start in range(0, len(pending_ids), batch_size):
+            process_articles_ai.delay(pending_ids[start:start + batch_size])
+
+        # Articles whose embedding task was lost
+        unembedded_ids = list(Article.objects.filter(
+            embedding__isnull=True,
+            created_at__lt=now - timedelta(
+                seconds=getattr(settings, 'ENRICHMENT_SWEEP_DELAY', 30 * 60)),
+        ).order_by('-published_date').values_list('id', flat=True)[
+            :getattr(settings, 'ENRICHMENT_SWEEP_LIMIT', 200)])
+        if unembedded_ids:
+            embed_articles.delay(unembedded_ids)
+            logger.info(f"Queued {len(unembedded_ids)} articles for embedding")
+        count = len(pending_ids)
         logger.info(f"Queued {count} articles for AI processing")
         return f"Queued {count} articles for processing"
     except Exception as e:
@@ -16,6 +16,8 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('fetch_summaries/', views.fetch_missing_summaries,
          name='fetch_missing_summaries'),
+    path('fetch_summary/', views.fetch_summary_for_article,
+         name='fetch_summary_for_article'),
 
     path('refresh-news/', views.refresh_and_redirect, name='refresh_news'),
 
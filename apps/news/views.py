@@ -8,15 +8,22 @@ from django.views.decorators.http import require_POST
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .models import Article, Category, Bookmark, UserInterest
+from .models import Article, Category, Bookmark, UserActivity, UserInterest
 from .serializers import ArticleSerializer
-from .tasks import process_article_ai
+from .tasks import request_abstractive_summaries
 
 
 from django.views.decorators.csrf import csrf_exempt
 
 from .tasks import fetch_latest_news
 import json
+import logging
+
+from apps.ai_services.user_feeds import user_feed
+from apps.ai_services.personalizer import NewsPersonalizer
+from apps.ai_services.ranking import ranked_articles
+
+logger = logging.getLogger(__name__)
 
 
 def home(request):
@@ -44,6 +51,8 @@ def home(request):
     if category_filter:
         articles = articles.filter(categories__slug=category_filter)
 
+    articles = ranked_articles(
+        articles, request.user, ('home', search_query, bias_filter, category_filter))
     paginator = Paginator(articles, 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
@@ -72,13 +81,27 @@ def article_detail(request, id):
     if request.user.is_authenticated:
         is_bookmarked = Bookmark.objects.filter(
             user=request.user, article=article).exists()
+        # The first visit counts as a read and updates the user's profile
+        if not UserActivity.objects.filter(
+                user=request.user, article=article, action='read').exists():
+            UserActivity.objects.create(user=request.user, article=article, action='read')
 
-    if not article.summary or article.bias_score == 'UNKNOWN':
-        process_article_ai.delay(article.id)
+    # Articles are stored with an extractive summary; opening one is what
+    # earns it the abstractive model. Failed runs are retried (a bounded
+    # number of times) by process_pending_articles, not on page views
+    if article.summary_tier != Article.SUMMARY_TIER_ABSTRACTIVE:
+        request_abstractive_summaries([article.id])
+
+    try:
+        related_articles = NewsPersonalizer().related_articles(article)
+    except Exception as e:
+        logger.error(f"Related articles error for article {article.id}: {e}")
+        related_articles = []
 
     context = {
         'article': article,
         'is_bookmarked': is_bookmarked,
+        'related_articles': related_articles,
     }
     return render(request, 'article_detail.html', context)
 
@@ -177,40 +200,21 @@ class ArticleListAPI(generics.ListAPIView):
 
 @login_required
 def dashboard(request):
-    # Get user interests
-    user_categories = UserInterest.objects.filter(
-        user=request.user
-    ).values_list('category', flat=True)
-
-    # Start with articles from those categories
-    articles = Article.objects.filter(
-        categories__in=user_categories
-    ).distinct()
-
     # Filters from request
     search_query = request.GET.get('search', '')
     category_filter = request.GET.get('category', '')
     bias_filter = request.GET.get('bias', '')
 
-    if search_query:
-        articles = articles.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
-
-    if category_filter:
-        articles = articles.filter(categories__slug=category_filter)
-    '''
-    if bias_filter:
-        articles = articles.filter(bias_score=bias_filter)
-    '''
-
-    print(f"Bias filter selected: '{bias_filter}'")
-    print(f"Articles before bias filter: {articles.count()}")
-    if bias_filter:
-        articles = articles.filter(bias_score=bias_filter)
-        print(f"Articles after bias filter: {articles.count()}")
+    # Unfiltered, the dashboard pages through the user's ranked feed
+    # (one Redis range and one id__in query per page)
+    articles = None
+    if not (search_query or category_filter or bias_filter):
+        articles = user_feed(request.user, Article.objects.prefetch_related('categories'))
 
+    if articles is None:
+        articles = ranked_articles(
+            _dashboard_queryset(request.user, search_query, category_filter, bias_filter),
+            request.user, ('dashboard', search_query, category_filter, bias_filter))
 
     bias_choices = Article.BIAS_CHOICES
     
@@ -229,22 +233,41 @@ def dashboard(request):
     })
 
 
+def _dashboard_queryset(user, search_query, category_filter, bias_filter):
+    # Get user interests
+    user_categories = UserInterest.objects.filter(
+        user=user
+    ).values_list('category', flat=True)
+
+    # Start with articles from those categories
+    articles = Article.objects.filter(
+        categories__in=user_categories
+    ).distinct()
+
+    if search_query:
+        articles = articles.filter(
+            Q(title__icontains=search_query) |
+            Q(description__icontains=search_query)
+        )
+
+    if category_filter:
+        articles = articles.filter(categories__slug=category_filter)
+
+    if bias_filter:
+        articles = articles.filter(bias_score=bias_filter)
+
+    return articles
+
+
 @csrf_exempt
 def fetch_missing_summaries(request):
     if request.method == 'POST':
-        article_ids = request.POST.getlist('article_ids[]')
-        triggered = []
-
-        for article_id in article_ids[:5]:
-            try:
-                article = Article.objects.get(id=article_id)
-                if not article.summary:
-                    # 🟧 Assign to medium queue
-                    process_article_ai.apply_async(
-                        args=[article.id], queue='medium')
-                    triggered.append(article.id)
-            except Article.DoesNotExist:
-                continue
+        article_ids = [article_id for article_id in request.POST.getlist('article_ids[]')
+                       if article_id.isdigit()]
+        # Only articles stored before extractive summaries lack a summary
+        missing = Article.objects.filter(
+            id__in=article_ids[:5], summary='').values_list('id', flat=True)
+        triggered = request_abstractive_summaries(list(missing))
 
         return JsonResponse({'status': 'success', 'triggered': triggered})
 
@@ -254,14 +277,15 @@ def fetch_missing_summaries(request):
 @csrf_exempt
 def fetch_summary_for_article(request):
     if request.method == 'POST':
-        article_id = request.POST.get('article_id')
+        article_id = request.POST.get('article_id', '')
         try:
-            article = Article.objects.get(id=article_id)
-            if not article.summary:
-                # 🟥 Assign to high priority queue here
-                process_article_ai.apply_async(args=[article.id], queue='high')
-                return JsonResponse({'status': 'triggered'})
-        except Article.DoesNotExist:
+            article = Article.objects.get(id=int(article_id))
+            if article.summary_tier != Article.SUMMARY_TIER_ABSTRACTIVE:
+                if request_abstractive_summaries([article.id]):
+                    return JsonResponse({'status': 'triggered'})
+                return JsonResponse({'status': 'unavailable'})
+            return JsonResponse({'status': 'done'})
+        except (ValueError, Article.DoesNotExist):
             pass
 
     return JsonResponse({'status': 'error'}, status=400)
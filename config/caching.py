@@ -1,6 +1,6 @@
 # config/caching.py
 from apps.ai_services.summarizer import OptimizedSummarizer
-from django.core.cache import cache
+from apps.ai_services.summary_store import SummaryStore, summary_digest
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
@@ -13,13 +13,36 @@ CACHES = {
 
 
 class CachedSummarizer(OptimizedSummarizer):
+    """
+    OptimizedSummarizer backed by the content-addressed SummaryStore: a
+    text (after normalization) is only ever summarized once per model and
+    parameters, whichever process or article it comes from.
+    """
+
+    def __init__(self):
+        self.store = SummaryStore()
+
     def summarize(self, text, max_length=100):
-        cache_key = f'summary_{hash(text[:1000])}'  # Hash first 1000 chars
-        cached_summary = cache.get(cache_key)
+        return self.summarize_many([text], max_length)[0]
+
+    def summarize_many(self, texts, max_length=100, batch_size=8, bucket=True):
+        params = self.generation_params(max_length)
+        digests = [summary_digest(text, self.model_name, params)
+                   if len(text) >= self.min_model_chars else None
+                   for text in texts]
+        stored = self.store.get_many([d for d in digests if d])
 
-        if cached_summary:
-            return cached_summary
+        # Each distinct missing text goes through the model once
+        pending = {}
+        for text, digest in zip(texts, digests):
+            if digest and digest not in stored and digest not in pending:
+                pending[digest] = text
+        if pending:
+            summaries = super().summarize_many(
+                list(pending.values()), max_length, batch_size, bucket)
+            new_summaries = dict(zip(pending, summaries))
+            self.store.put_many(new_summaries, self.model_name)
+            stored.update(new_summaries)
 
-        summary = super().summarize(text, max_length)
-        cache.set(cache_key, summary, 3600)  # Cache for 1 hour
-        return summary
+        return [stored[digest] if digest else self.short_summary(text)
+                for text, digest in zip(texts, digests)]
@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -28,17 +29,77 @@ app.conf.update(
     task_soft_time_limit=300,
     task_time_limit=600,
     task_track_started=True,
-    worker_max_memory_per_child=500 * 1024 * 1024,  # 500MB
+    # In KiB, so this is ~500GB: children are not recycled for memory. A
+    # real cap must allow for the AI models, which children on the ONNX
+    # backend or outside AI_PRELOAD_QUEUES load after the fork
+    worker_max_memory_per_child=500 * 1024 * 1024,
+    # Children of AI workers run a dummy inference in worker_process_init
+    # (warm_up_ai_models) before reporting ready, which takes well over
+    # Celery's default 4s on a slow CPU. The inference stays out of the
+    # parent: once torch has started its OpenMP threads, forked children
+    # can hang in their first inference
+    worker_proc_alive_timeout=60,
 )
 
 app.conf.task_routes = {
     'apps.news.tasks.process_article_ai': {'queue': 'high'},
+    'apps.news.tasks.process_articles_ai': {'queue': 'high'},
+    'apps.news.tasks.embed_articles': {'queue': 'high'},
+    'apps.news.tasks.extract_articles_content': {'queue': 'extraction'},
     'apps.news.tasks.fetch_latest_news': {'queue': 'medium'},
+    'apps.news.tasks.poll_feeds': {'queue': 'medium'},
+    'apps.news.tasks.fetch_feed': {'queue': 'medium'},
     'apps.news.tasks.cleanup_old_articles': {'queue': 'low'},
+    'apps.news.tasks.compact_embedding_store': {'queue': 'low'},
     'apps.news.tasks.process_pending_articles': {'queue': 'medium'},
+    'apps.news.tasks.upgrade_top_summaries': {'queue': 'medium'},
+    'apps.news.tasks.refresh_user_feeds': {'queue': 'medium'},
 }
 
 
+# Load the AI models once in the worker's parent process so prefork
+# children share them copy-on-write (see apps/ai_services/worker_preload.py)
+_models_preloaded = False
+
+
+@worker_init.connect
+def preload_ai_models(sender=None, **kwargs):
+    global _models_preloaded
+    from django.conf import settings
+    if not getattr(settings, 'AI_PRELOAD_MODELS', True):
+        return
+    queues = set(sender.app.amqp.queues.consume_from or sender.app.amqp.queues)
+    if not queues & set(getattr(settings, 'AI_PRELOAD_QUEUES', ['high'])):
+        return  # this worker never runs AI tasks
+
+    from apps.ai_services.summarizer import summarizer_backend
+    if summarizer_backend() == 'onnx':
+        # ONNX Runtime sessions don't survive a fork; each child loads the
+        # (small, quantized) model itself
+        return
+
+    from apps.ai_services.worker_preload import preload_models
+    base_rss_kib = _rss_kib()
+    preload_models()
+    _models_preloaded = True
+    if sender.max_memory_per_child:
+        # Children count the shared weights in their RSS; only recycle them
+        # for memory they allocate on top of that
+        sender.max_memory_per_child += max(0, _rss_kib() - base_rss_kib)
+
+
+@worker_process_init.connect
+def warm_up_ai_models(**kwargs):
+    if _models_preloaded:
+        from apps.ai_services.worker_preload import warm_up_child
+        warm_up_child()
+
+
+def _rss_kib():
+    import psutil
+    return psutil.Process().memory_info().rss // 1024
+
+
 # Auto-discover tasks in all registered Django app configs.
 # For example, tasks can be placed in apps/news/tasks.py.
 app.autodiscover_tasks()
@@ -58,6 +119,12 @@ app.conf.beat_schedule = {
     'fetch-news-every-hour': {
         'task': 'apps.news.tasks.fetch_latest_news',
         'schedule': crontab(minute=0),  # Run at the beginning of every hour
+        # RSS feeds are polled by poll-due-feeds on their own schedule
+        'args': (['newsapi', 'guardian'],),
+    },
+    'poll-due-feeds-every-minute': {
+        'task': 'apps.news.tasks.poll_feeds',
+        'schedule': crontab(),  # Run every minute; feeds decide if they're due
         'args': (),
     },
     'process-pending-articles-every-30-minutes': {
@@ -65,6 +132,16 @@ app.conf.beat_schedule = {
         'schedule': crontab(minute='*/30'),  # Run every 30 minutes
         'args': (),
     },
+    'upgrade-top-summaries-every-15-minutes': {
+        'task': 'apps.news.tasks.upgrade_top_summaries',
+        'schedule': crontab(minute='*/15'),  # Run every 15 minutes
+        'args': (),
+    },
+    'compact-embedding-store-every-10-minutes': {
+        'task': 'apps.news.tasks.compact_embedding_store',
+        'schedule': crontab(minute='*/10'),  # Run every 10 minutes
+        'args': (),
+    },
     'cleanup-old-articles-daily': {
         'task': 'apps.news.tasks.cleanup_old_articles',
         'schedule': crontab(hour=2, minute=0),  # Run daily at 2:00 AM UTC
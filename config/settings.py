@@ -167,6 +167,165 @@ GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 GUARDIAN_API_KEY = os.getenv("GUARDIAN_API_KEY")
 
+# News fetching
+# Number of sources/feeds downloaded in parallel by NewsFetcher.fetch_all
+NEWS_FETCH_MAX_WORKERS = config('NEWS_FETCH_MAX_WORKERS', default=8, cast=int)
+NEWS_FETCH_TIMEOUT = config('NEWS_FETCH_TIMEOUT', default=30, cast=int)
+# NewsAPI/Guardian pages followed per run when catching up to the watermark
+NEWS_FETCH_MAX_PAGES = 5
+# ETag/Last-Modified/body digest per feed URL or API query, kept in the cache
+NEWS_FETCH_HTTP_CACHE_TIMEOUT = 7 * 24 * 3600
+# Shared HTTP client (apps.ai_services.http_client): connection pool size,
+# per-host concurrency and requests/second (0 = unlimited), with overrides
+# per host, e.g. {'newsapi.org': {'concurrency': 1, 'rate': 1}}
+NEWS_HTTP_POOL_SIZE = 20
+NEWS_HTTP_PER_HOST_CONCURRENCY = 4
+NEWS_HTTP_PER_HOST_RATE = 5.0
+NEWS_HTTP_HOST_LIMITS = {}
+# Retries on connection errors, timeouts, 429 and 5xx with jittered
+# exponential backoff (seconds)
+NEWS_HTTP_MAX_RETRIES = 2
+NEWS_HTTP_BACKOFF_BASE = 0.5
+NEWS_HTTP_BACKOFF_MAX = 10.0
+# Consecutive failed calls before a host is skipped, and for how long
+NEWS_HTTP_BREAKER_THRESHOLD = 3
+NEWS_HTTP_BREAKER_COOLDOWN = 2 * 3600
+# Full-text extraction of article pages for items whose feed or API only
+# carries a teaser (fewer than CONTENT_EXTRACTION_MIN_WORDS words). Runs on
+# the 'extraction' Celery queue, which needs a worker when enabled
+CONTENT_EXTRACTION_ENABLED = config('CONTENT_EXTRACTION_ENABLED', default=False, cast=bool)
+CONTENT_EXTRACTION_MIN_WORDS = 120
+CONTENT_EXTRACTION_MAX_WORKERS = 8
+CONTENT_EXTRACTION_TIMEOUT = 15
+# Politeness towards publishers: parallel requests and requests/second per host
+CONTENT_EXTRACTION_PER_HOST_CONCURRENCY = 2
+CONTENT_EXTRACTION_PER_HOST_RATE = 1.0
+# Pages are read up to MAX_BYTES; stored text is cut at MAX_CHARS
+CONTENT_EXTRACTION_MAX_BYTES = 2 * 1024 * 1024
+CONTENT_EXTRACTION_MAX_CHARS = 20000
+# Summarization inference: 'torch' (transformers pipeline, fp32) or 'onnx'
+# (int8-quantized export run by ONNX Runtime on CPU; needs
+# optimum[onnxruntime] and `manage.py export_onnx_summarizer`)
+SUMMARIZER_BACKEND = config('SUMMARIZER_BACKEND', default='torch')
+SUMMARIZER_ONNX_DIR = config(
+    'SUMMARIZER_ONNX_DIR', default=str(BASE_DIR / 'models' / 'flan-t5-small-onnx-int8'))
+# ONNX Runtime threads per process (0 = one per core); keep worker
+# concurrency x threads at or below the number of cores
+SUMMARIZER_ONNX_THREADS = config('SUMMARIZER_ONNX_THREADS', default=0, cast=int)
+# Articles summarized per model call in process_articles_ai
+ENRICHMENT_BATCH_SIZE = 16
+# process_pending_articles re-queues PENDING articles older than
+# SWEEP_DELAY, PROCESSING ones not updated for STALE_AFTER (seconds) and
+# FAILED ones with fewer than MAX_ATTEMPTS, at most SWEEP_LIMIT per run
+ENRICHMENT_SWEEP_DELAY = 30 * 60
+ENRICHMENT_STALE_AFTER = 30 * 60
+ENRICHMENT_MAX_ATTEMPTS = 3
+ENRICHMENT_SWEEP_LIMIT = 200
+# Extractive summaries written at ingestion: sentences and characters kept
+SUMMARY_EXTRACTIVE_SENTENCES = 3
+SUMMARY_EXTRACTIVE_MAX_CHARS = 600
+# upgrade_top_summaries sends the TOP_N most read/bookmarked articles of
+# the last WINDOW_HOURS to the abstractive model; other articles are
+# upgraded when someone opens them
+SUMMARY_UPGRADE_TOP_N = 30
+SUMMARY_UPGRADE_WINDOW_HOURS = 24
+# Page views of an article ask for its abstractive summary at most once
+# per SUMMARY_REQUEST_DEBOUNCE seconds
+SUMMARY_REQUEST_DEBOUNCE = 300
+# Summaries are stored permanently in SummaryRecord; this is how long they
+# stay in the Redis hot tier after a write or a cold hit
+SUMMARY_STORE_HOT_TIMEOUT = 7 * 24 * 3600
+# Celery workers consuming any of these queues load the summarizer and
+# embedding models before forking their pool (see config/celery.py)
+AI_PRELOAD_MODELS = config('AI_PRELOAD_MODELS', default=True, cast=bool)
+AI_PRELOAD_QUEUES = ['high']
+# Weighted left/right terms used by the bias detector
+# (apps/ai_services/data/bias_lexicon.json by default)
+BIAS_LEXICON_PATH = BASE_DIR / 'apps' / 'ai_services' / 'data' / 'bias_lexicon.json'
+# Sentence embeddings (apps/ai_services/embeddings.py): texts per encode
+# call, and the category/lean heads trained by train_embedding_heads. An
+# article gets a predicted category when its cosine similarity to the
+# category centroid reaches EMBEDDING_CATEGORY_MIN_SIMILARITY, at most
+# EMBEDDING_CATEGORY_LIMIT of them
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_HEADS_PATH = BASE_DIR / 'models' / 'embedding_heads.npz'
+EMBEDDING_CATEGORY_MIN_SIMILARITY = 0.4
+EMBEDDING_CATEGORY_LIMIT = 2
+# Memory-mapped matrix of all article embeddings shared by every process,
+# rebuilt by compact_embedding_store (see apps/ai_services/embedding_store.py)
+EMBEDDING_STORE_DIR = BASE_DIR / 'models' / 'embedding_store'
+# IVF-flat ANN index over the store (apps/ai_services/ann_index.py), rebuilt
+# with it. ANN_N_LISTS = None uses sqrt(articles) lists; queries scan the
+# ANN_N_PROBE closest lists (more: better recall, slower, see
+# benchmark_ann_index). Processes look for newly embedded articles every
+# ANN_SYNC_SECONDS
+ANN_INDEX_DIR = BASE_DIR / 'models' / 'ann_index'
+ANN_N_LISTS = None
+ANN_N_PROBE = 16
+ANN_SYNC_SECONDS = 30
+# Windows for personalized feeds and "related stories" on article pages
+RECOMMENDATION_WINDOW_HOURS = 72
+RELATED_ARTICLES_WINDOW_DAYS = 7
+# User profile vectors (apps/ai_services/user_profiles.py): weight of each
+# event, half-life of its influence, and how many events the UserInterest
+# prior is worth
+USER_PROFILE_EVENT_WEIGHTS = {'read': 1.0, 'bookmark': 2.0}
+USER_PROFILE_HALF_LIFE_DAYS = 14
+USER_PROFILE_PRIOR_WEIGHT = 2.0
+# Per-user recommendation feeds materialized in Redis
+# (apps/ai_services/user_feeds.py): articles kept per feed and how long a
+# feed lives without a refresh; users who have not logged in for
+# USER_FEED_ACTIVE_DAYS are not refreshed; refreshes triggered by new
+# articles or profile changes are batched over USER_FEED_REFRESH_DEBOUNCE
+# seconds
+USER_FEED_SIZE = 200
+USER_FEED_TTL = 24 * 3600
+USER_FEED_ACTIVE_DAYS = 14
+USER_FEED_REFRESH_DEBOUNCE = 60
+# Hybrid ranking of the home page, dashboard and feeds
+# (apps/ai_services/ranking.py). Weights of the feature columns, all
+# roughly 0..1: interest-category match, embedding similarity to the
+# user's profile, recency (halving every RANKING_RECENCY_HALF_LIFE_HOURS),
+# popularity over RANKING_POPULARITY_WINDOW_HOURS and bias balance against
+# the user's own reading; 'diversity' is subtracted, times log2(1 + n), from
+# the n-th best article of the same source. Listings rank their newest
+# RANKING_CANDIDATES articles (older matches follow in date order) and
+# cache the order for RANKING_CACHE_SECONDS. Each process keeps the
+# features of the newest RANKING_CANDIDATES articles in memory, synced
+# every RANKING_POOL_SYNC_SECONDS and rebuilt every
+# RANKING_POOL_REBUILD_SECONDS
+RANKING_WEIGHTS = {
+    'category': 1.0,
+    'similarity': 2.0,
+    'recency': 1.5,
+    'popularity': 0.5,
+    'bias_balance': 0.3,
+    'diversity': 0.4,
+}
+RANKING_RECENCY_HALF_LIFE_HOURS = 24
+RANKING_POPULARITY_WINDOW_HOURS = 72
+RANKING_CANDIDATES = 5000
+RANKING_CACHE_SECONDS = 60
+RANKING_POOL_SYNC_SECONDS = 30
+RANKING_POOL_REBUILD_SECONDS = 600
+# cleanup_old_articles deletes articles published before this
+ARTICLE_RETENTION_DAYS = 30
+# Near-duplicate stories: SimHash distance (bits out of 64, max 7) and the
+# publication window searched for an earlier copy
+NEWS_DEDUP_MAX_DISTANCE = 6
+NEWS_DEDUP_WINDOW_HOURS = 48
+# Each process keeps one fingerprint index for all feed polls: articles
+# stored elsewhere are picked up every NEWS_DEDUP_SYNC_SECONDS, and the
+# index is rebuilt every NEWS_DEDUP_REBUILD_SECONDS to drop aged stories
+NEWS_DEDUP_SYNC_SECONDS = 30
+NEWS_DEDUP_REBUILD_SECONDS = 3600
+
+# Adaptive RSS polling (see apps.news.models.Feed): bounds for each feed's
+# poll interval in seconds and the smoothing of its observed publish rate
+FEED_MIN_POLL_INTERVAL = 5 * 60
+FEED_MAX_POLL_INTERVAL = 6 * 3600
+FEED_RATE_SMOOTHING = 0.3
+
 
 # Add this to your settings.py
 GEMINI_API_KEY = os.getenv('GOOGLE_GEMINI_API_KEY')